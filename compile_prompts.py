@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Compile config/prompts.json into core/ai/_prompts_data.py
+The prompt assembler imports the generated module (loaded from its cached
+bytecode) instead of decoding the JSON at every process start. Re-run after
+editing prompts.json; a stale module is ignored and the JSON is read instead.
+"""
+
+import json
+import pprint
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+SOURCE = ROOT / "config" / "prompts.json"
+TARGET = ROOT / "core" / "ai" / "_prompts_data.py"
+
+
+def compile_prompts(source: Path = SOURCE, target: Path = TARGET) -> Path:
+    """Write the prompts as a Python dict literal, stamped with the source file's size and mtime"""
+    with open(source, 'r') as f:
+        data = json.load(f)
+    stat = source.stat()
+
+    target.write_text(
+        "# Generated by compile_prompts.py from config/prompts.json - do not edit\n"
+        f"SOURCE_SIZE = {stat.st_size}\n"
+        f"SOURCE_MTIME_NS = {stat.st_mtime_ns}\n"
+        f"DATA = {pprint.pformat(data, width=120, sort_dicts=False)}\n"
+    )
+    return target
+
+
+if __name__ == "__main__":
+    try:
+        print(f"✅ Wrote {compile_prompts().relative_to(ROOT)}")
+    except Exception as e:
+        print(f"❌ Failed to compile prompts: {e}")
+        sys.exit(1)
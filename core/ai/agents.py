@@ -6,9 +6,13 @@ Agent state machine and lifecycle management with constitutional protection
 """
 
 import asyncio
+import contextlib
+from collections import deque
 import time
 import secrets
-from typing import Dict, List, Optional, Any, Callable, Set, AsyncGenerator, TYPE_CHECKING
+import sys
+from contextvars import ContextVar
+from typing import Deque, Dict, FrozenSet, List, Optional, Any, Callable, Set, Tuple, AsyncGenerator, Iterable, TYPE_CHECKING
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -16,7 +20,7 @@ from core.config.settings import HAINetSettings
 from core.logging.logger import get_logger
 from core.identity.did import ConstitutionalViolationError
 from .llm import LLMManager, LLMMessage
-from .schemas import AgentMemory
+from .schemas import AgentMemory, StateChange
 from .events import EventEmitter, ResponseCollector, create_event_emitter
 
 if TYPE_CHECKING:
@@ -24,6 +28,22 @@ if TYPE_CHECKING:
     from .workflow_manager import WorkflowManager
     from .memory import MemoryManager
 
+class _DeferredCycles:
+    """
+    Agent ids whose cycles are held back while a batch of tool calls runs.
+    Tasks started inside the batch inherit it, so once the batch has ended it is
+    marked closed and later requests are scheduled right away instead of queued.
+    """
+    __slots__ = ("agent_ids", "closed")
+
+    def __init__(self):
+        self.agent_ids: List[str] = []
+        self.closed = False
+
+
+# The open batch for the current context; None outside a batch
+_deferred_cycles: ContextVar[Optional[_DeferredCycles]] = ContextVar("deferred_cycles", default=None)
+
 class AgentState(Enum):
     """
     Agent state machine states, inspired by the TrippleEffect framework.
@@ -120,10 +140,17 @@ class AgentStateTransitions:
         AgentState.WAIT: [AgentState.WORK, AgentState.IDLE]
     }
     
+    # Every allowed (from, to) pair, flattened once so validation is a single hash lookup
+    VALID_TRANSITION_PAIRS: FrozenSet[Tuple[AgentState, AgentState]] = frozenset(
+        (from_state, to_state)
+        for from_state, to_states in VALID_TRANSITIONS.items()
+        for to_state in to_states
+    )
+    
     @classmethod
     def is_valid_transition(cls, from_state: AgentState, to_state: AgentState) -> bool:
         """Check if state transition is valid"""
-        return to_state in cls.VALID_TRANSITIONS.get(from_state, [])
+        return (from_state, to_state) in cls.VALID_TRANSITION_PAIRS
     
     @classmethod
     def get_valid_transitions(cls, from_state: AgentState) -> List[AgentState]:
@@ -142,7 +169,8 @@ class Agent:
                  llm_manager: Optional[LLMManager] = None,
                  user_did: Optional[str] = None,
                  memory_manager: Optional['MemoryManager'] = None):
-        self.agent_id = agent_id
+        # Interned once; the id is repeated in every state record, tool arg and log line
+        self.agent_id = sys.intern(agent_id)
         self.role = role
         self.settings = settings
         self.manager = manager
@@ -150,16 +178,19 @@ class Agent:
         self.user_did = user_did
         self.memory_manager = memory_manager
         self.logger = get_logger(f"ai.agent.{agent_id}", settings)
+        # Whether the manager can run tool cycles; kept current by AgentManager.set_handlers
+        self.tools_available = bool(manager and manager.cycle_handler)
         
         # Agent state
         self.current_state = AgentState.IDLE
         self.previous_state = AgentState.IDLE
-        self.state_history: List[Dict[str, Any]] = []
+        self.state_history: Deque[StateChange] = deque(maxlen=getattr(settings, 'agent_state_history_max', 1024) or None)
         
         # Agent properties
         self.capabilities: Set[AgentCapability] = set()
         self.memory = AgentMemory()  # Keep for backward compatibility
-        self.message_history: List[LLMMessage] = []
+        # Bounded so long-running agents evict their oldest context in O(1)
+        self.message_history: Deque[LLMMessage] = deque(maxlen=getattr(settings, 'agent_history_maxlen', 256) or None)
         self.metrics = AgentMetrics(
             uptime_seconds=0,
             tasks_completed=0,
@@ -333,31 +364,29 @@ class Agent:
         old_state = self.current_state
         self.previous_state = self.current_state
         self.current_state = new_state
+        old_value, new_value = old_state.value, new_state.value
         
         # Record state change
-        state_change: Dict[str, Any] = {
-            "from_state": old_state.value,
-            "to_state": new_state.value,
-            "timestamp": time.time(),
-            "agent_id": self.agent_id,
-            "constitutional_compliant": True
-        }
-        
-        self.state_history.append(state_change)
-        self.last_activity = time.time()
+        now = time.time()
+        self.state_history.append(StateChange(old_value, new_value, now, self.agent_id))
+        self.last_activity = now
         
         # Log state transition
         self.logger.log_decentralization_event(
-            f"state_transition_{old_state.value}_to_{new_state.value}",
+            f"state_transition_{old_value}_to_{new_value}",
             local_processing=True
         )
         
-        # Notify callbacks
+        # Notify callbacks, dropping any that raise so later transitions skip them
+        live_callbacks = []
         for callback in self.state_change_callbacks:
             try:
                 callback(old_state, new_state)
+                live_callbacks.append(callback)
             except Exception as e:
-                self.logger.error(f"State change callback error: {e}")
+                self.logger.error(f"State change callback error, callback removed: {e}")
+        if len(live_callbacks) != len(self.state_change_callbacks):
+            self.state_change_callbacks = live_callbacks
 
     async def process_message(self, messages: List[LLMMessage]) -> AsyncGenerator[Dict[str, Any], None]:
         """
@@ -369,7 +398,7 @@ class Agent:
             yield {"type": "error", "content": "LLM Manager not available."}
             return
 
-        self.logger.debug(f"Agent {self.agent_id} starting process_message in state {self.current_state.value}")
+        self.logger.debug("Agent %s starting process_message in state %s", self.agent_id, self.current_state.value)
 
         # Use getattr for safe access to pydantic model attributes with a default.
         model = getattr(self.settings, 'default_model', 'local_default')
@@ -392,8 +421,9 @@ class Agent:
             ToolCallParser = tool_parser_module.ToolCallParser
             parser = ToolCallParser(self.settings)
             
-            # Parse for tool calls using robust XML parser
-            parse_result = parser.parse_tool_calls(full_response)
+            # Find and parse every workflow block in one pass over the response
+            parsed = parser.parse_all(full_response)
+            parse_result = parsed.get("tool_requests", {})
             
             # Priority 1: Check for tool calls
             if parse_result.get("success", False):
@@ -407,7 +437,7 @@ class Agent:
                 }
 
             # Priority 2: Check for a plan creation
-            elif (plan := parser.extract_plan(full_response)) is not None:
+            elif (plan := parsed.get("plan")) is not None:
                 yield {
                     "type": "agent_thought",
                     "content": "Plan created. Triggering workflow."
@@ -418,7 +448,7 @@ class Agent:
                 }
 
             # Priority 3: Check for a task list creation
-            elif (task_list := parser.extract_task_list(full_response)) is not None:
+            elif (task_list := parsed.get("task_list")) is not None:
                 yield {
                     "type": "agent_thought",
                     "content": "Task list created."
@@ -429,14 +459,15 @@ class Agent:
                 }
 
             # Priority 4: Check for a worker creation request
-            elif (worker_request := parser.extract_create_worker_request(full_response)) is not None:
+            elif (worker_request := parsed.get("create_worker_request")) is not None:
                 yield {
                     "type": "agent_thought",
                     "content": "Worker creation requested."
                 }
                 yield {
                     "type": "create_worker_requested",
-                    "request": worker_request
+                    "request": worker_request,
+                    "requests": parsed.get("create_worker_requests", [worker_request])
                 }
 
             # Priority 5: Default to final response
@@ -611,11 +642,45 @@ class AgentManager:
         self.workflow_manager = workflow_manager
         # Wire up the workflow manager's dependency on agent manager
         workflow_manager.set_agent_manager(self)
+        for agent in self.agents.values():
+            agent.tools_available = True
         
         # Inject event system into cycle handler
         cycle_handler.event_emitter = self.event_emitter
         cycle_handler.response_collector = self.response_collector
     
+    def _new_agent(self, role: AgentRole, user_did: Optional[str] = None,
+                   capabilities: Optional[Set[AgentCapability]] = None) -> Agent:
+        """Allocate the next agent id and construct the agent; the caller holds self._lock"""
+        self.agent_counter += 1
+        agent_id = sys.intern(f"agent_{role.value}_{self.agent_counter:03d}_{secrets.token_hex(4)}")
+        
+        agent = Agent(
+            agent_id=agent_id,
+            role=role,
+            settings=self.settings,
+            manager=self,
+            llm_manager=self.llm_manager,
+            user_did=user_did,
+            memory_manager=self.memory_manager
+        )
+        
+        # Add custom capabilities if provided
+        if capabilities:
+            agent.capabilities.update(capabilities)
+        return agent
+    
+    def _register_agent(self, agent: Agent) -> None:
+        """Add a started agent to the registry; the caller holds self._lock"""
+        self.agents[agent.agent_id] = agent
+        self.manager_metrics["total_agents_created"] += 1
+        self.manager_metrics["active_agents"] = len(self.agents)
+        
+        self.logger.log_decentralization_event(
+            f"agent_created_{agent.role.value}",
+            local_processing=True
+        )
+    
     async def create_agent(self, role: AgentRole, user_did: Optional[str] = None,
                           capabilities: Optional[Set[AgentCapability]] = None) -> Optional[str]:
         """Create a new agent with constitutional compliance"""
@@ -628,35 +693,12 @@ class AgentManager:
                     })
                     return None
                 
-                self.agent_counter += 1
-                agent_id = f"agent_{role.value}_{self.agent_counter:03d}_{secrets.token_hex(4)}"
-                
-                agent = Agent(
-                    agent_id=agent_id,
-                    role=role,
-                    settings=self.settings,
-                    manager=self,
-                    llm_manager=self.llm_manager,
-                    user_did=user_did,
-                    memory_manager=self.memory_manager
-                )
-                
-                # Add custom capabilities if provided
-                if capabilities:
-                    agent.capabilities.update(capabilities)
+                agent = self._new_agent(role, user_did, capabilities)
                 
                 # Start agent
                 if await agent.start():
-                    self.agents[agent_id] = agent
-                    self.manager_metrics["total_agents_created"] += 1
-                    self.manager_metrics["active_agents"] = len(self.agents)
-                    
-                    self.logger.log_decentralization_event(
-                        f"agent_created_{role.value}",
-                        local_processing=True
-                    )
-                    
-                    return agent_id
+                    self._register_agent(agent)
+                    return agent.agent_id
                 else:
                     return None
                     
@@ -664,6 +706,36 @@ class AgentManager:
             self.logger.error(f"Agent creation failed: {e}")
             return None
     
+    async def create_agents(self, roles: List[AgentRole], user_did: Optional[str] = None) -> List[Optional[str]]:
+        """
+        Create several agents under a single acquisition of the manager lock.
+        
+        Ids are allocated in one block and the agents are started concurrently.
+        Returns one entry per requested role, in order: the new agent id, or None
+        where the agent limit was reached or the agent failed to start.
+        """
+        agent_ids: List[Optional[str]] = [None] * len(roles)
+        try:
+            async with self._lock:
+                capacity = max(self.max_agents - len(self.agents), 0)
+                if capacity < len(roles):
+                    self.logger.log_violation("agent_limit_exceeded", {
+                        "current_count": len(self.agents),
+                        "requested": len(roles),
+                        "max_allowed": self.max_agents
+                    })
+                
+                agents = [self._new_agent(role, user_did) for role in roles[:capacity]]
+                started = await asyncio.gather(*(agent.start() for agent in agents), return_exceptions=True)
+                for i, (agent, ok) in enumerate(zip(agents, started)):
+                    if ok is True:
+                        self._register_agent(agent)
+                        agent_ids[i] = agent.agent_id
+                
+        except Exception as e:
+            self.logger.error(f"Agent creation failed: {e}")
+        return agent_ids
+    
     async def remove_agent(self, agent_id: str) -> bool:
         """Remove an agent"""
         try:
@@ -725,6 +797,11 @@ class AgentManager:
 
     async def schedule_cycle(self, agent_id: str):
         """Schedules an agent to be run by the AgentCycleHandler."""
+        deferred = _deferred_cycles.get()
+        if deferred is not None and not deferred.closed:
+            deferred.agent_ids.append(agent_id)
+            return
+
         if not self.cycle_handler:
             self.logger.error("AgentCycleHandler not set in AgentManager. Cannot schedule cycle.")
             return
@@ -735,12 +812,29 @@ class AgentManager:
             return
 
         if agent.current_state != AgentState.PROCESSING:
-            self.logger.info(f"Scheduling cycle for agent {agent_id}")
+            self.logger.info("Scheduling cycle for agent %s", agent_id)
             self.manager_metrics["total_cycles_run"] += 1
             asyncio.create_task(self.cycle_handler.run_cycle(agent))
         else:
             self.logger.warning(f"Agent {agent_id} is already processing. Cycle not scheduled.")
 
+    async def schedule_cycles(self, agent_ids: Iterable[str]):
+        """Schedules one cycle for each agent, however many times it is listed."""
+        await asyncio.gather(*(self.schedule_cycle(agent_id) for agent_id in dict.fromkeys(agent_ids)))
+
+    @contextlib.asynccontextmanager
+    async def batch_cycles(self):
+        """Holds back cycles scheduled inside the block and schedules them together when it exits."""
+        deferred = _DeferredCycles()
+        token = _deferred_cycles.set(deferred)
+        try:
+            yield
+        finally:
+            deferred.closed = True
+            _deferred_cycles.reset(token)
+            if deferred.agent_ids:
+                await self.schedule_cycles(deferred.agent_ids)
+
     def get_agent(self, agent_id: str) -> Optional[Agent]:
         """Get agent by ID"""
         return self.agents.get(agent_id)
@@ -5,6 +5,7 @@ Drives the agent execution loop by processing events from agents, as described
 in the TrippleEffect framework.
 """
 
+import logging
 import time
 from typing import Optional
 
@@ -53,15 +54,16 @@ class AgentCycleHandler:
         try:
             # 1. Prepare LLM call data BEFORE transitioning to PROCESSING
             # This ensures the system prompt matches the agent's actual state
-            self.logger.debug_agent(f"Starting cycle for agent {agent.agent_id} (role={agent.role.value}, state={agent.current_state.value})", function="run_cycle")
-            messages_for_llm = self.prompt_assembler.prepare_llm_call_data(agent)
+            self.logger.debug_agent("Starting cycle for agent %s (role=%s, state=%s)", agent.agent_id, agent.role.value, agent.current_state.value, function="run_cycle")
+            cycle_time = time.time()
+            messages_for_llm = self.prompt_assembler.prepare_llm_call_data(agent, now=cycle_time)
 
             # 2. Emit agent thinking event
             if self.event_emitter:
                 await self.event_emitter.emit(AgentEvent(
                     event_type=EventType.AGENT_THINKING,
                     agent_id=agent.agent_id,
-                    timestamp=time.time(),
+                    timestamp=cycle_time,
                     data={
                         "role": agent.role.value,
                         "state": agent.current_state.value,
@@ -82,7 +84,7 @@ class AgentCycleHandler:
                 event_type = event.get("type")
 
                 if event_type == "agent_thought":
-                    self.logger.debug_agent(f"[{agent.agent_id}] Thought: {event.get('content')}", function="run_cycle")
+                    self.logger.debug_agent("[%s] Thought: %s", agent.agent_id, event.get('content'), function="run_cycle")
                     # Don't emit another AGENT_THINKING event here - we already emitted one at the start of the cycle
                 
                 elif event_type == "response_chunk":
@@ -105,10 +107,11 @@ class AgentCycleHandler:
 
                 elif event_type == "tool_requests":
                     tool_calls = event.get("calls", [])
-                    self.logger.debug_agent(f"[{agent.agent_id}] Requesting {len(tool_calls)} tool(s): {[tc.get('name') for tc in tool_calls]}", function="run_cycle")
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug_agent("[%s] Requesting %s tool(s): %s", agent.agent_id, len(tool_calls), [tc.get('name') for tc in tool_calls], function="run_cycle")
 
-                    for tool_call in tool_calls:
-                        result = await self.interaction_handler.execute_tool_call(agent, tool_call)
+                    results = await self.interaction_handler.execute_tool_calls(agent, tool_calls)
+                    for tool_call, result in zip(tool_calls, results):
                         # Format result and append to history for the agent to process
                         tool_result_message = LLMMessage(
                             role="tool",
@@ -146,7 +149,7 @@ class AgentCycleHandler:
                         old_state = agent.current_state
                         new_state = AgentState(new_state_str)
                         await self.workflow_manager.change_agent_state(agent, new_state)
-                        self.logger.info(f"[{agent.agent_id}] State change requested: {old_state.value} -> {new_state.value}", category="agent", function="run_cycle")
+                        self.logger.info("[%s] State change requested: %s -> %s", agent.agent_id, old_state.value, new_state.value, category="agent", function="run_cycle")
                         
                         # Store state transition in episodic memory
                         if self.memory_manager:
@@ -165,13 +168,13 @@ class AgentCycleHandler:
                         
                         # Automatically reschedule agent to continue processing in new state
                         await agent.manager.schedule_cycle(agent.agent_id)
-                        self.logger.debug_agent(f"[{agent.agent_id}] Rescheduled to continue in {new_state.value} state", function="run_cycle")
+                        self.logger.debug_agent("[%s] Rescheduled to continue in %s state", agent.agent_id, new_state.value, function="run_cycle")
                     break
 
                 elif event_type == "plan_created":
                     # Admin created a plan - trigger workflow
                     plan = event.get("plan", {})
-                    self.logger.info(f"[{agent.agent_id}] Plan created: {plan.get('project_name', 'Unnamed')}", category="agent", function="run_cycle")
+                    self.logger.info("[%s] Plan created: %s", agent.agent_id, plan.get('project_name', 'Unnamed'), category="agent", function="run_cycle")
                     
                     # CRITICAL FIX: Send the ACTUAL plan content to the user
                     # The accumulated_response contains the full LLM-generated plan that was streamed
@@ -189,7 +192,7 @@ class AgentCycleHandler:
                     if self.response_collector:
                         await self.response_collector.complete_response(agent.agent_id, accumulated_response)
                     
-                    self.logger.debug_agent(f"[{agent.agent_id}] Sent plan content to user ({len(accumulated_response)} chars)", function="run_cycle")
+                    self.logger.debug_agent("[%s] Sent plan content to user (%s chars)", agent.agent_id, len(accumulated_response), function="run_cycle")
                     
                     # Store plan creation in episodic memory with HIGH importance
                     if self.memory_manager:
@@ -214,7 +217,7 @@ class AgentCycleHandler:
                     # CRITICAL: Admin agent must return to IDLE state so it can handle the next user request
                     # Without this, the Admin gets stuck in PROCESSING and times out on follow-up messages
                     await self.workflow_manager.change_agent_state(agent, AgentState.IDLE)
-                    self.logger.debug_agent(f"[{agent.agent_id}] Transitioned to IDLE after plan creation", function="run_cycle")
+                    self.logger.debug_agent("[%s] Transitioned to IDLE after plan creation", agent.agent_id, function="run_cycle")
                     
                     # Return early - we've completed the cycle and transitioned to IDLE
                     return
@@ -222,7 +225,7 @@ class AgentCycleHandler:
                 elif event_type == "task_list_created":
                     # PM created task list
                     tasks = event.get("tasks", [])
-                    self.logger.info(f"[{agent.agent_id}] Task list created: {len(tasks)} tasks defined", category="agent", function="run_cycle")
+                    self.logger.info("[%s] Task list created: %s tasks defined", agent.agent_id, len(tasks), category="agent", function="run_cycle")
                     
                     agent.message_history.append(LLMMessage(
                         role="assistant",
@@ -258,11 +261,15 @@ class AgentCycleHandler:
                     break
 
                 elif event_type == "create_worker_requested":
-                    # PM requested to create a worker
-                    request = event.get("request", {})
-                    self.logger.debug_agent(f"[{agent.agent_id}] Worker creation requested for task_id={request.get('task_id')}, specialty={request.get('specialty')}", function="run_cycle")
-                    
-                    await self.workflow_manager.process_worker_creation(agent, request)
+                    # PM requested to create one or more workers
+                    requests = event.get("requests") or [event.get("request", {})]
+                    if len(requests) > 1:
+                        self.logger.debug_agent("[%s] Worker creation requested for %s tasks", agent.agent_id, len(requests), function="run_cycle")
+                        await self.workflow_manager.process_worker_creation_batch(agent, requests)
+                    else:
+                        request = requests[0]
+                        self.logger.debug_agent("[%s] Worker creation requested for task_id=%s, specialty=%s", agent.agent_id, request.get('task_id'), request.get('specialty'), function="run_cycle")
+                        await self.workflow_manager.process_worker_creation(agent, request)
                     
                     # Workflow manager handles state transitions and rescheduling
                     # Exit early to let workflow control the agent state
@@ -275,7 +282,7 @@ class AgentCycleHandler:
                     # Constitutional Guardian check for response compliance
                     await self._check_response_compliance(agent, content)
                     
-                    self.logger.debug_agent(f"[{agent.agent_id}] Final response generated (length={len(content)} chars)", function="run_cycle")
+                    self.logger.debug_agent("[%s] Final response generated (length=%s chars)", agent.agent_id, len(content), function="run_cycle")
 
                     agent.message_history.append(LLMMessage(role="assistant", content=content, timestamp=time.time()))
                     
@@ -415,7 +422,7 @@ class AgentCycleHandler:
             
             # Log clean responses
             if agent.agent_id and not any(p in content_lower for p in privacy_patterns + harmful_patterns + centralization_patterns):
-                self.logger.debug_agent(f"[{agent.agent_id}] Response passed constitutional compliance checks", function="_check_response_compliance")
+                self.logger.debug_agent("[%s] Response passed constitutional compliance checks", agent.agent_id, function="_check_response_compliance")
                 
         except Exception as e:
             self.logger.error(f"Constitutional compliance check failed: {e}", category="guardian", function="_check_response_compliance")
@@ -444,6 +451,6 @@ class AgentCycleHandler:
                 
                 # If all workers have been assigned, transition to MANAGE
                 if len(workers_assigned) == len(worker_map):
-                    self.logger.info(f"[{agent.agent_id}] All {len(worker_map)} tasks assigned. Auto-transitioning to MANAGE state", category="agent", function="_check_auto_transitions")
+                    self.logger.info("[%s] All %s tasks assigned. Auto-transitioning to MANAGE state", agent.agent_id, len(worker_map), category="agent", function="_check_auto_transitions")
                     await self.workflow_manager.change_agent_state(agent, AgentState.MANAGE,
                                                                    context="All tasks have been assigned to workers. Now monitor their progress.")
@@ -4,7 +4,7 @@ HAI-Net Interaction Handler
 Mediates tool execution for agents.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 from core.config.settings import HAINetSettings
 from core.logging.logger import get_logger
@@ -25,27 +25,62 @@ class InteractionHandler:
         Executes a single tool call requested by an agent and returns the result.
         Injects the calling agent into the arguments for context.
         """
+        prepared = self._prepare_tool_call(agent, tool_call)
+        if prepared is None:
+            return {"error": "Malformed tool call: missing 'name'."}
+        tool_name, tool_args_with_sender = prepared
+
+        # Execute the tool via the ToolExecutor
+        execution_result = await self.tool_executor.execute_tool(tool_name, tool_args_with_sender)
+
+        # Log the interaction for constitutional audit (without the injected sender)
+        self.logger.log_community_event(
+            action=f"tool_executed_{tool_name}",
+            community_benefit=True
+        )
+
+        return execution_result
+
+    def _prepare_tool_call(self, agent: Agent, tool_call: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Validate a tool call and inject the calling agent; None if it has no name"""
         tool_name = tool_call.get("name")
         tool_args = tool_call.get("args", {})
 
         if not tool_name:
-            error_msg = "Malformed tool call: missing 'name'."
-            self.logger.error(f"[{agent.agent_id}] {error_msg}", category="agent", function="execute_tool_call")
-            return {"error": error_msg}
+            self.logger.error(f"[{agent.agent_id}] Malformed tool call: missing 'name'.", category="agent", function="execute_tool_call")
+            return None
 
-        self.logger.debug_agent(f"[{agent.agent_id}] Executing tool '{tool_name}' with args: {tool_args}", function="execute_tool_call")
+        self.logger.debug_agent("[%s] Executing tool '%s' with args: %s", agent.agent_id, tool_name, tool_args, function="execute_tool_call")
 
         # Inject the sender agent into the tool arguments for context
         tool_args_with_sender = tool_args.copy()
         tool_args_with_sender['sender_agent'] = agent
+        return tool_name, tool_args_with_sender
 
-        # Execute the tool via the ToolExecutor
-        execution_result = await self.tool_executor.execute_tool(tool_name, tool_args_with_sender)
+    async def execute_tool_calls(self, agent: Agent, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Executes every tool call from one LLM turn as one concurrent batch and
+        returns their results in call order. Agent cycles the tools schedule
+        (e.g. send_message targets) are started once, after the whole turn,
+        instead of after each call.
+        """
+        results: List[Dict[str, Any]] = [{"error": "Malformed tool call: missing 'name'."} for _ in tool_calls]
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        batch_positions: List[int] = []
+        for position, tool_call in enumerate(tool_calls):
+            prepared = self._prepare_tool_call(agent, tool_call)
+            if prepared is not None:
+                batch.append(prepared)
+                batch_positions.append(position)
 
-        # Log the interaction for constitutional audit (without the injected sender)
-        self.logger.log_community_event(
-            action=f"tool_executed_{tool_name}",
-            community_benefit=True
-        )
+        async with self.tool_executor.agent_manager.batch_cycles():
+            batch_results = await self.tool_executor.execute_tools_batch(batch)
 
-        return execution_result
+        for position, (tool_name, _), result in zip(batch_positions, batch, batch_results):
+            results[position] = result
+            # Log the interaction for constitutional audit (without the injected sender)
+            self.logger.log_community_event(
+                action=f"tool_executed_{tool_name}",
+                community_benefit=True
+            )
+        return results
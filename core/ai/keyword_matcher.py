@@ -0,0 +1,174 @@
+# START OF FILE core/ai/keyword_matcher.py
+"""
+HAI-Net Keyword Matcher
+Single-pass multi-keyword scanning used by the constitutional filters.
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+try:
+    import hyperscan  # type: ignore
+except ImportError:
+    hyperscan = None  # type: ignore
+
+try:
+    import re2  # type: ignore
+except ImportError:
+    re2 = None  # type: ignore
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:
+    ahocorasick = None  # type: ignore
+
+
+class KeywordMatcher:
+    """
+    Finds every occurrence of a fixed set of lowercase keywords in one pass.
+    Backends, in order of preference: a Hyperscan database, an RE2 DFA,
+    a pyahocorasick automaton, and a compiled stdlib regex alternation.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        # Deduplicate while keeping the caller's order
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+        self.max_length = max((len(k) for k in self.keywords), default=0)
+        self.backend = "none"
+
+        self._hs_db = None
+        # Hyperscan scratch space is per-scan state, so each thread scans with its own
+        self._hs_local = threading.local()
+        self._automaton = None
+        self._regex = None
+        self._re2 = None
+
+        # The regex backends report only the longest keyword starting at each offset;
+        # every shorter keyword starting there is a prefix of it, so expand from this table
+        self._prefixes: Dict[str, Tuple[str, ...]] = {}
+
+        if not self.keywords:
+            return
+
+        alternation = "|".join(re.escape(k) for k in sorted(self.keywords, key=len, reverse=True))
+
+        if hyperscan is not None:
+            # One expression per keyword; Hyperscan reports every match end, overlaps included
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[re.escape(k).encode("utf-8") for k in self.keywords],
+                ids=list(range(len(self.keywords))),
+                elements=len(self.keywords),
+                flags=[0] * len(self.keywords)
+            )
+            self._hs_db = db
+            self.backend = "hyperscan"
+        elif re2 is not None:
+            self._re2 = re2.compile(alternation)
+            self.backend = "re2"
+        elif ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+            self.backend = "ahocorasick"
+        else:
+            # Lookahead so keywords starting at different offsets are all reported
+            self._regex = re.compile(f"(?=({alternation}))")
+            self.backend = "re"
+
+        if self._regex is not None or self._re2 is not None:
+            self._prefixes = {
+                keyword: tuple(k for k in self.keywords if keyword.startswith(k))
+                for keyword in self.keywords
+            }
+
+    def iter_matches(self, text_lower: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (end_index, keyword) for every match in already-lowercased text.
+        end_index is exclusive.
+        """
+        if self._hs_db is not None:
+            yield from self._hs_scan(text_lower)
+        elif self._automaton is not None:
+            for end, keyword in self._automaton.iter(text_lower):
+                yield end + 1, keyword
+        elif self._re2 is not None:
+            # RE2 has no lookahead; resume one past each match start to catch overlaps
+            search = self._re2.search
+            prefixes = self._prefixes
+            match = search(text_lower, 0)
+            while match is not None:
+                start = match.start()
+                for keyword in prefixes[match.group(0)]:
+                    yield start + len(keyword), keyword
+                match = search(text_lower, start + 1)
+        elif self._regex is not None:
+            prefixes = self._prefixes
+            for match in self._regex.finditer(text_lower):
+                start = match.start()
+                for keyword in prefixes[match.group(1)]:
+                    yield start + len(keyword), keyword
+
+    def _hs_scan(self, text_lower: str) -> List[Tuple[int, str]]:
+        """Run the Hyperscan database over text, converting byte offsets back to characters"""
+        data = text_lower.encode("utf-8")
+        keywords = self.keywords
+        hits: List[Tuple[int, str]] = []
+
+        def on_match(pattern_id: int, start: int, end: int, flags: int, context: object) -> None:
+            hits.append((end, keywords[pattern_id]))
+
+        scratch = getattr(self._hs_local, "scratch", None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_db)
+        self._hs_db.scan(data, match_event_handler=on_match, scratch=scratch)
+        if len(data) != len(text_lower):
+            # Keyword matches always end on a character boundary
+            hits = [(len(data[:end].decode("utf-8")), keyword) for end, keyword in hits]
+        return hits
+
+    def stream(self) -> "KeywordStream":
+        """Start an incremental scan over text that arrives in chunks"""
+        return KeywordStream(self)
+
+    def find_all(self, text_lower: str) -> Set[str]:
+        """Return the set of keywords present in already-lowercased text"""
+        return {keyword for _, keyword in self.iter_matches(text_lower)}
+
+    def contains_any(self, text_lower: str) -> bool:
+        """Check whether any keyword occurs in already-lowercased text"""
+        for _ in self.iter_matches(text_lower):
+            return True
+        return False
+
+
+class KeywordStream:
+    """
+    Incremental scan over chunked text.
+    Keeps only the last max_length - 1 characters between chunks so keywords
+    straddling a chunk boundary are found without rescanning earlier text.
+    """
+
+    def __init__(self, matcher: KeywordMatcher):
+        self.matcher = matcher
+        self.found: Set[str] = set()
+        self._carry = ""
+        self._keep = max(matcher.max_length - 1, 0)
+
+    def feed(self, chunk_lower: str) -> Set[str]:
+        """
+        Scan the next already-lowercased chunk.
+
+        Returns:
+            Keywords whose match ends inside this chunk
+        """
+        carry_len = len(self._carry)
+        window = self._carry + chunk_lower if carry_len else chunk_lower
+        # Matches ending inside the carry were already reported for the previous chunk
+        hits = {keyword for end, keyword in self.matcher.iter_matches(window) if end > carry_len}
+        self.found |= hits
+        self._carry = window[-self._keep:] if self._keep else ""
+        return hits
@@ -6,9 +6,13 @@ Local LLM inference with constitutional protection
 """
 
 import asyncio
+import functools
 import json
+import os
 import time
-from typing import Dict, List, Optional, Any, AsyncGenerator
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, AsyncGenerator, Sequence, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -17,8 +21,37 @@ try:
 except ImportError:
     aiohttp = None  # type: ignore
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
 from core.config.settings import HAINetSettings
 from core.logging.logger import get_logger
+from .keyword_matcher import KeywordMatcher
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize a request body to JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data: Any) -> Any:
+    """Parse JSON from bytes or str, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_GB = 1.0 / (1 << 30)
+
+# Shared read-only metadata for responses that carry none
+_EMPTY_META: Mapping[str, Any] = MappingProxyType({})
+_OLLAMA_CAPABILITIES = ("text_generation", "conversation")
 
 
 class LLMProvider(Enum):
@@ -29,9 +62,13 @@ class LLMProvider(Enum):
     LOCAL_TRANSFORMERS = "local_transformers"
 
 
-@dataclass
+@dataclass(init=False)
 class LLMResponse:
     """Response from LLM inference"""
+    # Slots are declared by hand rather than with dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("content", "model", "provider", "tokens_used", "response_time_ms",
+                 "constitutional_compliant", "privacy_protected", "timestamp", "metadata")
+    
     content: str
     model: str
     provider: LLMProvider
@@ -40,61 +77,134 @@ class LLMResponse:
     constitutional_compliant: bool
     privacy_protected: bool
     timestamp: float
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Mapping[str, Any]
 
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    def __init__(self, content: str, model: str, provider: LLMProvider, tokens_used: int,
+                 response_time_ms: float, constitutional_compliant: bool, privacy_protected: bool,
+                 timestamp: float, metadata: Optional[Mapping[str, Any]] = None):
+        self.content = content
+        self.model = model
+        self.provider = provider
+        self.tokens_used = tokens_used
+        self.response_time_ms = response_time_ms
+        self.constitutional_compliant = constitutional_compliant
+        self.privacy_protected = privacy_protected
+        self.timestamp = timestamp
+        self.metadata = _EMPTY_META if metadata is None else metadata
 
 
-@dataclass
+@dataclass(init=False)
 class LLMMessage:
     """Message for LLM conversation"""
+    __slots__ = ("role", "content", "timestamp", "constitutional_checked", "_wire")
+    
     role: str  # system, user, assistant
     content: str
     timestamp: float
-    constitutional_checked: bool = False
+    constitutional_checked: bool
 
+    def __init__(self, role: str, content: str, timestamp: float, constitutional_checked: bool = False):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp
+        self.constitutional_checked = constitutional_checked
+        self._wire: Optional[Dict[str, str]] = None
 
-@dataclass
+    def to_wire(self) -> Dict[str, str]:
+        """
+        Return the {"role", "content"} dict sent to the provider.
+        The dict is cached on the message and rebuilt only if role or content
+        has been reassigned, so long histories reuse the same objects each turn.
+        """
+        wire = self._wire
+        if wire is None or wire["content"] is not self.content or wire["role"] is not self.role:
+            wire = self._wire = {"role": self.role, "content": self.content}
+        return wire
+
+
+@dataclass(frozen=True)
 class LLMModelInfo:
     """Information about an available LLM model"""
+    __slots__ = ("name", "provider", "size_gb", "capabilities", "constitutional_approved",
+                 "privacy_level", "context_length", "description")
+    
     name: str
     provider: LLMProvider
     size_gb: float
-    capabilities: List[str]
+    capabilities: Tuple[str, ...]
     constitutional_approved: bool
     privacy_level: str  # local, remote, hybrid
     context_length: int
     description: str
 
 
+# Texts shorter than this are scanned inline; the thread hop would cost more than the scan
+_OFFLOAD_MIN_CHARS = 4096
+
+
+@functools.cache
+def _compliance_pool() -> ThreadPoolExecutor:
+    """Bounded pool shared by all filters, so scan bursts queue instead of stalling the event loop"""
+    return ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, 8), thread_name_prefix="compliance")
+
+
+@functools.cache
+def _build_matcher(patterns: Tuple[str, ...]) -> KeywordMatcher:
+    """Compile a keyword matcher once per distinct pattern set"""
+    return KeywordMatcher(patterns)
+
+
 class ConstitutionalLLMFilter:
     """
     Constitutional compliance filter for LLM interactions
     Ensures all AI interactions comply with constitutional principles
     """
     
+    # Constitutional compliance patterns
+    privacy_violations: Tuple[str, ...] = (
+        "personal information", "private data", "confidential",
+        "social security", "credit card", "password", "api key"
+    )
+    
+    harmful_content: Tuple[str, ...] = (
+        "violence", "hate speech", "discrimination", "illegal activities",
+        "misinformation", "harmful instructions", "dangerous content"
+    )
+    
+    human_rights_violations: Tuple[str, ...] = (
+        "surveillance", "tracking", "manipulation", "coercion",
+        "privacy invasion", "rights violation", "discrimination"
+    )
+    
     def __init__(self, settings: HAINetSettings):
         self.settings = settings
         self.logger = get_logger("ai.llm.filter", settings)
         self.constitutional_version = "1.0"
         
-        # Constitutional compliance patterns
-        self.privacy_violations = [
-            "personal information", "private data", "confidential",
-            "social security", "credit card", "password", "api key"
-        ]
-        
-        self.harmful_content = [
-            "violence", "hate speech", "discrimination", "illegal activities",
-            "misinformation", "harmful instructions", "dangerous content"
-        ]
+        # One combined scanner for every category, shared by all filter instances
+        self.matcher = _build_matcher(
+            self.privacy_violations + self.harmful_content + self.human_rights_violations
+        )
+        self.privacy_patterns = frozenset(self.privacy_violations)
+    
+    def _scan(self, text: str) -> Dict[str, List[str]]:
+        """
+        Scan text once for all constitutional patterns
         
-        self.human_rights_violations = [
-            "surveillance", "tracking", "manipulation", "coercion",
-            "privacy invasion", "rights violation", "discrimination"
-        ]
+        Returns:
+            Dict of category -> matched patterns, in each category's declared order
+        """
+        return self._categorize(self.matcher.find_all(text.lower()))
+    
+    def _categorize(self, found: Set[str]) -> Dict[str, List[str]]:
+        """Split a set of matched patterns into their categories"""
+        if not found:
+            return {"privacy": [], "harmful": [], "rights": []}
+        return {
+            "privacy": [p for p in self.privacy_violations if p in found],
+            "harmful": [p for p in self.harmful_content if p in found],
+            "rights": [p for p in self.human_rights_violations if p in found]
+        }
     
     def check_prompt_compliance(self, prompt: str, user_did: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -118,13 +228,10 @@ class ConstitutionalLLMFilter:
                 "human_rights_respected": True
             }
             
-            prompt_lower = prompt.lower()
+            matches = self._scan(prompt)
             
             # Check for privacy violations
-            privacy_issues: List[str] = []
-            for pattern in self.privacy_violations:
-                if pattern in prompt_lower:
-                    privacy_issues.append(pattern)
+            privacy_issues = matches["privacy"]
             
             if privacy_issues:
                 violations_list.append({
@@ -137,10 +244,7 @@ class ConstitutionalLLMFilter:
                 compliance_result["privacy_protected"] = False
             
             # Check for harmful content
-            harmful_issues: List[str] = []
-            for pattern in self.harmful_content:
-                if pattern in prompt_lower:
-                    harmful_issues.append(pattern)
+            harmful_issues = matches["harmful"]
             
             if harmful_issues:
                 violations_list.append({
@@ -153,10 +257,7 @@ class ConstitutionalLLMFilter:
                 compliance_result["human_rights_respected"] = False
             
             # Check for human rights violations
-            rights_issues: List[str] = []
-            for pattern in self.human_rights_violations:
-                if pattern in prompt_lower:
-                    rights_issues.append(pattern)
+            rights_issues = matches["rights"]
             
             if rights_issues:
                 violations_list.append({
@@ -188,13 +289,15 @@ class ConstitutionalLLMFilter:
                 "human_rights_respected": False
             }
     
-    def check_response_compliance(self, response: str, model: str) -> Dict[str, Any]:
+    def check_response_compliance(self, response: str, model: str,
+                                  found: Optional[Set[str]] = None) -> Dict[str, Any]:
         """
         Check if LLM response complies with constitutional principles
         
         Args:
             response: LLM response to check
             model: Model that generated the response
+            found: Patterns already matched by an incremental scan; skips rescanning the response
             
         Returns:
             Dict with compliance status and details
@@ -210,13 +313,10 @@ class ConstitutionalLLMFilter:
                 "human_rights_respected": True
             }
             
-            response_lower = response.lower()
+            matches = self._scan(response) if found is None else self._categorize(found)
             
             # Check for leaked private information
-            privacy_leaks: List[str] = []
-            for pattern in self.privacy_violations:
-                if pattern in response_lower:
-                    privacy_leaks.append(pattern)
+            privacy_leaks = matches["privacy"]
             
             if privacy_leaks:
                 violations_list.append({
@@ -231,10 +331,7 @@ class ConstitutionalLLMFilter:
                 compliance_result["filtered_response"] = "[RESPONSE FILTERED: Privacy violation detected]"
             
             # Check for harmful content generation
-            harmful_content: List[str] = []
-            for pattern in self.harmful_content:
-                if pattern in response_lower:
-                    harmful_content.append(pattern)
+            harmful_content = matches["harmful"]
             
             if harmful_content:
                 violations_list.append({
@@ -267,6 +364,20 @@ class ConstitutionalLLMFilter:
                 "privacy_protected": False,
                 "human_rights_respected": False
             }
+    
+    async def check_prompt_compliance_async(self, prompt: str, user_did: Optional[str] = None) -> Dict[str, Any]:
+        """Check prompt compliance, scanning large prompts on the shared compliance pool"""
+        if len(prompt) < _OFFLOAD_MIN_CHARS:
+            return self.check_prompt_compliance(prompt, user_did)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_compliance_pool(), self.check_prompt_compliance, prompt, user_did)
+    
+    async def check_response_compliance_async(self, response: str, model: str) -> Dict[str, Any]:
+        """Check response compliance, scanning large responses on the shared compliance pool"""
+        if len(response) < _OFFLOAD_MIN_CHARS:
+            return self.check_response_compliance(response, model)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_compliance_pool(), self.check_response_compliance, response, model)
 
 
 class OllamaProvider:
@@ -281,6 +392,11 @@ class OllamaProvider:
         self.logger = get_logger("ai.llm.ollama", settings)
         self.session: Any = None
         self.available_models: List[LLMModelInfo] = []
+        self._models_view: Optional[Tuple[LLMModelInfo, ...]] = None
+        
+        # Cache validators from the last /api/tags response
+        self._tags_etag: Optional[str] = None
+        self._tags_last_modified: Optional[str] = None
         
         # Constitutional compliance
         self.filter = ConstitutionalLLMFilter(settings)
@@ -292,7 +408,18 @@ class OllamaProvider:
             if aiohttp is None:
                 self.logger.error("aiohttp is not installed, cannot initialize Ollama provider", category="init", function="initialize")
                 return False
-            self.session = aiohttp.ClientSession()  # type: ignore
+            # Pooled keep-alive connections sized for OLLAMA_NUM_PARALLEL-style concurrency
+            connector = aiohttp.TCPConnector(  # type: ignore
+                limit=64,
+                limit_per_host=32,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True,
+                keepalive_timeout=60
+            )
+            self.session = aiohttp.ClientSession(  # type: ignore
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=120)  # type: ignore
+            )
             
             # Check if Ollama is running
             if not await self._check_ollama_availability():
@@ -378,9 +505,24 @@ class OllamaProvider:
     async def _load_available_models(self):
         """Load list of available Ollama models"""
         try:
-            async with self.session.get(f"{self.base_url}/api/tags") as response:
+            # Revalidate against the previous listing so an unchanged model set is not rebuilt
+            headers = {}
+            if self.available_models:
+                if self._tags_etag:
+                    headers["If-None-Match"] = self._tags_etag
+                if self._tags_last_modified:
+                    headers["If-Modified-Since"] = self._tags_last_modified
+            
+            async with self.session.get(f"{self.base_url}/api/tags", headers=headers) as response:
+                if response.status == 304:
+                    self.logger.debug_ai("Ollama model list unchanged", function="_load_available_models")
+                    return
+                
                 if response.status == 200:
-                    data = await response.json()
+                    self._tags_etag = response.headers.get("ETag")
+                    self._tags_last_modified = response.headers.get("Last-Modified")
+                    
+                    data = _json_loads(await response.read())
                     models = data.get("models", [])
                     
                     self.available_models = []
@@ -394,8 +536,8 @@ class OllamaProvider:
                         model_info = LLMModelInfo(
                             name=model_data["name"],
                             provider=LLMProvider.OLLAMA,
-                            size_gb=model_data.get("size", 0) / (1024 * 1024 * 1024),
-                            capabilities=["text_generation", "conversation"],
+                            size_gb=model_data.get("size", 0) * _GB,
+                            capabilities=_OLLAMA_CAPABILITIES,
                             constitutional_approved=True,  # Local models are constitutionally approved
                             privacy_level="local",
                             context_length=model_data.get("details", {}).get("parameter_size", 4096),
@@ -408,6 +550,7 @@ class OllamaProvider:
                         key=lambda m: self._rank_model_preference(m.name),
                         reverse=True
                     )
+                    self._models_view = None
                     
                     self.logger.info(f"Loaded {len(self.available_models)} Ollama text generation models", category="ai", function="_load_available_models")
                     
@@ -421,6 +564,20 @@ class OllamaProvider:
         except Exception as e:
             self.logger.error(f"Failed to load Ollama models: {e}", category="ai", function="_load_available_models")
     
+    @staticmethod
+    def _build_chat_request(messages: List[LLMMessage], model: str, stream: bool,
+                            max_tokens: int, temperature: float) -> Dict[str, Any]:
+        """Build the /api/chat request body, reusing each message's cached wire dict"""
+        return {
+            "model": model,
+            "messages": [msg.to_wire() for msg in messages],
+            "stream": stream,
+            "options": {
+                "num_predict": max_tokens,
+                "temperature": temperature
+            }
+        }
+    
     async def generate_response(self, messages: List[LLMMessage], model: str,
                               user_did: Optional[str] = None,
                               max_tokens: int = 1000,
@@ -438,13 +595,14 @@ class OllamaProvider:
         Returns:
             LLM response with constitutional compliance
         """
+        # One monotonic reading for latency, one wall-clock reading for every timestamp
+        start_ns = time.perf_counter_ns()
+        timestamp = time.time()
         try:
-            start_time = time.time()
-            
             # Check constitutional compliance of the prompt
             if messages:
                 last_message = messages[-1]
-                compliance_check = self.filter.check_prompt_compliance(
+                compliance_check = await self.filter.check_prompt_compliance_async(
                     last_message.content, user_did
                 )
                 
@@ -462,48 +620,34 @@ class OllamaProvider:
                         response_time_ms=0,
                         constitutional_compliant=False,
                         privacy_protected=True,
-                        timestamp=time.time(),
+                        timestamp=timestamp,
                         metadata={"violations": compliance_check["violations"]}
                     )
             
             # Prepare request for Ollama
-            ollama_messages: List[Dict[str, str]] = []
-            for msg in messages:
-                ollama_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-            
-            request_data: Dict[str, Any] = {
-                "model": model,
-                "messages": ollama_messages,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature
-                }
-            }
+            request_data = self._build_chat_request(messages, model, False, max_tokens, temperature)
             
             # Make request to Ollama (2 minute timeout for model loading)
             async with self.session.post(
                 f"{self.base_url}/api/chat",
-                json=request_data,
+                data=_json_dumps(request_data),
+                headers=_JSON_HEADERS,
                 timeout=120
             ) as response:
                 
                 if response.status != 200:
                     raise Exception(f"Ollama request failed: {response.status}")
                 
-                data = await response.json()
+                data = _json_loads(await response.read())
                 response_content = data["message"]["content"]
                 
                 # Check constitutional compliance of response
-                response_compliance = self.filter.check_response_compliance(
+                response_compliance = await self.filter.check_response_compliance_async(
                     response_content, model
                 )
                 
                 # Calculate response time
-                response_time_ms = (time.time() - start_time) * 1000
+                response_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
                 
                 # Log the interaction
                 self.logger.log_privacy_event(
@@ -520,7 +664,7 @@ class OllamaProvider:
                     response_time_ms=response_time_ms,
                     constitutional_compliant=response_compliance["compliant"],
                     privacy_protected=response_compliance["privacy_protected"],
-                    timestamp=time.time(),
+                    timestamp=timestamp,
                     metadata={
                         "eval_duration": data.get("eval_duration", 0),
                         "load_duration": data.get("load_duration", 0),
@@ -549,7 +693,7 @@ class OllamaProvider:
                 response_time_ms=0,
                 constitutional_compliant=True,
                 privacy_protected=True,
-                timestamp=time.time(),
+                timestamp=timestamp,
                 metadata=error_details
             )
     
@@ -574,7 +718,7 @@ class OllamaProvider:
             # Check constitutional compliance first
             if messages:
                 last_message = messages[-1]
-                compliance_check = self.filter.check_prompt_compliance(
+                compliance_check = await self.filter.check_prompt_compliance_async(
                     last_message.content, user_did
                 )
                 
@@ -583,28 +727,17 @@ class OllamaProvider:
                     return
             
             # Prepare request for Ollama streaming
-            ollama_messages: List[Dict[str, str]] = []
-            for msg in messages:
-                ollama_messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-            
-            request_data: Dict[str, Any] = {
-                "model": model,
-                "messages": ollama_messages,
-                "stream": True,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature
-                }
-            }
+            request_data = self._build_chat_request(messages, model, True, max_tokens, temperature)
             
             # Stream response from Ollama (2 minute timeout for model loading)
-            full_response = ""
+            # Chunks are scanned incrementally; only a short suffix is kept between them
+            scan = self.filter.matcher.stream()
+            privacy_patterns = self.filter.privacy_patterns
+            received = False
             async with self.session.post(
                 f"{self.base_url}/api/chat",
-                json=request_data,
+                data=_json_dumps(request_data),
+                headers=_JSON_HEADERS,
                 timeout=120
             ) as response:
                 
@@ -612,25 +745,31 @@ class OllamaProvider:
                     yield "Error: Unable to connect to AI service."
                     return
                 
-                async for line in response.content:
-                    if line:
-                        try:
-                            data = json.loads(line.decode().strip())
-                            if "message" in data and "content" in data["message"]:
-                                chunk = data["message"]["content"]
-                                full_response += chunk
-                                
-                                # Basic constitutional filter for chunks
-                                if not any(violation in chunk.lower() for violation in self.filter.privacy_violations):
-                                    yield chunk
-                                
-                        except json.JSONDecodeError:
+                # Ollama streams newline-delimited JSON; read one frame at a time
+                while not response.content.at_eof():
+                    line = await response.content.readuntil(b"\n")
+                    if not line.strip():
+                        continue
+                    try:
+                        data = _json_loads(line)
+                    except ValueError:
+                        continue
+                    
+                    message = data.get("message")
+                    if message and "content" in message:
+                        chunk = message["content"]
+                        if not chunk:
                             continue
+                        received = True
+                        
+                        # Basic constitutional filter for chunks, including matches straddling the previous chunk
+                        if privacy_patterns.isdisjoint(scan.feed(chunk.lower())):
+                            yield chunk
             
-            # Final compliance check on complete response
-            if full_response:
+            # Final compliance check from the patterns seen while streaming
+            if received:
                 response_compliance = self.filter.check_response_compliance(
-                    full_response, model
+                    "", model, found=scan.found
                 )
                 
                 if not response_compliance["compliant"]:
@@ -654,9 +793,11 @@ class OllamaProvider:
             self.logger.error(f"Ollama streaming failed: {e}", category="ai", function="stream_response")
             yield "I apologize, but I'm currently unable to process your request."
     
-    def get_available_models(self) -> List[LLMModelInfo]:
-        """Get list of available models"""
-        return self.available_models.copy()
+    def get_available_models(self) -> Tuple[LLMModelInfo, ...]:
+        """Get available models as a read-only snapshot, rebuilt only after the list changes"""
+        if self._models_view is None:
+            self._models_view = tuple(self.available_models)
+        return self._models_view
     
     async def close(self):
         """Close the provider"""
@@ -677,6 +818,8 @@ class LLMManager:
         # Providers
         self.providers: Dict[LLMProvider, Any] = {}
         self.available_models: List[LLMModelInfo] = []
+        self._models_view: Optional[Tuple[LLMModelInfo, ...]] = None
+        self._model_index: Dict[str, LLMProvider] = {}
         
         # Constitutional compliance
         self.filter = ConstitutionalLLMFilter(settings)
@@ -692,6 +835,15 @@ class LLMManager:
         
         # Thread safety
         self._lock = asyncio.Lock()
+        
+        # Request batching: coalesce concurrent generations so Ollama can run them in parallel
+        self.max_batch_size = max(1, int(getattr(settings, 'ollama_num_parallel', 1)))
+        self.batch_window_ms = float(getattr(settings, 'llm_batch_window_ms', 5.0))
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
+        self._batch_runs: Set[asyncio.Task] = set()
+        # One slot per request the server runs in parallel, shared by every batch
+        self._batch_slots: Optional[asyncio.Semaphore] = None
     
     async def initialize(self, llm_discovery=None) -> bool:
         """Initialize LLM manager and providers"""
@@ -711,7 +863,7 @@ class LLMManager:
                             if await ollama_provider.initialize():
                                 if len(ollama_provider.get_available_models()) > 0:
                                     self.providers[LLMProvider.OLLAMA] = ollama_provider
-                                    self.available_models.extend(ollama_provider.get_available_models())
+                                    self._register_models(ollama_provider.get_available_models())
                                     self.logger.info_network(f"Using network Ollama at {ollama_url} with {len(ollama_provider.get_available_models())} models", function="initialize")
                                     
                                     # Log available models
@@ -738,7 +890,7 @@ class LLMManager:
                     if await ollama_provider.initialize():
                         if len(ollama_provider.get_available_models()) > 0:
                             self.providers[LLMProvider.OLLAMA] = ollama_provider
-                            self.available_models.extend(ollama_provider.get_available_models())
+                            self._register_models(ollama_provider.get_available_models())
                             self.logger.info_init(f"Using local Ollama with {len(ollama_provider.get_available_models())} models", function="initialize")
                             
                             for model in ollama_provider.get_available_models():
@@ -779,41 +931,43 @@ class LLMManager:
         Returns:
             LLM response with constitutional compliance
         """
+        # Stats are only touched between awaits on the event loop, so plain
+        # increments are safe without taking the manager lock
+        stats = self.usage_stats
+        timestamp = time.time()
         try:
-            async with self._lock:
-                self.usage_stats["total_requests"] += 1
-                
-                # Auto-select first available model if none specified or model doesn't exist
-                if not model or not self._model_exists(model):
-                    if self.available_models:
-                        model = self.available_models[0].name
-                        self.logger.debug_ai(f"Auto-selected model: {model}", function="generate_response")
-                    else:
-                        raise Exception("No models available")
-                
-                # Determine provider if not specified
-                if provider is None:
-                    provider = self._get_provider_for_model(model)
-                
-                if provider not in self.providers:
-                    raise Exception(f"Provider {provider} not available")
-                
-                # Generate response
-                response = await self.providers[provider].generate_response(
-                    messages=messages,
-                    model=model,
-                    user_did=user_did,
-                    **kwargs
-                )
-                
-                # Update usage stats
-                self.usage_stats["total_tokens"] += response.tokens_used
-                if not response.constitutional_compliant:
-                    self.usage_stats["constitutional_violations"] += 1
-                if not response.privacy_protected:
-                    self.usage_stats["privacy_violations"] += 1
-                
-                return response
+            stats["total_requests"] += 1
+            
+            # Auto-select first available model if none specified or model doesn't exist
+            if not model or not self._model_exists(model):
+                if self.available_models:
+                    model = self.available_models[0].name
+                    self.logger.debug_ai(f"Auto-selected model: {model}", function="generate_response")
+                else:
+                    raise Exception("No models available")
+            
+            # Determine provider if not specified
+            if provider is None:
+                provider = self._get_provider_for_model(model)
+            
+            if provider not in self.providers:
+                raise Exception(f"Provider {provider} not available")
+            
+            # Generate response (not under the lock, so concurrent requests can overlap)
+            call_kwargs: Dict[str, Any] = dict(messages=messages, model=model, user_did=user_did, **kwargs)
+            if self.max_batch_size > 1:
+                response = await self._submit_to_batch(provider, call_kwargs)
+            else:
+                response = await self.providers[provider].generate_response(**call_kwargs)
+            
+            # Update usage stats
+            stats["total_tokens"] += response.tokens_used
+            if not response.constitutional_compliant:
+                stats["constitutional_violations"] += 1
+            if not response.privacy_protected:
+                stats["privacy_violations"] += 1
+            
+            return response
                 
         except asyncio.TimeoutError:
             self.logger.error(f"Ollama generation timed out after 2 minutes for model: {model}", category="ai", function="generate_response")
@@ -826,7 +980,7 @@ class LLMManager:
                 response_time_ms=0,
                 constitutional_compliant=True,
                 privacy_protected=True,
-                timestamp=time.time(),
+                timestamp=timestamp,
                 metadata={"error": "timeout", "timeout_seconds": 120}
             )
         except Exception as e:
@@ -840,10 +994,81 @@ class LLMManager:
                 response_time_ms=0,
                 constitutional_compliant=True,
                 privacy_protected=True,
-                timestamp=time.time(),
+                timestamp=timestamp,
                 metadata={"error": str(e)}
             )
     
+    async def _submit_to_batch(self, provider: LLMProvider, call_kwargs: Dict[str, Any]) -> LLMResponse:
+        """Queue a generation request for the batcher and wait for its result"""
+        if self._batch_task is None or self._batch_task.done():
+            self._batch_queue = asyncio.Queue()
+            self._batch_slots = asyncio.Semaphore(self.max_batch_size)
+            self._batch_task = asyncio.create_task(self._batch_loop(self._batch_queue))
+        
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((provider, call_kwargs, future))  # type: ignore[union-attr]
+        return await future
+    
+    async def _batch_loop(self, queue: asyncio.Queue):
+        """
+        Collect requests into batches (up to max_batch_size) and dispatch each batch
+        concurrently, leaving the scheduling to the provider. A request that arrives
+        alone is dispatched at once; only when others are already queued does the
+        batch keep collecting for the rest of the batch window.
+        """
+        loop = asyncio.get_running_loop()
+        window = self.batch_window_ms / 1000.0
+        
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            deadline = loop.time() + window
+            
+            while 1 < len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Run the batch in the background so the next window starts collecting immediately
+            run = asyncio.create_task(self._run_batch(batch))
+            self._batch_runs.add(run)
+            run.add_done_callback(self._batch_runs.discard)
+    
+    async def _run_batch(self, batch: List[Any]):
+        """
+        Issue all requests of one batch concurrently and resolve their futures.
+        Each request holds a batch slot while it runs, so batches started back to back
+        never have more than max_batch_size requests in flight together.
+        """
+        slots = self._batch_slots
+        
+        async def call(provider: LLMProvider, call_kwargs: Dict[str, Any]) -> LLMResponse:
+            async with slots:  # type: ignore[union-attr]
+                return await self.providers[provider].generate_response(**call_kwargs)
+        
+        try:
+            results = await asyncio.gather(
+                *(call(provider, call_kwargs) for provider, call_kwargs, _ in batch),
+                return_exceptions=True
+            )
+        except asyncio.CancelledError:
+            for _, _, future in batch:
+                future.cancel()
+            raise
+        
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
     async def stream_response(self, messages: List[LLMMessage], model: str,
                             user_did: Optional[str] = None,
                             provider: Optional[LLMProvider] = None,
@@ -892,37 +1117,53 @@ class LLMManager:
             self.logger.error(f"LLM streaming failed: {e}", category="ai", function="stream_response")
             yield f"I apologize, but I'm currently unable to process your request. Error: {str(e)}"
     
+    def _register_models(self, models: Sequence[LLMModelInfo]):
+        """Add models to the available list and the name -> provider index"""
+        self.available_models.extend(models)
+        self._models_view = None
+        for model_info in models:
+            # First registration wins, matching the order of available_models
+            self._model_index.setdefault(model_info.name, model_info.provider)
+    
     def _model_exists(self, model: str) -> bool:
         """Check if a model exists in available models"""
-        return any(model_info.name == model for model_info in self.available_models)
+        return model in self._model_index
     
     def _get_provider_for_model(self, model: str) -> LLMProvider:
         """Determine which provider to use for a given model"""
-        # Simple heuristic - improve this with model registry
-        for model_info in self.available_models:
-            if model_info.name == model:
-                return model_info.provider
+        provider = self._model_index.get(model)
+        if provider is not None:
+            return provider
         
         # Default to Ollama if available
         if LLMProvider.OLLAMA in self.providers:
             return LLMProvider.OLLAMA
         
         # Return first available provider
-        if self.providers:
-            return list(self.providers.keys())[0]
-        
-        return LLMProvider.OLLAMA
+        return next(iter(self.providers), LLMProvider.OLLAMA)
     
-    def get_available_models(self) -> List[LLMModelInfo]:
-        """Get list of all available models"""
-        return self.available_models.copy()
+    def get_available_models(self) -> Tuple[LLMModelInfo, ...]:
+        """Get all available models as a read-only snapshot, rebuilt only after registration"""
+        if self._models_view is None:
+            self._models_view = tuple(self.available_models)
+        return self._models_view
     
     def get_usage_stats(self) -> Dict[str, Any]:
-        """Get usage statistics"""
-        return self.usage_stats.copy()
+        """Get a snapshot of usage statistics"""
+        return dict(self.usage_stats)
     
     async def close(self):
         """Close all providers"""
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            self._batch_task = None
+        for run in list(self._batch_runs):
+            run.cancel()
+        if self._batch_queue is not None:
+            while not self._batch_queue.empty():
+                _, _, future = self._batch_queue.get_nowait()
+                future.cancel()
+        
         for provider in self.providers.values():
             if hasattr(provider, 'close'):
                 await provider.close()
@@ -6,20 +6,44 @@ Sophisticated agent memory with vector search and constitutional protection
 """
 
 import asyncio
+import heapq
+import inspect
+import itertools
 import time
 import json
 import hashlib
 import numpy as np
-from typing import Dict, List, Optional, Any, Tuple
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Any, Tuple, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import threading
 
+try:
+    import hnswlib  # type: ignore
+except ImportError:
+    hnswlib = None  # type: ignore
+
+try:
+    from numba import njit, prange  # type: ignore
+except ImportError:
+    njit = None  # type: ignore
+
 from core.config.settings import HAINetSettings
 from core.logging.logger import get_logger
 from core.identity.did import ConstitutionalViolationError
 from core.storage.vector_store import VectorStore, VectorSearchResult
 from .schemas import AgentMemory
+from .keyword_matcher import KeywordMatcher
+
+# Content that is never stored as memory
+SENSITIVE_PATTERNS = (
+    "password", "private key", "secret", "api key",
+    "social security", "credit card", "bank account"
+)
+_SENSITIVE_MATCHER = KeywordMatcher(SENSITIVE_PATTERNS)
+
+MAX_MEMORY_BYTES = 1024 * 1024  # 1MB limit
 
 class MemoryType(Enum):
     """Types of memories"""
@@ -37,10 +61,14 @@ class MemoryImportance(Enum):
     LOW = "low"
     TEMPORARY = "temporary"
 
-@dataclass
+@dataclass(init=False)
 class Memory:
     """Represents a single memory"""
-    memory_id: str
+    # Declared by hand rather than with dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("key", "agent_id", "memory_type", "content", "embedding", "importance", "timestamp",
+                 "metadata", "constitutional_compliant", "user_consent", "retention_days", "content_lower")
+    
+    key: int
     agent_id: str
     memory_type: MemoryType
     content: str
@@ -48,9 +76,467 @@ class Memory:
     importance: MemoryImportance
     timestamp: float
     metadata: Dict[str, Any]
-    constitutional_compliant: bool = True
-    user_consent: bool = True
-    retention_days: Optional[int] = None
+    constitutional_compliant: bool
+    user_consent: bool
+    retention_days: Optional[int]
+    
+    def __init__(self, key: int, agent_id: str, memory_type: MemoryType, content: str,
+                 embedding: Optional[np.ndarray], importance: MemoryImportance, timestamp: float,
+                 metadata: Dict[str, Any], constitutional_compliant: bool = True,
+                 user_consent: bool = True, retention_days: Optional[int] = None, content_lower: str = ""):
+        self.key = key
+        self.agent_id = agent_id
+        self.memory_type = memory_type
+        self.content = content
+        self.embedding = embedding
+        self.importance = importance
+        self.timestamp = timestamp
+        self.metadata = metadata
+        self.constitutional_compliant = constitutional_compliant
+        self.user_consent = user_consent
+        self.retention_days = retention_days
+        # Content never changes after storage, so lowercase it once for keyword search
+        self.content_lower = content_lower or content.lower()
+    
+    @property
+    def memory_id(self) -> str:
+        """External identifier; internally memories are keyed by the integer key"""
+        return f"mem_{self.agent_id}_{self.key:08d}"
+
+# Small integer codes for the enum columns of AgentMemoryTable
+MEMORY_TYPES: Tuple[MemoryType, ...] = tuple(MemoryType)
+MEMORY_IMPORTANCES: Tuple[MemoryImportance, ...] = tuple(MemoryImportance)
+_TYPE_IDS = {memory_type: i for i, memory_type in enumerate(MEMORY_TYPES)}
+_IMPORTANCE_IDS = {importance: i for i, importance in enumerate(MEMORY_IMPORTANCES)}
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _active_rows(live, timestamps, retention_days, type_ids, type_id, now):
+        """Fused live/expiry/type test over a table's columns, one pass across cores"""
+        mask = np.empty(live.shape[0], dtype=np.bool_)
+        for i in prange(live.shape[0]):
+            retention = retention_days[i]
+            mask[i] = (live[i]
+                       and (retention < 0 or timestamps[i] + retention * 86400.0 >= now)
+                       and (type_id < 0 or type_ids[i] == type_id))
+        return mask
+else:
+    def _active_rows(live, timestamps, retention_days, type_ids, type_id, now):
+        """Live/expiry/type test over a table's columns as NumPy array expressions"""
+        mask = live & ((retention_days < 0) | (timestamps + retention_days * 86400.0 >= now))
+        if type_id >= 0:
+            mask &= type_ids == type_id
+        return mask
+
+class AgentMemoryTable:
+    """
+    Column-wise (struct-of-arrays) view of one agent's memory metadata, so type
+    and expiry filters run as single NumPy passes instead of Python loops over
+    Memory objects. Deleted rows are tombstoned and compacted once they make up
+    half of the table.
+    
+    Keyword search scans all contents joined into one string, so the substring
+    search runs as a single C-level pass rather than one `in` test per row.
+    """
+    
+    _COLUMNS = ("timestamps", "retention_days", "type_ids", "importance_ids", "compliant", "live", "content_lengths")
+    _SEPARATOR = "\x00"
+    
+    def __init__(self, capacity: int = 64):
+        self.keys: List[Optional[int]] = []
+        self.contents: List[str] = []  # Lowercased content, for keyword search
+        self.key_to_row: Dict[int, int] = {}
+        self.timestamps = np.empty(capacity, dtype=np.float64)
+        self.retention_days = np.empty(capacity, dtype=np.int32)  # -1 = permanent
+        self.type_ids = np.empty(capacity, dtype=np.int8)
+        self.importance_ids = np.empty(capacity, dtype=np.int8)
+        self.compliant = np.empty(capacity, dtype=bool)
+        self.live = np.zeros(capacity, dtype=bool)
+        self.content_lengths = np.empty(capacity, dtype=np.int64)
+        self._rows = 0
+        # Joined contents and each row's start offset; rebuilt lazily after changes
+        self._joined: Optional[str] = None
+        self._starts: Optional[np.ndarray] = None
+    
+    def __len__(self) -> int:
+        return len(self.key_to_row)
+    
+    def add(self, memory: Memory):
+        """Append one memory's metadata as a new row"""
+        row = self._rows
+        if row == len(self.live):
+            for name in self._COLUMNS:
+                column = getattr(self, name)
+                grown = np.zeros(2 * len(column), dtype=column.dtype)
+                grown[:row] = column
+                setattr(self, name, grown)
+        
+        self.timestamps[row] = memory.timestamp
+        self.retention_days[row] = -1 if memory.retention_days is None else memory.retention_days
+        self.type_ids[row] = _TYPE_IDS[memory.memory_type]
+        self.importance_ids[row] = _IMPORTANCE_IDS[memory.importance]
+        self.compliant[row] = memory.constitutional_compliant
+        self.live[row] = True
+        self.content_lengths[row] = len(memory.content_lower)
+        self.keys.append(memory.key)
+        self.contents.append(memory.content_lower)
+        self.key_to_row[memory.key] = row
+        self._rows += 1
+        self._joined = None
+    
+    def remove(self, key: int):
+        """Tombstone a memory's row"""
+        row = self.key_to_row.pop(key, None)
+        if row is None:
+            return
+        self.live[row] = False
+        self.keys[row] = None
+        self.contents[row] = ""
+        self.content_lengths[row] = 0
+        self._joined = None
+        if len(self.key_to_row) * 2 < self._rows:
+            self._compact()
+    
+    def _compact(self):
+        """Rewrite the columns without tombstoned rows"""
+        keep = np.flatnonzero(self.live[:self._rows])
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            column[:len(keep)] = column[keep]
+        self.live[len(keep):] = False
+        self.keys = [self.keys[i] for i in keep]
+        self.contents = [self.contents[i] for i in keep]
+        self.key_to_row = {key: row for row, key in enumerate(self.keys)}
+        self._rows = len(keep)
+    
+    def find_rows(self, query_lower: str) -> np.ndarray:
+        """Rows whose lowercased content contains the query, in row order"""
+        if not query_lower or self._SEPARATOR in query_lower:
+            return np.array([row for row, content in enumerate(self.contents) if query_lower in content], dtype=np.int64)
+        
+        if self._joined is None:
+            self._joined = self._SEPARATOR.join(self.contents)
+            starts = np.empty(self._rows + 1, dtype=np.int64)
+            starts[0] = 0
+            np.cumsum(self.content_lengths[:self._rows] + 1, out=starts[1:])
+            self._starts = starts
+        
+        joined, starts = self._joined, self._starts
+        rows = []
+        find = joined.find
+        position = find(query_lower)
+        while position >= 0:
+            row = int(np.searchsorted(starts, position, side="right")) - 1
+            rows.append(row)
+            # One hit per row is enough; resume at the next row's content
+            position = find(query_lower, int(starts[row + 1]))
+        return np.array(rows, dtype=np.int64)
+    
+    def active_mask(self, now: float, memory_type: Optional[MemoryType] = None) -> np.ndarray:
+        """Boolean mask over rows that are live, unexpired and (optionally) of one type"""
+        n = self._rows
+        type_id = -1 if memory_type is None else _TYPE_IDS[memory_type]
+        return _active_rows(self.live[:n], self.timestamps[:n], self.retention_days[:n],
+                            self.type_ids[:n], type_id, float(now))
+    
+    def counts(self, now: float) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Unexpired memory counts by type and by importance"""
+        mask = self.active_mask(now)
+        by_type = np.bincount(self.type_ids[:self._rows][mask], minlength=len(MEMORY_TYPES))
+        by_importance = np.bincount(self.importance_ids[:self._rows][mask], minlength=len(MEMORY_IMPORTANCES))
+        return (
+            {t.value: int(c) for t, c in zip(MEMORY_TYPES, by_type) if c},
+            {i.value: int(c) for i, c in zip(MEMORY_IMPORTANCES, by_importance) if c}
+        )
+    
+    def all_compliant(self) -> bool:
+        """Whether every live row is constitutionally compliant"""
+        return bool(self.compliant[:self._rows][self.live[:self._rows]].all())
+
+# Bit counts for every byte value, used to popcount packed binary embeddings
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint16)
+
+QUANTIZATION_TYPES = ("none", "int8", "binary")
+
+class EmbeddingArena:
+    """
+    Pooled float32 storage for memory embeddings of one dimension, shared by
+    all agents of a manager. Rows come from fixed-size slabs, so growing the
+    pool never moves existing rows; freed rows are reused before new slabs
+    are allocated. Memory.embedding is a read-only view of its row while the
+    memory is stored; release hands back a private copy to swap in before the
+    row can be reused.
+    """
+    
+    def __init__(self, dim: int, slab_rows: int = 1024):
+        self.dim = dim
+        self.slab_rows = slab_rows
+        self.slabs: List[np.ndarray] = []
+        self._free: List[int] = []
+        self._rows: Dict[int, int] = {}
+        self._next_row = 0
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def store(self, key: int, vector: np.ndarray) -> np.ndarray:
+        """Copy a vector into a pooled row for the given memory key and return a view of it"""
+        row = self._rows.get(key)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = self._next_row
+                self._next_row += 1
+                if row // self.slab_rows == len(self.slabs):
+                    self.slabs.append(np.empty((self.slab_rows, self.dim), dtype=np.float32))
+            self._rows[key] = row
+        
+        slab, offset = divmod(row, self.slab_rows)
+        view = self.slabs[slab][offset]
+        view[:] = vector
+        view = view.view()
+        view.setflags(write=False)
+        return view
+    
+    def release(self, key: int) -> Optional[np.ndarray]:
+        """
+        Return a memory's row to the pool. The row will be overwritten by a later
+        store, so a read-only copy of its current vector is returned for the
+        caller to put on the Memory in place of the pooled view.
+        """
+        row = self._rows.pop(key, None)
+        if row is None:
+            return None
+        slab, offset = divmod(row, self.slab_rows)
+        detached = self.slabs[slab][offset].copy()
+        detached.setflags(write=False)
+        self._free.append(row)
+        return detached
+
+class AgentHNSWIndex:
+    """
+    Approximate nearest-neighbour graph (hnswlib, cosine space) over one agent's
+    embeddings. Memory keys are used directly as labels; removed memories are
+    marked deleted rather than rebuilt.
+    """
+    
+    def __init__(self, dim: int, capacity: int):
+        self.index = hnswlib.Index(space="cosine", dim=dim)
+        self.index.init_index(max_elements=max(capacity, 16), M=16, ef_construction=200)
+        self._keys: set = set()
+        self._inserted = 0
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def add_items(self, keys: List[int], vectors: np.ndarray):
+        """Insert (or replace) a batch of unit vectors"""
+        new = [key for key in keys if key not in self._keys]
+        needed = self._inserted + len(new)
+        capacity = self.index.get_max_elements()
+        if needed > capacity:
+            self.index.resize_index(max(needed, capacity * 2))
+        
+        self.index.add_items(vectors, keys)
+        self._inserted = needed
+        self._keys.update(new)
+    
+    def remove(self, key: int):
+        if key in self._keys:
+            self._keys.discard(key)
+            self.index.mark_deleted(key)
+    
+    def query(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """Return up to k (memory key, cosine similarity) pairs, best first"""
+        k = min(k, len(self._keys))
+        if k <= 0:
+            return []
+        self.index.set_ef(max(k, 64))
+        labels, distances = self.index.knn_query(vector.reshape(1, -1), k=k)
+        return [(int(label), 1.0 - float(distance))
+                for label, distance in zip(labels[0], distances[0])]
+
+class AgentEmbeddingIndex:
+    """
+    Contiguous matrix of one agent's L2-normalized memory embeddings.
+    Row i belongs to the memory keyed keys[i], so a query is scored against every
+    memory with a single matrix-vector product.
+    
+    Rows are stored as float32, as int8 with a per-row scale (4x smaller),
+    or as sign bits packed 8 per byte (32x smaller, Hamming similarity).
+    
+    Rows live in a preallocated buffer that doubles when full, so inserts are
+    amortized O(1); matrix and scales are views of the filled rows.
+    """
+    
+    def __init__(self, dim: int, quantization: str = "none", capacity: int = 64):
+        if quantization not in QUANTIZATION_TYPES:
+            raise ValueError(f"Unknown quantization type: {quantization}")
+        self.dim = dim
+        self.quantization = quantization
+        if quantization == "binary":
+            self._buffer = np.empty((capacity, (dim + 7) // 8), dtype=np.uint8)
+        elif quantization == "int8":
+            self._buffer = np.empty((capacity, dim), dtype=np.int8)
+        else:
+            self._buffer = np.empty((capacity, dim), dtype=np.float32)
+        self._scale_buffer = np.empty(capacity, dtype=np.float32)
+        self.keys: List[int] = []
+        self._positions: Dict[int, int] = {}
+        self.graph: Optional[AgentHNSWIndex] = None
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._buffer[:len(self.keys)]
+    
+    @property
+    def scales(self) -> np.ndarray:
+        return self._scale_buffer[:len(self.keys)]
+    
+    def _grow(self):
+        """Double the row capacity, copying the filled rows once"""
+        n = len(self.keys)
+        buffer = np.empty((2 * len(self._buffer), self._buffer.shape[1]), dtype=self._buffer.dtype)
+        buffer[:n] = self._buffer[:n]
+        scale_buffer = np.empty(2 * len(self._scale_buffer), dtype=np.float32)
+        scale_buffer[:n] = self._scale_buffer[:n]
+        self._buffer = buffer
+        self._scale_buffer = scale_buffer
+    
+    @staticmethod
+    def normalize(vector: np.ndarray) -> Optional[np.ndarray]:
+        """Return a float32 unit vector, or None for a zero/invalid vector"""
+        v = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(v))
+        if not np.isfinite(norm) or norm == 0.0:
+            return None
+        return v / norm
+    
+    def _encode(self, v: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Quantize a unit vector into a stored row and its scale"""
+        if self.quantization == "binary":
+            return np.packbits(v > 0), 1.0
+        if self.quantization == "int8":
+            scale = float(np.abs(v).max()) / 127.0
+            return np.round(v / scale).astype(np.int8), scale
+        return v, 1.0
+    
+    def add(self, key: int, embedding: np.ndarray) -> bool:
+        """Add or replace a memory's embedding; returns False if it cannot be indexed"""
+        v = self.normalize(embedding)
+        if v is None or v.shape[0] != self.dim:
+            return False
+        row, scale = self._encode(v)
+        if self.graph is not None:
+            self.graph.add_items([key], v.reshape(1, -1))
+        
+        position = self._positions.get(key)
+        if position is None:
+            position = len(self.keys)
+            if position == len(self._buffer):
+                self._grow()
+            self._positions[key] = position
+            self.keys.append(key)
+        
+        self._buffer[position] = row
+        self._scale_buffer[position] = scale
+        return True
+    
+    def remove(self, key: int) -> bool:
+        """Remove a memory's row, moving the last row into its slot"""
+        position = self._positions.pop(key, None)
+        if position is None:
+            return False
+        if self.graph is not None:
+            self.graph.remove(key)
+        
+        last = len(self.keys) - 1
+        if position != last:
+            moved_key = self.keys[last]
+            self._buffer[position] = self._buffer[last]
+            self._scale_buffer[position] = self._scale_buffer[last]
+            self.keys[position] = moved_key
+            self._positions[moved_key] = position
+        
+        self.keys.pop()
+        return True
+    
+    def enable_graph(self) -> bool:
+        """Build an HNSW graph over the current rows; binary rows are too coarse to rebuild from"""
+        if hnswlib is None or self.quantization == "binary" or self.graph is not None:
+            return False
+        vectors = self.matrix.astype(np.float32)
+        if self.quantization == "int8":
+            vectors *= self.scales[:, None]
+        graph = AgentHNSWIndex(self.dim, 2 * len(self.keys))
+        graph.add_items(list(self.keys), vectors)
+        self.graph = graph
+        return True
+    
+    def query_graph(self, query_embedding: np.ndarray, k: int) -> Optional[List[Tuple[int, float]]]:
+        """Approximate top-k via the HNSW graph, or None when no graph is built"""
+        if self.graph is None:
+            return None
+        q = self.normalize(query_embedding)
+        if q is None or q.shape[0] != self.dim:
+            return None
+        return self.graph.query(q, k)
+    
+    def scores(self, query_embedding: np.ndarray) -> Optional[np.ndarray]:
+        """Similarity of the query against every indexed memory (cosine, or its Hamming estimate)"""
+        q = self.normalize(query_embedding)
+        if q is None or q.shape[0] != self.dim:
+            return None
+        if self.quantization == "binary":
+            # 1 - 2 * (differing sign bits / dim): +1 for identical signs, -1 for opposite
+            distance = _POPCOUNT[np.bitwise_xor(self.matrix, np.packbits(q > 0))].sum(axis=1)
+            return 1.0 - 2.0 * distance.astype(np.float32) / self.dim
+        if self.quantization == "int8":
+            return (self.matrix @ q) * self.scales
+        return self.matrix @ q
+
+class QueryResultCache:
+    """
+    Recent embedding searches for one agent. A query whose unit vector is
+    within the similarity threshold of a cached query (with the same filters)
+    reuses that query's results instead of searching again.
+    """
+    
+    def __init__(self, dim: int, capacity: int, threshold: float, ttl_seconds: float):
+        self.dim = dim
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        # Unused slots stay zero vectors, which never reach the threshold
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.entries: List[Optional[Tuple[Any, List[Tuple[Memory, float]], float]]] = [None] * capacity
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+    
+    def lookup(self, query: np.ndarray, key: Any, now: float) -> Optional[List[Tuple[Memory, float]]]:
+        """Return cached results for a near-duplicate query, if any"""
+        if query.shape[0] != self.dim:
+            return None
+        sims = self.vectors @ query
+        hits = np.flatnonzero(sims >= self.threshold)
+        for slot in hits[np.argsort(-sims[hits])]:
+            entry = self.entries[slot]
+            if entry is None or entry[0] != key or now - entry[2] > self.ttl_seconds:
+                continue
+            self.last_used[slot] = now
+            return list(entry[1])
+        return None
+    
+    def store(self, query: np.ndarray, key: Any, results: List[Tuple[Memory, float]], now: float):
+        """Cache results, replacing the least recently used entry"""
+        if query.shape[0] != self.dim:
+            return
+        slot = int(np.argmin(self.last_used))
+        self.vectors[slot] = query
+        self.entries[slot] = (key, list(results), now)
+        self.last_used[slot] = now
 
 class MemoryManager:
     """
@@ -58,18 +544,55 @@ class MemoryManager:
     Manages agent memories with vector search and constitutional compliance
     """
     
-    def __init__(self, settings: HAINetSettings, vector_store: Optional[VectorStore] = None):
+    # Embeddings shared by every manager, keyed by (embedding_fn, SHA-256 of the text)
+    _embedding_cache: "OrderedDict[Tuple[Any, bytes], np.ndarray]" = OrderedDict()
+    embedding_cache_size = 4096
+    
+    def __init__(self, settings: HAINetSettings, vector_store: Optional[VectorStore] = None,
+                 quantization_type: Optional[str] = None,
+                 embedding_fn: Optional[Callable[[str], Any]] = None):
         self.settings = settings
         self.vector_store = vector_store
         self.logger = get_logger("ai.memory", settings)
         
+        # Optional embedding backend (sync or async callable: text -> vector)
+        self.embedding_fn = embedding_fn
+        
+        # Agents with more indexed embeddings than this switch to an HNSW graph (if hnswlib is installed)
+        self.hnsw_threshold = int(getattr(settings, 'memory_hnsw_threshold', 1000))
+        
+        # Precision of indexed embeddings: none (float32), int8 or binary
+        self.quantization_type = quantization_type or getattr(settings, 'memory_quantization', "none")
+        if self.quantization_type not in QUANTIZATION_TYPES:
+            raise ValueError(f"Unknown quantization type: {self.quantization_type}")
+        
         # Constitutional compliance
         self.constitutional_version = "1.0"
         self.max_memories_per_agent = 10000  # Privacy: data minimization
         
         # Memory storage
-        self.agent_memories: Dict[str, Dict[str, Memory]] = {}
+        # Memories are keyed by an integer sequence number; memory IDs are derived from it on demand
+        self.agent_memories: Dict[str, Dict[int, Memory]] = {}
         self.memory_counter = 0
+        self._memory_keys = itertools.count(1)
+        
+        # Per-agent columnar metadata for vectorized filtering and summaries
+        self._memory_tables: Dict[str, AgentMemoryTable] = {}
+        
+        # Per-agent min-heaps of (expiry_time, memory key); entries for deleted memories are skipped lazily
+        self._expiry_heaps: Dict[str, List[Tuple[float, int]]] = {}
+        
+        # Pooled storage for Memory.embedding, one arena per embedding dimension
+        self._embedding_arenas: Dict[int, EmbeddingArena] = {}
+        
+        # Per-agent embedding matrices for vectorized similarity search
+        self._embedding_index: Dict[str, AgentEmbeddingIndex] = {}
+        
+        # Per-agent caches of recent embedding searches; dropped whenever the agent's memories change
+        self._query_cache: Dict[str, QueryResultCache] = {}
+        self.query_cache_size = int(getattr(settings, 'memory_query_cache_size', 64))
+        self.query_cache_threshold = float(getattr(settings, 'memory_query_cache_threshold', 0.95))
+        self.query_cache_ttl = float(getattr(settings, 'memory_query_cache_ttl', 60.0))
         
         # Retention policies (in days)
         self.retention_policies = {
@@ -80,8 +603,15 @@ class MemoryManager:
             MemoryImportance.TEMPORARY: 1         # 1 day
         }
         
-        # Thread safety
-        self._lock = asyncio.Lock()
+        # Write-behind batching of vector store inserts
+        self.vector_flush_size = max(1, int(getattr(settings, 'memory_vector_flush_size', 64)))
+        self.vector_flush_ms = float(getattr(settings, 'memory_vector_flush_ms', 100.0))
+        self._pending_writes: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # Concurrency: one lock per agent so unrelated agents never wait on each other.
+        # Locks are only created by store_memory, so lookups for unknown agents leave nothing behind
+        self._locks: Dict[str, asyncio.Lock] = {}
     
     async def store_memory(self, agent_id: str, content: str, memory_type: MemoryType,
                           importance: MemoryImportance, metadata: Optional[Dict[str, Any]] = None,
@@ -101,18 +631,29 @@ class MemoryManager:
             Memory ID if stored successfully
         """
         try:
-            async with self._lock:
-                # Check constitutional compliance
-                if not await self._validate_memory_compliance(content, agent_id):
-                    self.logger.log_violation("memory_constitutional_violation", {
-                        "agent_id": agent_id,
-                        "content_preview": content[:50] + "..." if len(content) > 50 else content
-                    })
-                    return None
-                
+            content_lower = content.lower()
+            compliant = self._validate_memory_compliance(content, agent_id, content_lower)
+            
+            # Embed outside the lock, and only content that may be stored at all
+            if embedding is None and self.embedding_fn is not None and compliant:
+                embedding = await self.embed(content)
+            
+            # Check constitutional compliance
+            if not compliant:
+                self.logger.log_violation("memory_constitutional_violation", {
+                    "agent_id": agent_id,
+                    "content_preview": content[:50] + "..." if len(content) > 50 else content
+                })
+                return None
+            
+            lock = self._locks.get(agent_id)
+            if lock is None:
+                lock = self._locks[agent_id] = asyncio.Lock()
+            async with lock:
                 # Check memory limits per agent (community focus: resource limits)
                 if agent_id not in self.agent_memories:
                     self.agent_memories[agent_id] = {}
+                    self._memory_tables[agent_id] = AgentMemoryTable()
                 
                 if len(self.agent_memories[agent_id]) >= self.max_memories_per_agent:
                     # Clean up old temporary memories
@@ -125,31 +666,43 @@ class MemoryManager:
                         })
                         return None
                 
-                # Generate memory ID
-                self.memory_counter += 1
-                memory_id = f"mem_{agent_id}_{self.memory_counter:08d}"
+                # Generate memory key
+                key = self.memory_counter = next(self._memory_keys)
                 
-                # Create memory
+                # Create memory; with quantization on, the index holds the only in-memory copy
+                if embedding is not None and self.quantization_type == "none":
+                    pooled = self._pool_embedding(key, embedding)
+                else:
+                    pooled = None
                 memory = Memory(
-                    memory_id=memory_id,
+                    key=key,
                     agent_id=agent_id,
                     memory_type=memory_type,
                     content=content,
-                    embedding=embedding,
+                    embedding=pooled,
                     importance=importance,
                     timestamp=time.time(),
                     metadata=metadata or {},
                     constitutional_compliant=True,
                     user_consent=True,
-                    retention_days=self.retention_policies.get(importance)
+                    retention_days=self.retention_policies.get(importance),
+                    content_lower=content_lower
                 )
                 
                 # Store in agent memories
-                self.agent_memories[agent_id][memory_id] = memory
+                self.agent_memories[agent_id][key] = memory
+                self._memory_tables[agent_id].add(memory)
+                self._query_cache.pop(agent_id, None)
+                
+                if memory.retention_days is not None:
+                    self._schedule_expiry(memory)
                 
-                # Store in vector store for semantic search
+                if embedding is not None:
+                    self._index_embedding(agent_id, key, embedding)
+                
+                # Queue for the vector store; written in batches off the caller's path
                 if self.vector_store and embedding is not None:
-                    await self._store_in_vector_store(memory)
+                    self._queue_vector_write(memory, embedding)
                 
                 self.logger.log_privacy_event(
                     "memory_stored",
@@ -157,7 +710,7 @@ class MemoryManager:
                     user_consent=True
                 )
                 
-                return memory_id
+                return memory.memory_id
                 
         except Exception as e:
             self.logger.error(f"Memory storage failed: {e}")
@@ -166,30 +719,33 @@ class MemoryManager:
     async def retrieve_memory(self, agent_id: str, memory_id: str) -> Optional[Memory]:
         """Retrieve specific memory by ID"""
         try:
-            async with self._lock:
-                agent_memories = self.agent_memories.get(agent_id, {})
-                memory = agent_memories.get(memory_id)
-                
-                if memory:
-                    # Check if memory has expired
-                    if await self._is_memory_expired(memory):
-                        await self._delete_memory(agent_id, memory_id)
-                        return None
-                    
-                    self.logger.log_privacy_event(
-                        "memory_retrieved",
-                        f"{memory.memory_type.value}",
-                        user_consent=True
-                    )
+            key = self._memory_key(memory_id)
+            
+            # Lock-free read: the lookup never awaits, so no writer can interleave with it
+            memory = self.agent_memories.get(agent_id, {}).get(key)
+            
+            if memory:
+                # Check if memory has expired; only the deletion needs the agent's lock
+                if self._is_memory_expired(memory):
+                    async with self._locks[agent_id]:
+                        await self._delete_memory(agent_id, key)
+                    return None
                 
-                return memory
+                self.logger.log_privacy_event(
+                    "memory_retrieved",
+                    f"{memory.memory_type.value}",
+                    user_consent=True
+                )
+            
+            return memory
                 
         except Exception as e:
             self.logger.error(f"Memory retrieval failed: {e}")
             return None
     
     async def search_memories(self, agent_id: str, query: str, memory_type: Optional[MemoryType] = None,
-                             limit: int = 10) -> List[Tuple[Memory, float]]:
+                             limit: int = 10,
+                             query_embedding: Optional[np.ndarray] = None) -> List[Tuple[Memory, float]]:
         """
         Search agent memories using semantic similarity
         
@@ -198,46 +754,43 @@ class MemoryManager:
             query: Search query
             memory_type: Optional memory type filter
             limit: Maximum results to return
+            query_embedding: Optional query vector; enables similarity search over stored embeddings
             
         Returns:
             List of (Memory, similarity_score) tuples
         """
         try:
-            async with self._lock:
+            if query_embedding is None and self.embedding_fn is not None and agent_id in self._embedding_index:
+                query_embedding = await self.embed(query)
+            
+            lock = self._locks.get(agent_id)
+            if lock is None:
+                return []
+            async with lock:
                 if agent_id not in self.agent_memories:
                     return []
                 
-                results = []
-                
-                # If vector store available, use semantic search
-                if self.vector_store:
-                    # This would require query embedding - simplified for now
-                    # In full implementation, would embed query and search vector store
-                    pass
-                
-                # Fallback to keyword search
-                query_lower = query.lower()
+                results: List[Tuple[Memory, float]] = []
                 agent_memories = self.agent_memories[agent_id]
                 
-                for memory in agent_memories.values():
-                    # Check if memory has expired
-                    if await self._is_memory_expired(memory):
-                        continue
+                # Semantic search over the agent's embedding matrix, short-circuited by near-duplicate queries
+                if query_embedding is not None and limit > 0:
+                    results = await self._search_embeddings_cached(agent_id, query_embedding, memory_type, limit)
+                
+                # Fallback to keyword search when no embeddings could be searched
+                if not results:
+                    query_lower = query.lower()
+                    table = self._memory_tables[agent_id]
                     
-                    # Apply memory type filter
-                    if memory_type and memory.memory_type != memory_type:
-                        continue
+                    # Simple keyword matching, then expiry and type filters as one vectorized mask
+                    rows = table.find_rows(query_lower)
+                    rows = rows[table.active_mask(time.time(), memory_type)[rows]]
                     
-                    # Simple keyword matching
-                    content_lower = memory.content.lower()
-                    if query_lower in content_lower:
-                        # Calculate simple similarity score
-                        similarity = len(query_lower) / len(content_lower)
-                        results.append((memory, similarity))
-                
-                # Sort by similarity and limit results
-                results.sort(key=lambda x: x[1], reverse=True)
-                results = results[:limit]
+                    # Calculate simple similarity scores; stable sort keeps insertion order for ties
+                    scores = len(query_lower) / np.maximum(table.content_lengths[rows], 1)
+                    top = np.argsort(-scores, kind="stable")[:max(limit, 0)]
+                    keys = table.keys
+                    results = [(agent_memories[keys[rows[i]]], float(scores[i])) for i in top]
                 
                 self.logger.log_privacy_event(
                     "memory_search",
@@ -251,6 +804,141 @@ class MemoryManager:
             self.logger.error(f"Memory search failed: {e}")
             return []
     
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embed text with the configured backend, reusing cached vectors for identical text
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Read-only embedding vector, or None if no backend is configured or it failed
+        """
+        if self.embedding_fn is None:
+            return None
+        
+        cache = MemoryManager._embedding_cache
+        key = (self.embedding_fn, hashlib.sha256(text.encode()).digest())
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+            return cached
+        
+        try:
+            result = self.embedding_fn(text)
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as e:
+            self.logger.error(f"Embedding failed: {e}")
+            return None
+        if result is None:
+            return None
+        
+        vector = np.array(result, dtype=np.float32).reshape(-1)
+        vector.setflags(write=False)
+        cache[key] = vector
+        while len(cache) > self.embedding_cache_size:
+            cache.popitem(last=False)
+        return vector
+    
+    async def _search_embeddings_cached(self, agent_id: str, query_embedding: np.ndarray,
+                                        memory_type: Optional[MemoryType], limit: int) -> List[Tuple[Memory, float]]:
+        """Serve near-duplicate queries from the agent's query cache, searching on a miss"""
+        query = AgentEmbeddingIndex.normalize(query_embedding)
+        if query is None or self.query_cache_size <= 0:
+            return await self._search_embeddings(agent_id, query_embedding, memory_type, limit)
+        
+        now = time.time()
+        key = (memory_type, limit)
+        cache = self._query_cache.get(agent_id)
+        if cache is not None:
+            cached = cache.lookup(query, key, now)
+            if cached is not None:
+                return cached
+        
+        results = await self._search_embeddings(agent_id, query_embedding, memory_type, limit)
+        if results:
+            if cache is None or cache.dim != query.shape[0]:
+                cache = QueryResultCache(query.shape[0], self.query_cache_size,
+                                         self.query_cache_threshold, self.query_cache_ttl)
+                self._query_cache[agent_id] = cache
+            cache.store(query, key, results, now)
+        return results
+    
+    async def _search_embeddings(self, agent_id: str, query_embedding: np.ndarray,
+                                 memory_type: Optional[MemoryType], limit: int) -> List[Tuple[Memory, float]]:
+        """Return the agent's memories most similar to the query embedding"""
+        index = self._embedding_index.get(agent_id)
+        if index is None or len(index) == 0:
+            return []
+        
+        agent_memories = self.agent_memories[agent_id]
+        
+        # Large agents: approximate search over the HNSW graph, over-fetching to absorb filtered hits
+        hits = index.query_graph(query_embedding, limit * 4)
+        if hits is not None:
+            results = self._filter_ranked(agent_memories, hits, memory_type, limit)
+            if len(results) >= limit or len(hits) >= len(index):
+                return results
+        
+        # Exact search: score every embedding in one matrix-vector product
+        scores = index.scores(query_embedding)
+        if scores is None:
+            return []
+        
+        # Partial sort for the common case; fall back to a full ordering if filters drop candidates
+        count = len(scores)
+        if limit < count:
+            candidates = np.argpartition(-scores, limit)[:limit]
+            candidates = candidates[np.argsort(-scores[candidates])]
+        else:
+            candidates = np.argsort(-scores)
+        
+        keys = index.keys
+        results = self._filter_ranked(
+            agent_memories, ((keys[i], float(scores[i])) for i in candidates), memory_type, limit
+        )
+        if len(results) < limit and len(candidates) < count:
+            # Some top candidates were filtered out; rank everything instead
+            results = self._filter_ranked(
+                agent_memories, ((keys[i], float(scores[i])) for i in np.argsort(-scores)), memory_type, limit
+            )
+        return results
+    
+    def _filter_ranked(self, agent_memories: Dict[int, Memory], ranked: Iterable[Tuple[int, float]],
+                       memory_type: Optional[MemoryType], limit: int) -> List[Tuple[Memory, float]]:
+        """Walk (memory key, score) pairs best-first, keeping live memories of the requested type"""
+        results: List[Tuple[Memory, float]] = []
+        for key, score in ranked:
+            memory = agent_memories.get(key)
+            if memory is None or self._is_memory_expired(memory):
+                continue
+            if memory_type and memory.memory_type != memory_type:
+                continue
+            results.append((memory, score))
+            if len(results) >= limit:
+                break
+        return results
+    
+    def _pool_embedding(self, key: int, embedding: np.ndarray) -> np.ndarray:
+        """Copy an embedding into the shared arena for its dimension"""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        arena = self._embedding_arenas.get(vector.shape[0])
+        if arena is None:
+            arena = self._embedding_arenas[vector.shape[0]] = EmbeddingArena(vector.shape[0])
+        return arena.store(key, vector)
+    
+    def _index_embedding(self, agent_id: str, key: int, embedding: np.ndarray):
+        """Add a memory's embedding to its agent's search matrix"""
+        index = self._embedding_index.get(agent_id)
+        if index is None:
+            index = AgentEmbeddingIndex(int(np.asarray(embedding).size), self.quantization_type)
+            self._embedding_index[agent_id] = index
+        if not index.add(key, embedding):
+            self.logger.warning(f"Embedding for memory {key} of agent {agent_id} not indexed (empty or dimension {np.asarray(embedding).size} != {index.dim})")
+        elif index.graph is None and len(index) > self.hnsw_threshold and index.enable_graph():
+            self.logger.info(f"Built HNSW index for agent {agent_id} ({len(index)} embeddings)", category="ai", function="_index_embedding")
+    
     async def delete_memory(self, agent_id: str, memory_id: str, user_requested: bool = False) -> bool:
         """
         Delete a specific memory (right to be forgotten)
@@ -263,43 +951,68 @@ class MemoryManager:
         Returns:
             True if deleted successfully
         """
-        return await self._delete_memory(agent_id, memory_id, user_requested)
+        key = self._memory_key(memory_id)
+        lock = self._locks.get(agent_id)
+        if lock is None:
+            return False
+        async with lock:
+            return await self._delete_memory(agent_id, key, user_requested)
     
-    async def _delete_memory(self, agent_id: str, memory_id: str, user_requested: bool = False) -> bool:
-        """Internal memory deletion"""
+    @staticmethod
+    def _memory_key(memory_id: str) -> Optional[int]:
+        """Recover the integer key from an external memory ID (mem_<agent>_<key>)"""
         try:
-            async with self._lock:
-                if agent_id not in self.agent_memories:
-                    return False
-                
-                agent_memories = self.agent_memories[agent_id]
-                if memory_id not in agent_memories:
-                    return False
-                
-                memory = agent_memories[memory_id]
-                
-                # Remove from agent memories
-                del agent_memories[memory_id]
-                
-                # Remove from vector store if present
-                if self.vector_store:
-                    # This would integrate with vector store deletion
-                    pass
-                
-                if user_requested:
-                    self.logger.log_human_rights_event(
-                        "memory_deleted_user_request",
-                        user_control=True
-                    )
-                else:
-                    self.logger.log_privacy_event(
-                        "memory_deleted_retention",
-                        f"{memory.memory_type.value}",
-                        user_consent=True
-                    )
-                
-                return True
-                
+            return int(memory_id.rpartition("_")[2])
+        except (AttributeError, ValueError):
+            return None
+    
+    async def _delete_memory(self, agent_id: str, key: Optional[int], user_requested: bool = False) -> bool:
+        """Internal memory deletion by key; the caller holds the agent's lock"""
+        try:
+            if agent_id not in self.agent_memories:
+                return False
+            
+            agent_memories = self.agent_memories[agent_id]
+            if key not in agent_memories:
+                return False
+            
+            memory = agent_memories[key]
+            
+            # Remove from agent memories
+            del agent_memories[key]
+            if memory.embedding is not None:
+                arena = self._embedding_arenas.get(memory.embedding.shape[0])
+                if arena is not None:
+                    # Callers and cached query results may still hold this Memory
+                    detached = arena.release(key)
+                    if detached is not None:
+                        memory.embedding = detached
+            self._memory_tables[agent_id].remove(key)
+            
+            index = self._embedding_index.get(agent_id)
+            if index is not None:
+                index.remove(key)
+            self._query_cache.pop(agent_id, None)
+            
+            # Remove from vector store if present
+            if self.vector_store:
+                # This would integrate with vector store deletion
+                pass
+            
+            if user_requested:
+                self.logger.log_human_rights_event(
+                    "memory_deleted_user_request",
+                    user_control=True
+                )
+            else:
+                self.logger.log_privacy_event(
+                    "memory_deleted_retention",
+                    f"{memory.memory_type.value}",
+                    user_consent=True
+                )
+            
+            return True
+            
         except Exception as e:
             self.logger.error(f"Memory deletion failed: {e}")
             return False
@@ -307,32 +1020,23 @@ class MemoryManager:
     async def get_agent_memory_summary(self, agent_id: str) -> Dict[str, Any]:
         """Get summary of agent's memories"""
         try:
-            async with self._lock:
+            lock = self._locks.get(agent_id)
+            if lock is None:
+                return {"total_memories": 0}
+            async with lock:
                 if agent_id not in self.agent_memories:
                     return {"total_memories": 0}
                 
-                agent_memories = self.agent_memories[agent_id]
+                table = self._memory_tables[agent_id]
                 
-                # Count by type
-                type_counts = {}
-                importance_counts = {}
-                
-                for memory in agent_memories.values():
-                    # Skip expired memories
-                    if await self._is_memory_expired(memory):
-                        continue
-                    
-                    memory_type = memory.memory_type.value
-                    importance = memory.importance.value
-                    
-                    type_counts[memory_type] = type_counts.get(memory_type, 0) + 1
-                    importance_counts[importance] = importance_counts.get(importance, 0) + 1
+                # Count unexpired memories by type and importance
+                type_counts, importance_counts = table.counts(time.time())
                 
                 return {
-                    "total_memories": len(agent_memories),
+                    "total_memories": len(table),
                     "by_type": type_counts,
                     "by_importance": importance_counts,
-                    "constitutional_compliant": all(m.constitutional_compliant for m in agent_memories.values())
+                    "constitutional_compliant": table.all_compliant()
                 }
                 
         except Exception as e:
@@ -342,52 +1046,68 @@ class MemoryManager:
     async def cleanup_expired_memories(self) -> Dict[str, int]:
         """Clean up expired memories across all agents"""
         try:
-            async with self._lock:
-                cleanup_counts = {}
-                
-                for agent_id in list(self.agent_memories.keys()):
+            cleanup_counts = {}
+            
+            # One agent at a time, so other agents keep working during a sweep;
+            # agents with nothing due are skipped without taking their lock
+            current_time = time.time()
+            for agent_id, heap in list(self._expiry_heaps.items()):
+                if not heap or heap[0][0] >= current_time:
+                    continue
+                async with self._locks[agent_id]:
                     count = await self._cleanup_old_memories(agent_id)
-                    if count > 0:
-                        cleanup_counts[agent_id] = count
-                
-                total_cleaned = sum(cleanup_counts.values())
-                if total_cleaned > 0:
-                    self.logger.log_privacy_event(
-                        "expired_memories_cleanup",
-                        f"total_{total_cleaned}",
-                        user_consent=True
-                    )
-                
-                return cleanup_counts
+                if count > 0:
+                    cleanup_counts[agent_id] = count
+            
+            total_cleaned = sum(cleanup_counts.values())
+            if total_cleaned > 0:
+                self.logger.log_privacy_event(
+                    "expired_memories_cleanup",
+                    f"total_{total_cleaned}",
+                    user_consent=True
+                )
+            
+            return cleanup_counts
                 
         except Exception as e:
             self.logger.error(f"Memory cleanup failed: {e}")
             return {}
     
+    def _schedule_expiry(self, memory: Memory):
+        """Queue a memory on its agent's expiry heap"""
+        heap = self._expiry_heaps.setdefault(memory.agent_id, [])
+        expiry_time = memory.timestamp + (memory.retention_days * 24 * 3600)
+        heapq.heappush(heap, (expiry_time, memory.key))
+        
+        # Drop stale entries once deleted memories dominate the heap
+        agent_memories = self.agent_memories.get(memory.agent_id, {})
+        if len(heap) > 2 * len(agent_memories) + 64:
+            heap[:] = [entry for entry in heap if entry[1] in agent_memories]
+            heapq.heapify(heap)
+    
     async def _cleanup_old_memories(self, agent_id: str) -> int:
         """Clean up old memories for specific agent"""
         try:
-            if agent_id not in self.agent_memories:
+            heap = self._expiry_heaps.get(agent_id)
+            agent_memories = self.agent_memories.get(agent_id)
+            if not heap or agent_memories is None:
                 return 0
             
-            agent_memories = self.agent_memories[agent_id]
-            expired_memory_ids = []
-            
-            for memory_id, memory in agent_memories.items():
-                if await self._is_memory_expired(memory):
-                    expired_memory_ids.append(memory_id)
-            
-            # Delete expired memories
-            for memory_id in expired_memory_ids:
-                await self._delete_memory(agent_id, memory_id)
+            # Pop only what has actually expired, earliest first
+            current_time = time.time()
+            cleaned = 0
+            while heap and heap[0][0] < current_time:
+                _, key = heapq.heappop(heap)
+                if key in agent_memories and await self._delete_memory(agent_id, key):
+                    cleaned += 1
             
-            return len(expired_memory_ids)
+            return cleaned
             
         except Exception as e:
             self.logger.error(f"Agent memory cleanup failed: {e}")
             return 0
     
-    async def _is_memory_expired(self, memory: Memory) -> bool:
+    def _is_memory_expired(self, memory: Memory) -> bool:
         """Check if memory has expired based on retention policy"""
         if memory.retention_days is None:
             return False  # Permanent memory
@@ -397,63 +1117,106 @@ class MemoryManager:
         
         return current_time > expiry_time
     
-    async def _validate_memory_compliance(self, content: str, agent_id: str) -> bool:
+    def _validate_memory_compliance(self, content: str, agent_id: str,
+                                    content_lower: Optional[str] = None) -> bool:
         """Validate memory content for constitutional compliance"""
-        # Check for sensitive information patterns
-        content_lower = content.lower()
-        sensitive_patterns = [
-            "password", "private key", "secret", "api key",
-            "social security", "credit card", "bank account"
-        ]
-        
-        for pattern in sensitive_patterns:
-            if pattern in content_lower:
-                return False
-        
-        # Check content size (privacy: data minimization)
-        if len(content.encode()) > 1024 * 1024:  # 1MB limit
+        # Check content size (privacy: data minimization). UTF-8 takes 1-4 bytes per char,
+        # so only long non-ASCII content needs encoding to measure
+        length = len(content)
+        if length > MAX_MEMORY_BYTES:
+            return False
+        if length * 4 > MAX_MEMORY_BYTES and not content.isascii() and len(content.encode()) > MAX_MEMORY_BYTES:
             return False
         
-        return True
+        # Check for sensitive information patterns in a single pass
+        if content_lower is None:
+            content_lower = content.lower()
+        return not _SENSITIVE_MATCHER.contains_any(content_lower)
     
-    async def _store_in_vector_store(self, memory: Memory):
-        """Store memory in vector store for semantic search"""
+    def _queue_vector_write(self, memory: Memory, embedding: np.ndarray):
+        """Queue a memory for the next vector store batch, starting the flusher if needed"""
+        if self._flush_task is None or self._flush_task.done():
+            self._pending_writes = asyncio.Queue()
+            self._flush_task = asyncio.create_task(self._flush_loop(self._pending_writes))
+        self._pending_writes.put_nowait((memory, embedding))  # type: ignore[union-attr]
+    
+    async def _flush_loop(self, queue: asyncio.Queue):
+        """Collect queued memories for up to vector_flush_ms (or vector_flush_size items) and write them together"""
+        loop = asyncio.get_running_loop()
+        window = self.vector_flush_ms / 1000.0
+        
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + window
+            
+            while len(batch) < self.vector_flush_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._store_in_vector_store(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _store_in_vector_store(self, batch: List[Tuple[Memory, np.ndarray]]):
+        """Store a batch of memories in the vector store for semantic search"""
         try:
-            if not self.vector_store or not memory.embedding:
+            if not self.vector_store or not batch:
                 return
             
             # Store in agent memory collection
-            success = self.vector_store.store_agent_memory(
-                agent_id=memory.agent_id,
-                content=memory.content,
-                embedding=memory.embedding,
-                metadata={
+            items = [
+                (memory.agent_id, memory.content, embedding, {
                     "memory_id": memory.memory_id,
                     "memory_type": memory.memory_type.value,
                     "importance": memory.importance.value,
                     "timestamp": memory.timestamp,
                     **memory.metadata
-                }
-            )
+                })
+                for memory, embedding in batch
+            ]
+            stored = await asyncio.to_thread(self.vector_store.store_agent_memory_batch, items)
             
-            if not success:
-                self.logger.warning(f"Failed to store memory {memory.memory_id} in vector store")
+            if stored < len(items):
+                self.logger.warning(f"Stored {stored} of {len(items)} memories in vector store")
                 
         except Exception as e:
             self.logger.error(f"Vector store memory storage failed: {e}")
+    
+    async def flush(self):
+        """Wait until every queued memory has been written to the vector store"""
+        if self._pending_writes is not None and self._flush_task is not None and not self._flush_task.done():
+            await self._pending_writes.join()
+    
+    async def close(self):
+        """Flush pending vector store writes and stop the background writer"""
+        await self.flush()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
 
-def create_memory_manager(settings: HAINetSettings, vector_store: Optional[VectorStore] = None) -> MemoryManager:
+def create_memory_manager(settings: HAINetSettings, vector_store: Optional[VectorStore] = None,
+                          quantization_type: Optional[str] = None,
+                          embedding_fn: Optional[Callable[[str], Any]] = None) -> MemoryManager:
     """
     Create and configure constitutional memory manager
     
     Args:
         settings: HAI-Net settings
         vector_store: Optional vector store for semantic search
+        quantization_type: Embedding precision (none, int8, binary); defaults to settings
+        embedding_fn: Optional sync or async callable that embeds text
         
     Returns:
         Configured MemoryManager instance
     """
-    return MemoryManager(settings, vector_store)
+    return MemoryManager(settings, vector_store, quantization_type, embedding_fn)
 
 if __name__ == "__main__":
     # Test the constitutional memory system
@@ -4,15 +4,59 @@ HAI-Net Prompt Assembler
 Assembles state-specific system prompts for agents based on the TrippleEffect framework.
 """
 
+import functools
+import itertools
 import time
 import json
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from core.config.settings import HAINetSettings
 from core.logging.logger import get_logger
 from core.ai.llm import LLMMessage
 from core.ai.agents import Agent, AgentRole, AgentState
 
+# Guidance appended to state transition messages
+_STATE_GUIDANCE = {
+    AgentState.PLANNING: "You are now in PLANNING mode. Create a detailed plan for the user's request.",
+    AgentState.CONVERSATION: "You are now in CONVERSATION mode. Continue engaging with the user.",
+    AgentState.STARTUP: "You are now starting up a new project. Break down the plan into tasks.",
+    AgentState.BUILD_TEAM_TASKS: "Build your team by creating worker agents for the tasks.",
+    AgentState.ACTIVATE_WORKERS: "Assign tasks to your worker agents.",
+    AgentState.MANAGE: "Monitor and coordinate your team's progress.",
+    AgentState.WORK: "Execute your assigned task.",
+    AgentState.WAIT: "Task complete. Wait for further instructions.",
+    AgentState.STANDBY: "Project complete. Standing by for new assignments.",
+}
+
+# Fully formatted transition message for every state, guidance included
+_STATE_TRANSITION_BASE = {
+    state: "\n".join(filter(None, (f"[SYSTEM] State transition to: {state.value}", _STATE_GUIDANCE.get(state))))
+    for state in AgentState
+}
+
+# Tool usage injected into dynamic context; would ideally come from the ToolExecutor
+_TOOLS_DESCRIPTION = """- send_message: Send a message to another agent
+  Usage: <tool_requests><calls><tool_call><name>send_message</name><args><target_agent_id>AGENT_ID</target_agent_id><message>Your message</message></args></tool_call></calls></tool_requests>"""
+_TOOLS_SECTION = f"Available tools:\n{_TOOLS_DESCRIPTION}"
+
+_PROMPTS_PATH = Path(__file__).parent.parent.parent / "config" / "prompts.json"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_prompts_json() -> dict:
+    """Read and decode config/prompts.json once per process; callers must not mutate the result"""
+    # Prefer the module compile_prompts.py generates, unless prompts.json changed since
+    try:
+        from . import _prompts_data
+        stat = _PROMPTS_PATH.stat()
+        if (stat.st_size, stat.st_mtime_ns) == (_prompts_data.SOURCE_SIZE, _prompts_data.SOURCE_MTIME_NS):
+            return _prompts_data.DATA
+    except ImportError:
+        pass
+    
+    with open(_PROMPTS_PATH, 'r') as f:
+        return json.load(f)
+
 
 class PromptAssembler:
     """
@@ -23,25 +67,26 @@ class PromptAssembler:
     def __init__(self, settings: HAINetSettings):
         self.settings = settings
         self.logger = get_logger("ai.prompt_assembler", settings)
+        self.history_window = max(getattr(settings, 'llm_history_window', 0), 0)
+        
+        # (refreshed_at, formatted) - Admin context only needs the time to the second
+        self._time_cache: Tuple[float, str] = (0.0, "")
         
         # System prompts for each agent role and state
         self._load_prompts_from_file()
+        self._build_prompt_map()
     
     def _load_prompts_from_file(self):
         """Load all system prompts from config/prompts.json"""
         
         try:
-            # Find the prompts file
-            prompts_path = Path(__file__).parent.parent.parent / "config" / "prompts.json"
-            
-            if not prompts_path.exists():
-                self.logger.warning(f"Prompts file not found at {prompts_path}, using defaults", category="init", function="_load_prompts_from_file")
+            if not _PROMPTS_PATH.exists():
+                self.logger.warning(f"Prompts file not found at {_PROMPTS_PATH}, using defaults", category="init", function="_load_prompts_from_file")
                 self._initialize_default_prompts()
                 return
             
-            # Load prompts from JSON
-            with open(prompts_path, 'r') as f:
-                prompts_data = json.load(f)
+            # Parsed once and shared by every assembler in the process
+            prompts_data = _load_prompts_json()
             
             # Map JSON prompts to agent states
             self.admin_prompts = {
@@ -239,17 +284,44 @@ Monitor all agent activities for constitutional compliance:
 Review agent outputs and flag any violations."""
         }
     
-    def prepare_llm_call_data(self, agent: Agent) -> List[LLMMessage]:
+    def _build_prompt_map(self):
+        """Flatten the per-role prompt tables into one (role, state) -> prompt lookup"""
+        role_prompts = {
+            AgentRole.ADMIN: self.admin_prompts,
+            AgentRole.PM: self.pm_prompts,
+            AgentRole.WORKER: self.worker_prompts,
+            AgentRole.GUARDIAN: self.guardian_prompts
+        }
+        self._prompt_map: Dict[Tuple[AgentRole, AgentState], str] = {
+            (role, state): prompt
+            for role, prompts in role_prompts.items()
+            for state, prompt in prompts.items()
+        }
+        
+        # Idle Admins converse and idle Workers work
+        self._prompt_map[(AgentRole.ADMIN, AgentState.IDLE)] = self.admin_prompts.get(AgentState.CONVERSATION, "")
+        self._prompt_map[(AgentRole.WORKER, AgentState.IDLE)] = self.worker_prompts.get(AgentState.WORK, "")
+        
+        # Agents that can run tools get the tool usage folded into their system prompt
+        self._tool_prompt_map: Dict[Tuple[AgentRole, AgentState], str] = {
+            key: f"{prompt}\n\n{_TOOLS_SECTION}" if prompt else _TOOLS_SECTION
+            for key, prompt in self._prompt_map.items()
+        }
+    
+    def prepare_llm_call_data(self, agent: Agent, now: Optional[float] = None) -> List[LLMMessage]:
         """
         Prepare the complete message list for an LLM call, including system prompts.
         
         Args:
             agent: The agent to prepare data for
+            now: Timestamp for the injected system messages; sampled here when not given
             
         Returns:
             Complete list of messages ready for LLM
         """
         messages: List[LLMMessage] = []
+        if now is None:
+            now = time.time()
         
         # 1. Add system prompt based on agent role and state
         system_prompt = self._get_system_prompt(agent)
@@ -257,11 +329,15 @@ Review agent outputs and flag any violations."""
             messages.append(LLMMessage(
                 role="system",
                 content=system_prompt,
-                timestamp=time.time()
+                timestamp=now
             ))
         
-        # 2. Add agent's message history
-        messages.extend(agent.message_history)
+        # 2. Add agent's message history, only the most recent window when one is configured
+        history = agent.message_history
+        if self.history_window and len(history) > self.history_window:
+            messages.extend(itertools.islice(history, len(history) - self.history_window, None))
+        else:
+            messages.extend(history)
         
         # 3. Add any dynamic context
         dynamic_context = self._get_dynamic_context(agent)
@@ -269,7 +345,7 @@ Review agent outputs and flag any violations."""
             messages.append(LLMMessage(
                 role="system",
                 content=dynamic_context,
-                timestamp=time.time()
+                timestamp=now
             ))
         
         return messages
@@ -277,24 +353,11 @@ Review agent outputs and flag any violations."""
     def _get_system_prompt(self, agent: Agent) -> str:
         """Get the system prompt for an agent based on role and state"""
         
-        prompt = ""
-        
-        if agent.role == AgentRole.ADMIN:
-            # If Admin is in IDLE state, use CONVERSATION prompt
-            if agent.current_state == AgentState.IDLE:
-                prompt = self.admin_prompts.get(AgentState.CONVERSATION, "")
-            else:
-                prompt = self.admin_prompts.get(agent.current_state, "")
-        elif agent.role == AgentRole.PM:
-            prompt = self.pm_prompts.get(agent.current_state, "")
-        elif agent.role == AgentRole.WORKER:
-            # If Worker is in IDLE state, use WORK prompt
-            if agent.current_state == AgentState.IDLE:
-                prompt = self.worker_prompts.get(AgentState.WORK, "")
-            else:
-                prompt = self.worker_prompts.get(agent.current_state, "")
-        elif agent.role == AgentRole.GUARDIAN:
-            prompt = self.guardian_prompts.get(agent.current_state, "")
+        key = (agent.role, agent.current_state)
+        if agent.tools_available:
+            prompt = self._tool_prompt_map.get(key, _TOOLS_SECTION)
+        else:
+            prompt = self._prompt_map.get(key, "")
         
         # Debug logging
         self.logger.debug_agent(f"[{agent.agent_id}] Getting system prompt: role={agent.role.value}, state={agent.current_state.value}, prompt_length={len(prompt)}", function="_get_system_prompt")
@@ -302,34 +365,23 @@ Review agent outputs and flag any violations."""
         return prompt
     
     def _get_dynamic_context(self, agent: Agent) -> str:
-        """Get dynamic context to inject into the prompt"""
-        
-        context_parts: List[str] = []
-        
-        # Add current time for Admin agents
-        if agent.role == AgentRole.ADMIN:
-            current_time = time.strftime("%Y-%m-%d %H:%M:%S")
-            context_parts.append(f"Current time: {current_time}")
-        
-        # Add available tools context
-        if agent.manager and agent.manager.cycle_handler:
-            tools_list = self._get_available_tools_description()
-            if tools_list:
-                context_parts.append(f"Available tools:\n{tools_list}")
+        """Get dynamic context to inject into the prompt (tool usage is part of the system prompt)"""
         
-        if context_parts:
-            return "\n\n".join(context_parts)
+        # Only Admin agents get per-call context: the current time
+        if agent.role != AgentRole.ADMIN:
+            return ""
         
-        return ""
+        now = time.time()
+        if now - self._time_cache[0] > 1.0:
+            self._time_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+        return f"Current time: {self._time_cache[1]}"
     
     def _get_available_tools_description(self) -> str:
         """Get a description of available tools"""
-        # This would ideally query the ToolExecutor
-        # For now, return a basic description
-        return """- send_message: Send a message to another agent
-  Usage: <tool_requests><calls><tool_call><name>send_message</name><args><target_agent_id>AGENT_ID</target_agent_id><message>Your message</message></args></tool_call></calls></tool_requests>"""
+        return _TOOLS_DESCRIPTION
     
-    def create_state_transition_message(self, agent: Agent, new_state: AgentState, context: Optional[str] = None) -> LLMMessage:
+    def create_state_transition_message(self, agent: Agent, new_state: AgentState, context: Optional[str] = None,
+                                        now: Optional[float] = None) -> LLMMessage:
         """
         Create a system message to inform an agent about a state transition.
         
@@ -337,33 +389,19 @@ Review agent outputs and flag any violations."""
             agent: The agent transitioning
             new_state: The new state
             context: Optional additional context
+            now: Timestamp for the message; sampled here when not given
             
         Returns:
             System message for the agent's history
         """
         
-        state_guidance = {
-            AgentState.PLANNING: "You are now in PLANNING mode. Create a detailed plan for the user's request.",
-            AgentState.CONVERSATION: "You are now in CONVERSATION mode. Continue engaging with the user.",
-            AgentState.STARTUP: "You are now starting up a new project. Break down the plan into tasks.",
-            AgentState.BUILD_TEAM_TASKS: "Build your team by creating worker agents for the tasks.",
-            AgentState.ACTIVATE_WORKERS: "Assign tasks to your worker agents.",
-            AgentState.MANAGE: "Monitor and coordinate your team's progress.",
-            AgentState.WORK: "Execute your assigned task.",
-            AgentState.WAIT: "Task complete. Wait for further instructions.",
-            AgentState.STANDBY: "Project complete. Standing by for new assignments.",
-        }
-        
-        message_content = f"[SYSTEM] State transition to: {new_state.value}"
-        
-        if new_state in state_guidance:
-            message_content += f"\n{state_guidance[new_state]}"
+        message_content = _STATE_TRANSITION_BASE[new_state]
         
         if context:
-            message_content += f"\nContext: {context}"
+            message_content = "\n".join((message_content, f"Context: {context}"))
         
         return LLMMessage(
             role="system",
             content=message_content,
-            timestamp=time.time()
+            timestamp=time.time() if now is None else now
         )
@@ -4,23 +4,76 @@ HAI-Net AI Schemas
 Data structures shared across the AI module to prevent circular dependencies.
 """
 
-from typing import Dict, List, Any
-from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
 import time
 
-@dataclass
+@dataclass(init=False)
 class AgentMemory:
     """Agent memory structure"""
-    short_term: Dict[str, Any] = field(default_factory=dict)
-    long_term: List[Dict[str, Any]] = field(default_factory=list)
-    episodic: List[Dict[str, Any]] = field(default_factory=list)
-    semantic: Dict[str, Any] = field(default_factory=dict)
-    constitutional: Dict[str, Any] = field(default_factory=dict)
-
-    def __post_init__(self):
-        if not self.constitutional:
-            self.constitutional = {
-                "violations": [],
-                "compliance_score": 1.0,
-                "last_check": time.time()
-            }
\ No newline at end of file
+    # Declared by hand rather than with dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("short_term", "long_term", "episodic", "semantic", "constitutional")
+
+    short_term: Dict[str, Any]
+    long_term: List[Dict[str, Any]]
+    episodic: List[Dict[str, Any]]
+    semantic: Dict[str, Any]
+    constitutional: Dict[str, Any]
+
+    def __init__(self, short_term: Optional[Dict[str, Any]] = None,
+                 long_term: Optional[List[Dict[str, Any]]] = None,
+                 episodic: Optional[List[Dict[str, Any]]] = None,
+                 semantic: Optional[Dict[str, Any]] = None,
+                 constitutional: Optional[Dict[str, Any]] = None):
+        self.short_term = {} if short_term is None else short_term
+        self.long_term = [] if long_term is None else long_term
+        self.episodic = [] if episodic is None else episodic
+        self.semantic = {} if semantic is None else semantic
+        self.constitutional = constitutional or {
+            "violations": [],
+            "compliance_score": 1.0,
+            "last_check": time.time()
+        }
+
+
+@dataclass(init=False)
+class StateChange:
+    """One entry of an agent's state_history"""
+    __slots__ = ("from_state", "to_state", "timestamp", "agent_id", "constitutional_compliant")
+
+    from_state: str
+    to_state: str
+    timestamp: float
+    agent_id: str
+    constitutional_compliant: bool
+
+    def __init__(self, from_state: str, to_state: str, timestamp: float, agent_id: str,
+                 constitutional_compliant: bool = True):
+        self.from_state = from_state
+        self.to_state = to_state
+        self.timestamp = timestamp
+        self.agent_id = agent_id
+        self.constitutional_compliant = constitutional_compliant
+
+
+@dataclass(init=False)
+class PlanSpec:
+    """A plan emitted by the Admin, bound once from the parsed <plan> block"""
+    __slots__ = ("project_name", "description", "objectives", "deliverables")
+
+    project_name: str
+    description: str
+    objectives: List[str]
+    deliverables: List[str]
+
+    def __init__(self, project_name: str = "Unnamed Project", description: str = "No description",
+                 objectives: Optional[List[str]] = None, deliverables: Optional[List[str]] = None):
+        self.project_name = project_name
+        self.description = description
+        self.objectives = [] if objectives is None else objectives
+        self.deliverables = [] if deliverables is None else deliverables
+
+    @classmethod
+    def from_dict(cls, plan: Dict[str, Any]) -> "PlanSpec":
+        """Bind the known plan fields, ignoring any others the agent emitted"""
+        return cls(**{key: plan[key] for key in plan.keys() & cls.__dataclass_fields__.keys()})
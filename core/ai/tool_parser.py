@@ -4,11 +4,50 @@ HAI-Net Tool Call Parser
 Robust XML parsing for agent tool requests.
 """
 
-import xml.etree.ElementTree as ET
+import re
+import sys
 from typing import List, Dict, Any, Optional
 from core.config.settings import HAINetSettings
 from core.logging.logger import get_logger
 
+try:
+    from lxml import etree as ET  # type: ignore
+    # Comments dropped to match ElementTree; no recovery, so malformed output still reaches _fallback_parse
+    _PARSER = ET.XMLParser(remove_comments=True, remove_pis=True, resolve_entities=False, no_network=True)
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _PARSER = None
+
+
+# Every workflow block an agent can emit, matched in a single pass over the output
+_BLOCK_RE = re.compile(r"<(tool_requests|plan|task_list|create_worker_request)>.*?</\1>", re.DOTALL)
+# Opening tags checked with plain substring scans before the regex runs; most outputs contain none
+_BLOCK_TOKENS = ("<tool_requests>", "<plan>", "<task_list>", "<create_worker_request>")
+
+# Fallback extraction for malformed tool requests; an unterminated <name> runs to the end of the text
+_NAME_RE = re.compile(r"<name>(.*?)(?:</name>|\Z)", re.DOTALL)
+_TARGET_RE = re.compile(r"<target_agent_id>(.*?)</target_agent_id>", re.DOTALL)
+_MESSAGE_RE = re.compile(r"<message>(.*?)</message>", re.DOTALL)
+
+
+def _parse_block(xml_block: str) -> ET.Element:
+    """Parse an XML block with the hardened parser when lxml is available"""
+    if _PARSER is not None:
+        return ET.fromstring(xml_block.encode("utf-8"), _PARSER)
+    return ET.fromstring(xml_block)
+
+def _extract_block(text: str, tag: str) -> Optional[str]:
+    """Return the first <tag>...</tag> block in text, scanning each half once, or None"""
+    open_tag = f"<{tag}>"
+    close_tag = f"</{tag}>"
+    _, found, rest = text.partition(open_tag)
+    if not found:
+        return None
+    body, found, _ = rest.partition(close_tag)
+    if not found:
+        return None
+    return open_tag + body + close_tag
+
 
 class ToolCallParser:
     """
@@ -19,6 +58,47 @@ class ToolCallParser:
         self.settings = settings
         self.logger = get_logger("ai.tool_parser", settings)
     
+    def parse_all(self, text: str) -> Dict[str, Any]:
+        """
+        Find every workflow block in agent output with one scan and parse each.
+        
+        Args:
+            text: The LLM output text
+            
+        Returns:
+            Dict keyed by block tag (tool_requests, plan, task_list,
+            create_worker_request) for the blocks present. tool_requests holds
+            a parse_tool_calls-style result; the others hold what the matching
+            extract_* method would return. When the output carries several
+            create_worker_request blocks, every valid request is also listed
+            under create_worker_requests.
+        """
+        if not any(token in text for token in _BLOCK_TOKENS):
+            return {}
+        
+        blocks: Dict[str, str] = {}
+        worker_blocks: List[str] = []
+        for match in _BLOCK_RE.finditer(text):
+            tag = match.group(1)
+            if tag == "create_worker_request":
+                worker_blocks.append(match.group(0))
+            blocks.setdefault(tag, match.group(0))
+        
+        parsed: Dict[str, Any] = {}
+        if "tool_requests" in blocks:
+            parsed["tool_requests"] = self._parse_tool_requests_block(blocks["tool_requests"], text)
+        if "plan" in blocks:
+            parsed["plan"] = self._parse_plan_block(blocks["plan"])
+        if "task_list" in blocks:
+            parsed["task_list"] = self._parse_task_list_block(blocks["task_list"])
+        if "create_worker_request" in blocks:
+            parsed["create_worker_request"] = self._parse_create_worker_block(blocks["create_worker_request"])
+        if len(worker_blocks) > 1:
+            requests = [r for r in map(self._parse_create_worker_block, worker_blocks) if r is not None]
+            if len(requests) > 1:
+                parsed["create_worker_requests"] = requests
+        return parsed
+    
     def parse_tool_calls(self, text: str) -> Dict[str, Any]:
         """
         Parse tool calls from agent output text.
@@ -30,18 +110,18 @@ class ToolCallParser:
             Dict with 'success', 'tool_calls', and optional 'error' keys
         """
         
-        # Check if there are tool requests markers
-        if "<tool_requests>" not in text or "</tool_requests>" not in text:
+        # Extract the tool_requests block
+        xml_block = _extract_block(text, "tool_requests")
+        if xml_block is None:
             return {"success": False, "tool_calls": [], "error": "No tool_requests block found"}
         
+        return self._parse_tool_requests_block(xml_block, text)
+    
+    def _parse_tool_requests_block(self, xml_block: str, text: str) -> Dict[str, Any]:
+        """Parse an extracted tool_requests block, falling back to string extraction over the full text"""
         try:
-            # Extract the tool_requests block
-            start_idx = text.find("<tool_requests>")
-            end_idx = text.find("</tool_requests>") + len("</tool_requests>")
-            xml_block = text[start_idx:end_idx]
-            
             # Parse XML
-            root = ET.fromstring(xml_block)
+            root = _parse_block(xml_block)
             
             tool_calls: List[Dict[str, Any]] = []
             
@@ -85,7 +165,8 @@ class ToolCallParser:
                 self.logger.debug("Tool call missing <name> element", category="ai", function="_parse_single_tool_call")
                 return None
             
-            tool_name = name_elem.text.strip()
+            # Interned so executor lookups and comparisons on tool/arg names hit the identity fast path
+            tool_name = sys.intern(name_elem.text.strip())
             
             # Get args
             args_elem = tool_call_elem.find("args")
@@ -94,11 +175,10 @@ class ToolCallParser:
                 return {"name": tool_name, "args": {}}
             
             # Parse arguments
-            args: Dict[str, Any] = {}
-            for arg_elem in args_elem:
-                arg_name = arg_elem.tag
-                arg_value = arg_elem.text.strip() if arg_elem.text else ""
-                args[arg_name] = arg_value
+            args: Dict[str, Any] = {
+                sys.intern(arg_elem.tag): arg_elem.text.strip() if arg_elem.text else ""
+                for arg_elem in args_elem
+            }
             
             return {"name": tool_name, "args": args}
             
@@ -116,18 +196,22 @@ class ToolCallParser:
         Returns:
             Dict with parsing results
         """
+        # Nothing to salvage without a tool name; skip the regex scans entirely
+        if "<name>" not in text:
+            self.logger.debug("Fallback parser found no <name> element", category="ai", function="_fallback_parse")
+            return {"success": False, "tool_calls": [], "error": "Both XML and fallback parsing failed: no <name> element"}
+        
         try:
-            # This is the simple parser from the original code
-            tool_name = text.split("<name>")[1].split("</name>")[0].strip()
+            tool_name = sys.intern(_NAME_RE.search(text).group(1).strip())
             
             args: Dict[str, Any] = {}
             
             # Try to extract common arguments
-            if "<target_agent_id>" in text and "</target_agent_id>" in text:
-                args["target_agent_id"] = text.split("<target_agent_id>")[1].split("</target_agent_id>")[0].strip()
+            if (target_match := _TARGET_RE.search(text)) is not None:
+                args["target_agent_id"] = target_match.group(1).strip()
             
-            if "<message>" in text and "</message>" in text:
-                args["message"] = text.split("<message>")[1].split("</message>")[0].strip()
+            if (message_match := _MESSAGE_RE.search(text)) is not None:
+                args["message"] = message_match.group(1).strip()
             
             tool_call: Dict[str, Any] = {"name": tool_name, "args": args}
             
@@ -148,15 +232,16 @@ class ToolCallParser:
         Returns:
             Dict with plan details or None
         """
-        if "<plan>" not in text or "</plan>" not in text:
+        xml_block = _extract_block(text, "plan")
+        if xml_block is None:
             return None
         
+        return self._parse_plan_block(xml_block)
+    
+    def _parse_plan_block(self, xml_block: str) -> Optional[Dict[str, Any]]:
+        """Parse an extracted plan block"""
         try:
-            start_idx = text.find("<plan>")
-            end_idx = text.find("</plan>") + len("</plan>")
-            xml_block = text[start_idx:end_idx]
-            
-            root = ET.fromstring(xml_block)
+            root = _parse_block(xml_block)
             
             plan: Dict[str, Any] = {}
             
@@ -164,10 +249,12 @@ class ToolCallParser:
             for child in root:
                 if child.text:
                     if child.tag == "objectives" or child.tag == "deliverables":
-                        # These contain list items
-                        items = [item.strip() for item in child.text.strip().split("\n") if item.strip() and item.strip().startswith("-")]
-                        items = [item[1:].strip() for item in items]  # Remove the leading "-"
-                        plan[child.tag] = items
+                        # These contain "-" list items; strip each line once and drop the leading "-"
+                        plan[child.tag] = [
+                            line[1:].strip()
+                            for line in map(str.strip, child.text.split("\n"))
+                            if line.startswith("-")
+                        ]
                     else:
                         plan[child.tag] = child.text.strip()
             
@@ -187,23 +274,21 @@ class ToolCallParser:
         Returns:
             List of task dicts or None
         """
-        if "<task_list>" not in text or "</task_list>" not in text:
+        xml_block = _extract_block(text, "task_list")
+        if xml_block is None:
             return None
         
+        return self._parse_task_list_block(xml_block)
+    
+    def _parse_task_list_block(self, xml_block: str) -> Optional[List[Dict[str, Any]]]:
+        """Parse an extracted task_list block"""
         try:
-            start_idx = text.find("<task_list>")
-            end_idx = text.find("</task_list>") + len("</task_list>")
-            xml_block = text[start_idx:end_idx]
-            
-            root = ET.fromstring(xml_block)
+            root = _parse_block(xml_block)
             
             tasks: List[Dict[str, Any]] = []
             
             for task_elem in root.findall("task"):
-                task: Dict[str, Any] = {}
-                for child in task_elem:
-                    if child.text:
-                        task[child.tag] = child.text.strip()
+                task: Dict[str, Any] = {child.tag: child.text.strip() for child in task_elem if child.text}
                 
                 if task:
                     tasks.append(task)
@@ -224,22 +309,19 @@ class ToolCallParser:
         Returns:
             Dict with worker details or None
         """
-        if "<create_worker_request>" not in text or "</create_worker_request>" not in text:
+        xml_block = _extract_block(text, "create_worker_request")
+        if xml_block is None:
             return None
 
-        try:
-            start_idx = text.find("<create_worker_request>")
-            end_idx = text.find("</create_worker_request>") + len("</create_worker_request>")
-            xml_block = text[start_idx:end_idx]
-
-            root = ET.fromstring(xml_block)
+        return self._parse_create_worker_block(xml_block)
 
-            request: Dict[str, Any] = {}
+    def _parse_create_worker_block(self, xml_block: str) -> Optional[Dict[str, Any]]:
+        """Parse an extracted create_worker_request block"""
+        try:
+            root = _parse_block(xml_block)
 
             # Extract request elements
-            for child in root:
-                if child.text:
-                    request[child.tag] = child.text.strip()
+            request: Dict[str, Any] = {child.tag: child.text.strip() for child in root if child.text}
 
             # A task_id is mandatory for a worker request
             return request if "task_id" in request else None
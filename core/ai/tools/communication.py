@@ -26,7 +26,8 @@ class SendMessageTool:
     async def execute(self, sender_agent: Agent, target_agent_id: str, message: str) -> Dict[str, Any]:
         """
         Executes the send message tool. Finds the target agent, appends the
-        message to its history, and schedules a cycle for it to process.
+        message to its history, and schedules a cycle for it to process
+        (deferred to the end of the turn when called inside batch_cycles).
 
         Args:
             sender_agent: The agent sending the message (injected by InteractionHandler).
@@ -5,13 +5,31 @@ Discovers, validates, and executes tools for agents.
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional
+import copy
+import json
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, NamedTuple, Optional, Tuple
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
 
 from core.config.settings import HAINetSettings
 from core.logging.logger import get_logger
 from core.ai.agents import AgentManager
 from .communication import SendMessageTool
 
+
+class RegisteredTool(NamedTuple):
+    """A tool callable with its dispatch properties resolved once at registration"""
+    func: Callable[..., Any]
+    is_coro: bool
+    cacheable: bool
+    offload: bool
+
+
 class ToolExecutor:
     """
     Manages and executes tools available to agents.
@@ -20,7 +38,13 @@ class ToolExecutor:
         self.settings = settings
         self.logger = get_logger("ai.tools.executor", settings)
         self.agent_manager = agent_manager
-        self.tools: Dict[str, Any] = {}
+        self.tools: Dict[str, RegisteredTool] = {}
+        
+        # LRU of results for tools flagged `cacheable` (deterministic, side-effect free)
+        self.cache_size = max(getattr(settings, 'tool_result_cache_size', 512), 0)
+        self._cache: "OrderedDict[Tuple[str, bytes], Any]" = OrderedDict()
+        self.batch_concurrency = max(getattr(settings, 'tool_batch_concurrency', 8), 1)
+        
         self._initialize_tools()
 
     def _initialize_tools(self):
@@ -31,42 +55,137 @@ class ToolExecutor:
         # This will be expanded to scan for tool plugins.
         send_message_tool = SendMessageTool(self.settings, self.agent_manager)
         self.register_tool("send_message", send_message_tool.execute)
-        self.logger.info(f"Tool discovery complete. Registered {len(self.tools)} tool(s)", category="init", function="_initialize_tools")
+        self.logger.info("Tool discovery complete. Registered %s tool(s)", len(self.tools), category="init", function="_initialize_tools")
 
     def register_tool(self, name: str, tool: Any):
-        """Registers a single tool."""
+        """
+        Registers a single tool.
+        Tools that set a truthy `cacheable` attribute have their results reused
+        for identical arguments; only flag deterministic, side-effect free tools.
+        Synchronous tools run inline on the event loop unless they set a truthy
+        `thread_offload` attribute, which sends each call to a worker thread;
+        reserve that for blocking or CPU-heavy tools, as every hop costs a
+        thread handoff and a context copy.
+        """
         if name in self.tools:
-            self.logger.warning(f"Tool '{name}' is already registered. Overwriting", category="agent", function="register_tool")
-        self.tools[name] = tool
-        self.logger.debug(f"Tool '{name}' registered successfully", category="agent", function="register_tool")
+            self.logger.warning("Tool '%s' is already registered. Overwriting", name, category="agent", function="register_tool")
+            # Results from the replaced implementation must not be served for the new one
+            for key in [key for key in self._cache if key[0] == name]:
+                del self._cache[key]
+        self.tools[name] = RegisteredTool(
+            func=tool,
+            is_coro=asyncio.iscoroutinefunction(tool),
+            cacheable=bool(getattr(tool, 'cacheable', False)),
+            offload=bool(getattr(tool, 'thread_offload', False))
+        )
+        self.logger.debug("Tool '%s' registered successfully", name, category="agent", function="register_tool")
 
     async def execute_tool(self, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """
         Executes a registered tool by name with the given arguments.
         """
-        # Get sender_agent for logging context if available
-        sender_id = args.get('sender_agent', 'unknown')
-        sender_id = getattr(sender_id, 'agent_id', str(sender_id))
-        
-        self.logger.debug_agent(f"[{sender_id}] Executing tool '{name}' with {len(args)-1} arg(s)", function="execute_tool")
+        # The sender is only needed for log context; skip resolving it when debug output is off
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug_agent("[%s] Executing tool '%s' with %s arg(s)", self._sender_id(args), name, len(args)-1, function="execute_tool")
         
-        if name not in self.tools:
-            self.logger.error(f"[{sender_id}] Tool '{name}' not found", category="agent", function="execute_tool")
+        tool = self.tools.get(name)
+        if tool is None:
+            self.logger.error(f"[{self._sender_id(args)}] Tool '{name}' not found", category="agent", function="execute_tool")
             return {"error": f"Tool '{name}' not found."}
 
         try:
-            tool_func = self.tools[name]
-            if asyncio.iscoroutinefunction(tool_func):
-                result = await tool_func(**args)
+            cache_key = None
+            if tool.cacheable and self.cache_size:
+                cache_key = self._cache_key(name, args)
+                if cache_key is not None and cache_key in self._cache:
+                    self._cache.move_to_end(cache_key)
+                    if debug:
+                        self.logger.debug_agent("[%s] Tool '%s' result served from cache", self._sender_id(args), name, function="execute_tool")
+                    # Each caller gets its own copy, so mutating one result cannot alter later hits
+                    return {"result": copy.deepcopy(self._cache[cache_key])}
+            
+            if tool.is_coro:
+                result = await tool.func(**args)
+            elif tool.offload:
+                result = await asyncio.to_thread(tool.func, **args)
             else:
-                result = tool_func(**args)
+                result = tool.func(**args)
 
-            self.logger.debug_agent(f"[{sender_id}] Tool '{name}' executed successfully", function="execute_tool")
+            if cache_key is not None:
+                self._cache[cache_key] = copy.deepcopy(result)
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+            if debug:
+                self.logger.debug_agent("[%s] Tool '%s' executed successfully", self._sender_id(args), name, function="execute_tool")
             return {"result": result}
         except Exception as e:
-            self.logger.error(f"[{sender_id}] Error executing tool '{name}': {e}", category="agent", function="execute_tool")
+            self.logger.error(f"[{self._sender_id(args)}] Error executing tool '{name}': {e}", category="agent", function="execute_tool")
             return {"error": f"Error executing tool '{name}': {e}"}
 
+    async def execute_tools_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Executes several (name, args) tool calls concurrently and returns their results in call order.
+        Identical calls to a cacheable tool run once and share the result; at most
+        batch_concurrency calls are in flight, each starting as soon as a slot frees up.
+        """
+        # A lone call needs no semaphore, gather or dedup bookkeeping
+        if len(calls) == 1:
+            name, args = calls[0]
+            return [await self.execute_tool(name, args)]
+
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def run_one(name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.execute_tool(name, args)
+
+        unique: Dict[Tuple[str, bytes], int] = {}
+        coros = []
+        positions: List[int] = []
+        for name, args in calls:
+            tool = self.tools.get(name)
+            key = self._cache_key(name, args) if tool is not None and tool.cacheable else None
+            if key is not None:
+                if key in unique:
+                    positions.append(unique[key])
+                    continue
+                unique[key] = len(coros)
+            positions.append(len(coros))
+            coros.append(run_one(name, args))
+
+        results = await asyncio.gather(*coros)
+        # The first caller keeps the result; every coalesced duplicate gets its own copy
+        served = set()
+        batch_results = []
+        for i in positions:
+            batch_results.append(results[i] if i not in served else copy.deepcopy(results[i]))
+            served.add(i)
+        return batch_results
+
+    @staticmethod
+    def _sender_id(args: Dict[str, Any]) -> str:
+        """Calling agent's id for log messages"""
+        sender = args.get('sender_agent', 'unknown')
+        return sender.agent_id if hasattr(sender, 'agent_id') else str(sender)
+
+    @staticmethod
+    def _cache_key(name: str, args: Dict[str, Any]) -> Optional[Tuple[str, bytes]]:
+        """
+        Canonical key for a tool call: its name and the arguments as JSON with
+        keys sorted at every level. The calling agent is context only and left out.
+        None when the arguments are not plain JSON data (the call is then not cached);
+        they are never stringified, as distinct objects can share a str().
+        """
+        call_args = {k: v for k, v in args.items() if k != 'sender_agent'}
+        try:
+            if orjson is not None:
+                return (name, orjson.dumps(call_args, option=orjson.OPT_SORT_KEYS))
+            return (name, json.dumps(call_args, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+        except (TypeError, ValueError):
+            return None
+
     def get_available_tools(self) -> List[str]:
         """Returns a list of available tool names."""
         return list(self.tools.keys())
@@ -5,18 +5,35 @@ Data structures for agent tools.
 """
 
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
-@dataclass
+# Slots are declared by hand rather than with dataclass(slots=True), which needs Python 3.10
+
+@dataclass(init=False)
 class ToolCall:
     """Represents a request from an agent to call a tool."""
+    __slots__ = ("name", "args")
+
     name: str
-    args: Dict[str, Any] = field(default_factory=dict)
+    args: Dict[str, Any]
+
+    def __init__(self, name: str, args: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.args = {} if args is None else args
 
-@dataclass
+@dataclass(init=False)
 class ToolResult:
     """Represents the result of a tool execution."""
+    __slots__ = ("tool_name", "status", "result", "error")
+
     tool_name: str
     status: str  # "success" or "error"
-    result: Optional[Dict[str, Any]] = None
-    error: Optional[str] = None
\ No newline at end of file
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+
+    def __init__(self, tool_name: str, status: str, result: Optional[Dict[str, Any]] = None,
+                 error: Optional[str] = None):
+        self.tool_name = tool_name
+        self.status = status
+        self.result = result
+        self.error = error
@@ -4,52 +4,75 @@ HAI-Net Workflow Manager
 Manages agent state transitions and high-level, multi-step workflows.
 """
 
-from typing import Dict, Any, List, Optional, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, Set, Tuple, TYPE_CHECKING
+import asyncio
 import time
 
 from core.config.settings import HAINetSettings
 from core.logging.logger import get_logger
+from core.identity.did import ConstitutionalViolationError
 from core.ai.agents import Agent, AgentState, AgentRole
 from core.ai.llm import LLMMessage
+from core.ai.prompt_assembler import PromptAssembler
+from core.ai.schemas import PlanSpec
 
 if TYPE_CHECKING:
     from core.ai.agents import AgentManager
 
+# Short-term memory keys that track a PM's worker creation, always written together
+_WORKER_PROGRESS_KEYS = frozenset(("total_tasks", "workers_created_count", "worker_map"))
+
+# State names for log formatting, resolved once instead of per transition
+_STATE_STR: Dict[AgentState, str] = {s: s.value for s in AgentState}
+
 class WorkflowManager:
     """
     Orchestrates complex workflows and manages agent state transitions.
     """
+    # System notifications sent to the Admin once its PM exists, and to the PM while it creates workers
+    _PM_CREATED_TMPL = "[SYSTEM] Project Manager agent %s has been created and assigned your plan. They will break it down into tasks."
+    _WORKER_CREATED_TMPL = "[SYSTEM] ✅ Worker agent %s has been created for task %s (Specialty: %s).\n\nWorkers created: %d/%d"
+    _WORKERS_CREATED_TMPL = "[SYSTEM] ✅ %d worker agents have been created:\n%s\n\nWorkers created: %d/%d"
+    _WORKER_LINE_TMPL = "- Worker agent %s for task %s (Specialty: %s)"
+    _WORKER_NEEDED_TMPL = "[SYSTEM] You still need to create %d more worker(s). Please create the next worker now."
+
     def __init__(self, settings: HAINetSettings):
         self.settings = settings
         self.logger = get_logger("ai.workflow_manager", settings)
         self.workflows: Dict[str, Any] = {}
         self.agent_manager: Optional['AgentManager'] = None  # Will be set via dependency injection
+        # Builds the guidance message injected on every state transition
+        self.prompt_assembler = PromptAssembler(settings)
+        # Agents awaiting a cycle from the current event-loop tick, scheduled once each
+        self._pending_schedule: Set[str] = set()
+        # Running schedule_cycles tasks, kept referenced until they finish
+        self._schedule_tasks: Set[asyncio.Task] = set()
 
     def set_agent_manager(self, agent_manager: 'AgentManager') -> None:
         """Inject the agent manager for workflow operations"""
         self.agent_manager = agent_manager
 
-    async def change_agent_state(self, agent: Agent, new_state: AgentState, context: Optional[str] = None) -> bool:
+    async def change_agent_state(self, agent: Agent, new_state: AgentState, context: Optional[str] = None,
+                                 now: Optional[float] = None) -> bool:
         """
         Changes an agent's state by calling the agent's own transition method.
-        Injects a guidance message into the agent's history beforehand.
+        Injects a guidance message into the agent's history beforehand, stamped
+        with now when the calling workflow step already took a timestamp.
         """
         try:
-            self.logger.debug_agent(f"[{agent.agent_id}] State transition requested: {agent.current_state.value} -> {new_state.value}", function="change_agent_state")
+            self.logger.debug_agent("[%s] State transition requested: %s -> %s", agent.agent_id, _STATE_STR[agent.current_state], _STATE_STR[new_state], function="change_agent_state")
 
             # Add state transition guidance message to provide context to the agent for its next action
-            from core.ai.prompt_assembler import PromptAssembler
-            assembler = PromptAssembler(self.settings)
-            transition_msg = assembler.create_state_transition_message(agent, new_state, context)
+            transition_msg = self.prompt_assembler.create_state_transition_message(agent, new_state, context, now)
             agent.message_history.append(transition_msg)
 
             # Call the agent's public state transition method
             await agent.transition_state(new_state)
             
-            self.logger.info(f"[{agent.agent_id}] State transition complete: {new_state.value}", category="agent", function="change_agent_state")
+            self.logger.info("[%s] State transition complete: %s", agent.agent_id, _STATE_STR[new_state], category="agent", function="change_agent_state")
             return True
-        except Exception as e:
-            self.logger.error(f"[{agent.agent_id}] State transition failed ({agent.current_state.value} -> {new_state.value}): {e}", category="agent", function="change_agent_state")
+        except ConstitutionalViolationError as e:
+            self.logger.error(f"[{agent.agent_id}] State transition failed ({_STATE_STR[agent.current_state]} -> {_STATE_STR[new_state]}): {e}", category="agent", function="change_agent_state")
             return False
 
     async def process_plan_creation(self, admin_agent: Agent, plan: Dict[str, Any]):
@@ -65,8 +88,11 @@ class WorkflowManager:
             self.logger.error("Cannot process plan creation: AgentManager not set", category="agent", function="process_plan_creation")
             return
         
-        self.logger.info(f"[{admin_agent.agent_id}] Starting ProjectCreationWorkflow for plan: {plan.get('project_name', 'Unnamed')}", category="agent", function="process_plan_creation")
+        spec = PlanSpec.from_dict(plan)
+        self.logger.info("[%s] Starting ProjectCreationWorkflow for plan: %s", admin_agent.agent_id, spec.project_name, category="agent", function="process_plan_creation")
         
+        # One timestamp for every message this workflow step produces
+        now = time.time()
         try:
             # 1. Create PM agent
             pm_agent_id = await self.agent_manager.create_agent(AgentRole.PM)
@@ -78,29 +104,41 @@ class WorkflowManager:
             if not pm_agent:
                 return
             
-            # 2. Provide the plan to the PM agent
+            # 2. Provide the plan to the PM agent, assembled in one join
+            parts = [
+                "You have been assigned a new project:",
+                "",
+                f"Project: {spec.project_name}",
+                "",
+                f"Description: {spec.description}",
+                "",
+                "Objectives:"
+            ]
+            parts.extend(f"- {obj}" for obj in spec.objectives)
+            parts.extend(("", "Deliverables:"))
+            parts.extend(f"- {del_}" for del_ in spec.deliverables)
             plan_message = LLMMessage(
                 role="user",
-                content=f"You have been assigned a new project:\n\nProject: {plan.get('project_name', 'Unnamed Project')}\n\nDescription: {plan.get('description', 'No description')}\n\nObjectives:\n" + "\n".join(f"- {obj}" for obj in plan.get('objectives', [])) + f"\n\nDeliverables:\n" + "\n".join(f"- {del_}" for del_ in plan.get('deliverables', [])),
-                timestamp=time.time()
+                content="\n".join(parts),
+                timestamp=now
             )
             pm_agent.message_history.append(plan_message)
             
             # 3. Transition PM to STARTUP state and schedule
             await self.change_agent_state(pm_agent, AgentState.STARTUP, 
-                                         context="Break down this project into actionable tasks")
+                                         context="Break down this project into actionable tasks", now=now)
             await self.agent_manager.schedule_cycle(pm_agent_id)
             
             # 4. Notify Admin that PM was created
             admin_agent.message_history.append(LLMMessage(
                 role="system",
-                content=f"[SYSTEM] Project Manager agent {pm_agent_id} has been created and assigned your plan. They will break it down into tasks.",
-                timestamp=time.time()
+                content=self._PM_CREATED_TMPL % pm_agent_id,
+                timestamp=now
             ))
             
-            self.logger.info(f"[{admin_agent.agent_id}] ✅ ProjectCreationWorkflow complete: PM {pm_agent_id} created and started", category="agent", function="process_plan_creation")
+            self.logger.info("[%s] ✅ ProjectCreationWorkflow complete: PM %s created and started", admin_agent.agent_id, pm_agent_id, category="agent", function="process_plan_creation")
             
-        except Exception as e:
+        except (RuntimeError, LookupError) as e:
             self.logger.error(f"[{admin_agent.agent_id}] ProjectCreationWorkflow failed: {e}", category="agent", function="process_plan_creation")
 
     async def process_task_list_creation(self, pm_agent: Agent, tasks: List[Dict[str, Any]]):
@@ -111,15 +149,18 @@ class WorkflowManager:
         1. Store tasks in PM's memory
         2. Transition PM to BUILD_TEAM_TASKS state
         """
-        self.logger.debug_agent(f"[{pm_agent.agent_id}] Processing task list creation: {len(tasks)} tasks", function="process_task_list_creation")
+        self.logger.debug_agent("[%s] Processing task list creation: %s tasks", pm_agent.agent_id, len(tasks), function="process_task_list_creation")
         
-        # Store tasks in PM's memory for later use
-        pm_agent.memory.short_term["tasks"] = tasks
-        pm_agent.memory.short_term["tasks_timestamp"] = time.time()
+        # Store tasks in PM's memory for later use, with the counters worker creation updates
+        short_term = pm_agent.memory.short_term
+        short_term["tasks"] = tasks
+        now = time.time()
+        short_term["tasks_timestamp"] = now
+        self._reset_worker_progress(short_term, len(tasks))
         
         # Transition to next state
         await self.change_agent_state(pm_agent, AgentState.BUILD_TEAM_TASKS,
-                                     context=f"You have defined {len(tasks)} tasks. Now create worker agents for these tasks.")
+                                     context=f"You have defined {len(tasks)} tasks. Now create worker agents for these tasks.", now=now)
         
         # Schedule PM to continue workflow
         await pm_agent.manager.schedule_cycle(pm_agent.agent_id)
@@ -135,65 +176,119 @@ class WorkflowManager:
         4. Check if all workers are created, if so transition to ACTIVATE_WORKERS.
         5. Otherwise, reschedule the PM to create the next worker.
         """
+        await self.process_worker_creation_batch(pm_agent, [request])
+
+    async def process_worker_creation_batch(self, pm_agent: Agent, requests: List[Dict[str, Any]]):
+        """
+        Handle one or more worker requests from a single PM reply.
+
+        The workers are created with one AgentManager.create_agents call and mapped
+        to their tasks in one pass; the PM gets one message listing them and is
+        transitioned or rescheduled once for the whole batch.
+        Requests without a task_id, and repeats of a task_id, are skipped.
+        """
         if not self.agent_manager:
             self.logger.error("Cannot process worker creation: AgentManager not set", category="agent", function="process_worker_creation")
             return
 
-        task_id = request.get("task_id")
-        specialty = request.get("specialty", "general")
-        
-        if not task_id:
-            self.logger.error(f"[{pm_agent.agent_id}] Worker creation requested without task_id", category="agent", function="process_worker_creation")
-            return
+        short_term = pm_agent.memory.short_term
+        if not _WORKER_PROGRESS_KEYS <= short_term.keys():
+            # Memory predating the cached counters; count the stored task list instead
+            self._reset_worker_progress(short_term, len(short_term.get("tasks", ())),
+                                        short_term.get("workers_created_count", 0),
+                                        short_term.get("worker_map"))
 
-        self.logger.debug_agent(f"[{pm_agent.agent_id}] Creating worker for task_id={task_id}, specialty={specialty}", function="process_worker_creation")
+        specialties: Dict[str, str] = {}
+        for request in requests:
+            task_id = request.get("task_id")
+            if not task_id:
+                self.logger.error(f"[{pm_agent.agent_id}] Worker creation requested without task_id", category="agent", function="process_worker_creation")
+                continue
+            if task_id not in specialties:
+                specialties[task_id] = request.get("specialty", "general")
+                self.logger.debug_agent("[%s] Creating worker for task_id=%s, specialty=%s", pm_agent.agent_id, task_id, specialties[task_id], function="process_worker_creation")
+        if not specialties:
+            return
 
+        now = time.time()
         try:
-            # 1. Create Worker agent
-            worker_agent_id = await self.agent_manager.create_agent(AgentRole.WORKER)
-            if not worker_agent_id:
-                self.logger.error(f"[{pm_agent.agent_id}] Failed to create worker agent for task {task_id}", category="agent", function="process_worker_creation")
-                return
+            # 1. Create the Worker agents in one batch
+            worker_ids = await self.agent_manager.create_agents([AgentRole.WORKER] * len(specialties))
 
-            # 2. Map worker to task in PM's memory
-            if "worker_map" not in pm_agent.memory.short_term:
-                pm_agent.memory.short_term["worker_map"] = {}
-            pm_agent.memory.short_term["worker_map"][task_id] = worker_agent_id
-            
-            # Track how many workers have been created
-            if "workers_created_count" not in pm_agent.memory.short_term:
-                pm_agent.memory.short_term["workers_created_count"] = 0
-            pm_agent.memory.short_term["workers_created_count"] += 1
+            # 2. Map workers to tasks in PM's memory, in one pass
+            worker_map = short_term["worker_map"]
+            total_tasks = short_term["total_tasks"]
+            workers_count = short_term["workers_created_count"]
+            created: List[Tuple[str, str, str]] = []
+            for (task_id, specialty), worker_agent_id in zip(specialties.items(), worker_ids):
+                if not worker_agent_id:
+                    self.logger.error(f"[{pm_agent.agent_id}] Failed to create worker agent for task {task_id}", category="agent", function="process_worker_creation")
+                    continue
+                worker_map[task_id] = worker_agent_id
+                created.append((worker_agent_id, task_id, specialty))
+                workers_count += 1
+                self.logger.info("[%s] ✅ Worker %s created for task %s (%s/%s)", pm_agent.agent_id, worker_agent_id, task_id, workers_count, total_tasks, category="agent", function="process_worker_creation")
 
-            # 3. Notify PM
-            workers_count = pm_agent.memory.short_term["workers_created_count"]
-            total_tasks = len(pm_agent.memory.short_term.get("tasks", []))
-            
-            system_message = LLMMessage(
-                role="system",
-                content=f"[SYSTEM] ✅ Worker agent {worker_agent_id} has been created for task {task_id} (Specialty: {specialty}).\n\nWorkers created: {workers_count}/{total_tasks}",
-                timestamp=time.time()
-            )
-            pm_agent.message_history.append(system_message)
+            if not created:
+                return
+            # Track how many workers have been created
+            short_term["workers_created_count"] = workers_count
 
-            self.logger.info(f"[{pm_agent.agent_id}] ✅ Worker {worker_agent_id} created for task {task_id} ({workers_count}/{total_tasks})", category="agent", function="process_worker_creation")
+            # 3. Notify PM with one message for the whole batch
+            if len(created) == 1:
+                content = self._WORKER_CREATED_TMPL % (*created[0], workers_count, total_tasks)
+            else:
+                lines = "\n".join(self._WORKER_LINE_TMPL % worker for worker in created)
+                content = self._WORKERS_CREATED_TMPL % (len(created), lines, workers_count, total_tasks)
+            pm_agent.message_history.append(LLMMessage(role="system", content=content, timestamp=now))
 
             # 4. Check if all workers are created
             if workers_count >= total_tasks:
                 # All workers created, transition to ACTIVATE_WORKERS
-                self.logger.info(f"[{pm_agent.agent_id}] All {workers_count} workers created. Transitioning to ACTIVATE_WORKERS", category="agent", function="process_worker_creation")
+                self.logger.info("[%s] All %s workers created. Transitioning to ACTIVATE_WORKERS", pm_agent.agent_id, workers_count, category="agent", function="process_worker_creation")
                 await self.change_agent_state(pm_agent, AgentState.ACTIVATE_WORKERS,
-                                             context=f"All {workers_count} workers have been created. Now assign tasks to each worker.")
-                await pm_agent.manager.schedule_cycle(pm_agent.agent_id)
+                                             context=f"All {workers_count} workers have been created. Now assign tasks to each worker.", now=now)
+                self._request_schedule(pm_agent)
             else:
                 # More workers needed, reschedule PM to create next worker
                 remaining = total_tasks - workers_count
                 pm_agent.message_history.append(LLMMessage(
                     role="system",
-                    content=f"[SYSTEM] You still need to create {remaining} more worker(s). Please create the next worker now.",
-                    timestamp=time.time()
+                    content=self._WORKER_NEEDED_TMPL % remaining,
+                    timestamp=now
                 ))
-                await pm_agent.manager.schedule_cycle(pm_agent.agent_id)
+                self._request_schedule(pm_agent)
 
-        except Exception as e:
+        except (RuntimeError, LookupError) as e:
             self.logger.error(f"[{pm_agent.agent_id}] Worker creation workflow failed: {e}", category="agent", function="process_worker_creation")
+
+    @staticmethod
+    def _reset_worker_progress(short_term: Dict[str, Any], total_tasks: int, workers_created: int = 0,
+                               worker_map: Optional[Dict[str, str]] = None) -> None:
+        """Set the PM's task total, worker counter and worker map together, so they always describe the same task list"""
+        short_term["total_tasks"] = total_tasks
+        short_term["workers_created_count"] = workers_created
+        short_term["worker_map"] = {} if worker_map is None else worker_map
+
+    def _request_schedule(self, agent: Agent) -> None:
+        """
+        Ask for a cycle for the agent without scheduling it right away. Requests made
+        during the same event-loop tick are coalesced into one cycle per agent.
+        """
+        if not self._pending_schedule:
+            asyncio.get_running_loop().call_soon(self._flush_schedules)
+        self._pending_schedule.add(agent.agent_id)
+
+    def _flush_schedules(self) -> None:
+        """Schedule every agent requested since the last flush, once each"""
+        agent_ids, self._pending_schedule = self._pending_schedule, set()
+        if agent_ids and self.agent_manager:
+            task = asyncio.ensure_future(self.agent_manager.schedule_cycles(agent_ids))
+            self._schedule_tasks.add(task)
+            task.add_done_callback(self._schedule_done)
+
+    def _schedule_done(self, task: asyncio.Task) -> None:
+        """Drop a finished schedule_cycles task and log it if it failed"""
+        self._schedule_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Scheduling agent cycles failed: {task.exception()}", category="agent", function="_flush_schedules")
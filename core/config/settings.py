@@ -5,7 +5,7 @@ Constitutional compliance and secure configuration
 """
 
 from typing import Dict, Any, Optional, List
-from pydantic import Field, field_validator
+from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings
 import os
 from pathlib import Path
@@ -65,9 +65,27 @@ class HAINetSettings(BaseSettings):
     llm_backend: str = Field(default="ollama", description="LLM backend: ollama, llama.cpp, vllm")
     ollama_enabled: bool = Field(default=True, description="Ollama service enabled")
     default_model: str = Field(default="llama2:7b", description="Default LLM model")
+    ollama_num_parallel: int = Field(
+        default=1, ge=1,
+        validation_alias=AliasChoices("HAINET_OLLAMA_NUM_PARALLEL", "ollama_num_parallel"),
+        description="Concurrent requests the Ollama server runs (read from HAINET_OLLAMA_NUM_PARALLEL or OLLAMA_NUM_PARALLEL)"
+    )
+    llm_batch_window_ms: float = Field(default=5.0, ge=0, description="How long a burst of concurrent LLM requests keeps collecting into one batch; a lone request never waits")
+    agent_history_maxlen: int = Field(default=256, description="Messages kept in each agent's history; oldest are evicted first (0 keeps all)")
+    agent_state_history_max: int = Field(default=1024, description="State transitions kept in each agent's state history; oldest are evicted first (0 keeps all)")
+    llm_history_window: int = Field(default=0, description="Most recent history messages sent with each LLM call (0 sends the full history)")
+    tool_result_cache_size: int = Field(default=512, description="Results of cacheable tool calls kept for reuse (0 disables)")
+    tool_batch_concurrency: int = Field(default=8, description="Tool calls from one batch run concurrently at most")
     voice_stt_enabled: bool = Field(default=True, description="Speech-to-text enabled")
     voice_tts_enabled: bool = Field(default=True, description="Text-to-speech enabled")
     image_generation_enabled: bool = Field(default=False, description="Image generation enabled")
+    memory_quantization: str = Field(default="none", description="Precision of indexed memory embeddings: none, int8, binary")
+    memory_hnsw_threshold: int = Field(default=1000, description="Per-agent embedding count above which memory search uses an HNSW index")
+    memory_query_cache_size: int = Field(default=64, description="Recent memory searches cached per agent (0 disables)")
+    memory_query_cache_threshold: float = Field(default=0.95, description="Cosine similarity at which a cached memory search is reused")
+    memory_query_cache_ttl: float = Field(default=60.0, description="Seconds a cached memory search stays valid")
+    memory_vector_flush_size: int = Field(default=64, description="Memories written to the vector store per batch")
+    memory_vector_flush_ms: float = Field(default=100.0, description="Longest a memory waits before its vector store batch is written")
     
     # Resource Management
     max_cpu_usage: float = Field(default=80.0, description="Maximum CPU usage percentage")
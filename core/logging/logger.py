@@ -325,30 +325,38 @@ class HAINetLogger:
             "last_event": self.compliance_events[-1] if self.compliance_events else None
         }
     
-    def info(self, message: str, category: str = "general", function: str = "", **kwargs: Any) -> None:
-        """Info level logging with categorization"""
+    def info(self, message: str, *args: Any, category: str = "general", function: str = "", **kwargs: Any) -> None:
+        """Info level logging with categorization; %-style args are formatted only if emitted"""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         formatted_message = self._format_categorized_message(message, category, function)
-        self.logger.info(formatted_message, **kwargs)
+        self.logger.info(formatted_message, *args, **kwargs)
     
-    def debug(self, message: str, category: str = "general", function: str = "", **kwargs: Any) -> None:
-        """Debug level logging with categorization"""
+    def debug(self, message: str, *args: Any, category: str = "general", function: str = "", **kwargs: Any) -> None:
+        """Debug level logging with categorization; %-style args are formatted only if emitted"""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         formatted_message = self._format_categorized_message(message, category, function)
-        self.logger.debug(formatted_message, **kwargs)
+        self.logger.debug(formatted_message, *args, **kwargs)
     
-    def warning(self, message: str, category: str = "general", function: str = "", **kwargs: Any) -> None:
-        """Warning level logging with categorization"""
+    def warning(self, message: str, *args: Any, category: str = "general", function: str = "", **kwargs: Any) -> None:
+        """Warning level logging with categorization; %-style args are formatted only if emitted"""
         formatted_message = self._format_categorized_message(message, category, function)
-        self.logger.warning(formatted_message, **kwargs)
+        self.logger.warning(formatted_message, *args, **kwargs)
     
-    def error(self, message: str, category: str = "error", function: str = "", **kwargs: Any) -> None:
-        """Error level logging with categorization"""
+    def error(self, message: str, *args: Any, category: str = "error", function: str = "", **kwargs: Any) -> None:
+        """Error level logging with categorization; %-style args are formatted only if emitted"""
         formatted_message = self._format_categorized_message(message, category, function)
-        self.logger.error(formatted_message, **kwargs)
+        self.logger.error(formatted_message, *args, **kwargs)
     
-    def critical(self, message: str, category: str = "error", function: str = "", **kwargs: Any) -> None:
-        """Critical level logging with categorization"""
+    def critical(self, message: str, *args: Any, category: str = "error", function: str = "", **kwargs: Any) -> None:
+        """Critical level logging with categorization; %-style args are formatted only if emitted"""
         formatted_message = self._format_categorized_message(message, category, function)
-        self.logger.critical(formatted_message, **kwargs)
+        self.logger.critical(formatted_message, *args, **kwargs)
+    
+    def isEnabledFor(self, level: int) -> bool:
+        """Whether a message at this level would be emitted; lets callers skip building it"""
+        return self.logger.isEnabledFor(level)
     
     def _format_categorized_message(self, message: str, category: str, function: str) -> str:
         """Format message with category and function information for easy searching"""
@@ -360,65 +368,65 @@ class HAINetLogger:
             return f"[{category_tag}] {message}"
     
     # Convenience methods for specific categories
-    def debug_init(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def debug_init(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Debug initialization processes"""
-        self.debug(message, category="init", function=function, **kwargs)
+        self.debug(message, *args, category="init", function=function, **kwargs)
     
-    def debug_network(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def debug_network(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Debug network operations"""
-        self.debug(message, category="network", function=function, **kwargs)
+        self.debug(message, *args, category="network", function=function, **kwargs)
     
-    def debug_crypto(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def debug_crypto(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Debug cryptographic operations"""
-        self.debug(message, category="crypto", function=function, **kwargs)
+        self.debug(message, *args, category="crypto", function=function, **kwargs)
     
-    def debug_ai(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def debug_ai(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Debug AI operations"""
-        self.debug(message, category="ai", function=function, **kwargs)
+        self.debug(message, *args, category="ai", function=function, **kwargs)
     
-    def debug_storage(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def debug_storage(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Debug storage operations"""
-        self.debug(message, category="storage", function=function, **kwargs)
+        self.debug(message, *args, category="storage", function=function, **kwargs)
     
-    def debug_web(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def debug_web(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Debug web server operations"""
-        self.debug(message, category="web", function=function, **kwargs)
+        self.debug(message, *args, category="web", function=function, **kwargs)
     
-    def debug_agent(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def debug_agent(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Debug agent operations"""
-        self.debug(message, category="agent", function=function, **kwargs)
+        self.debug(message, *args, category="agent", function=function, **kwargs)
     
-    def debug_constitutional(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def debug_constitutional(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Debug constitutional compliance"""
-        self.debug(message, category="constitutional", function=function, **kwargs)
+        self.debug(message, *args, category="constitutional", function=function, **kwargs)
     
-    def debug_performance(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def debug_performance(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Debug performance metrics"""
-        self.debug(message, category="performance", function=function, **kwargs)
+        self.debug(message, *args, category="performance", function=function, **kwargs)
     
-    def info_init(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def info_init(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Info initialization processes"""
-        self.info(message, category="init", function=function, **kwargs)
+        self.info(message, *args, category="init", function=function, **kwargs)
     
-    def info_network(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def info_network(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Info network operations"""
-        self.info(message, category="network", function=function, **kwargs)
+        self.info(message, *args, category="network", function=function, **kwargs)
     
-    def info_web(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def info_web(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Info web server operations"""
-        self.info(message, category="web", function=function, **kwargs)
+        self.info(message, *args, category="web", function=function, **kwargs)
     
-    def warning_constitutional(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def warning_constitutional(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Warning for constitutional issues"""
-        self.warning(message, category="constitutional", function=function, **kwargs)
+        self.warning(message, *args, category="constitutional", function=function, **kwargs)
     
-    def warning_network(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def warning_network(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Warning for network issues"""
-        self.warning(message, category="network", function=function, **kwargs)
+        self.warning(message, *args, category="network", function=function, **kwargs)
     
-    def error_constitutional(self, message: str, function: str = "", **kwargs: Any) -> None:
+    def error_constitutional(self, message: str, *args: Any, function: str = "", **kwargs: Any) -> None:
         """Error for constitutional violations"""
-        self.error(message, category="constitutional", function=function, **kwargs)
+        self.error(message, *args, category="constitutional", function=function, **kwargs)
 
 
 # Global logger registry
@@ -10,7 +10,7 @@ import time
 import hashlib
 import secrets
 import numpy as np
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Dict, List, Optional, Any, Sequence, Tuple, Union
 from pathlib import Path
 from dataclasses import dataclass
 import threading
@@ -66,6 +66,7 @@ class ConstitutionalVectorStore:
         # Vector storage (in-memory for now, can be upgraded to Qdrant/FAISS later)
         self.documents: Dict[str, VectorDocument] = {}
         self.embeddings_matrix: Optional[np.ndarray] = None
+        self.unit_matrix: Optional[np.ndarray] = None  # Row-normalized copy, so search is a plain dot product
         self.doc_id_to_index: Dict[str, int] = {}
         self.index_to_doc_id: Dict[int, str] = {}
         
@@ -108,56 +109,82 @@ class ConstitutionalVectorStore:
         Returns:
             True if added successfully
         """
+        return self.add_documents(
+            [(doc_id, content, embedding, metadata)], privacy_level=privacy_level, user_consent=user_consent
+        ) == 1
+    
+    def add_documents(self, documents: Sequence[Tuple[str, str, np.ndarray, Optional[Dict[str, Any]]]],
+                      privacy_level: str = "private", user_consent: bool = False) -> int:
+        """
+        Add several documents, rebuilding the embeddings matrix once for the whole batch
+        
+        Args:
+            documents: (doc_id, content, embedding, metadata) tuples
+            privacy_level: Privacy classification
+            user_consent: Whether user has consented to storage
+            
+        Returns:
+            Number of documents added
+        """
+        added = 0
         try:
             with self._lock:
-                # Validate constitutional compliance
-                if not self._validate_document_compliance(content, privacy_level, user_consent):
-                    raise ConstitutionalViolationError("Document violates constitutional principles")
-                
-                # Check storage limits (community focus: reasonable resource usage)
-                if len(self.documents) >= self.max_documents:
-                    self.logger.log_violation("storage_limit_exceeded", {
-                        "current_count": len(self.documents),
-                        "max_allowed": self.max_documents
-                    })
-                    return False
-                
-                # Validate embedding dimensions
-                if len(embedding.shape) != 1 or embedding.shape[0] != self.dimension:
-                    raise ConstitutionalViolationError(f"Embedding dimension mismatch: expected {self.dimension}")
-                
-                # Create document
-                document = VectorDocument(
-                    doc_id=doc_id,
-                    content=content,
-                    embedding=embedding.copy(),  # Constitutional principle: data isolation
-                    metadata=metadata or {},
-                    created_at=time.time(),
-                    constitutional_version=self.constitutional_version,
-                    privacy_level=privacy_level,
-                    user_consent=user_consent
-                )
-                
-                # Store document
-                self.documents[doc_id] = document
-                
-                # Update embeddings matrix
-                self._rebuild_embeddings_matrix()
-                
-                # Persist to disk
-                self._save_document_to_disk(document)
-                
-                self.logger.log_privacy_event(
-                    "document_added",
-                    f"vector_embedding_{privacy_level}",
-                    user_consent=user_consent
-                )
-                
-                return True
+                for doc_id, content, embedding, metadata in documents:
+                    try:
+                        # Validate constitutional compliance
+                        if not self._validate_document_compliance(content, privacy_level, user_consent):
+                            raise ConstitutionalViolationError("Document violates constitutional principles")
+                        
+                        # Check storage limits (community focus: reasonable resource usage)
+                        if len(self.documents) >= self.max_documents:
+                            self.logger.log_violation("storage_limit_exceeded", {
+                                "current_count": len(self.documents),
+                                "max_allowed": self.max_documents
+                            })
+                            break
+                        
+                        # Validate embedding dimensions
+                        if len(embedding.shape) != 1 or embedding.shape[0] != self.dimension:
+                            raise ConstitutionalViolationError(f"Embedding dimension mismatch: expected {self.dimension}")
+                        
+                        # Create document
+                        document = VectorDocument(
+                            doc_id=doc_id,
+                            content=content,
+                            embedding=embedding.copy(),  # Constitutional principle: data isolation
+                            metadata=metadata or {},
+                            created_at=time.time(),
+                            constitutional_version=self.constitutional_version,
+                            privacy_level=privacy_level,
+                            user_consent=user_consent
+                        )
+                        
+                        # Store document
+                        self.documents[doc_id] = document
+                        
+                        # Persist to disk
+                        self._save_document_to_disk(document)
+                        added += 1
+                        
+                        # One audit event per stored document, as a single add_document would log
+                        self.logger.log_privacy_event(
+                            "document_added",
+                            f"vector_embedding_{privacy_level}",
+                            user_consent=user_consent
+                        )
+                        
+                    except Exception as e:
+                        self.logger.error(f"Failed to add document: {e}")
+                
+                if added:
+                    # Update embeddings matrix
+                    self._rebuild_embeddings_matrix()
+                
+                return added
                 
         except Exception as e:
-            self.logger.error(f"Failed to add document: {e}")
-            return False
+            self.logger.error(f"Failed to add documents: {e}")
+            return added
     
     def search_similar(self, query_embedding: np.ndarray, k: int = 10, 
                       privacy_level_filter: Optional[str] = None,
@@ -186,7 +213,7 @@ class ConstitutionalVectorStore:
                 
                 # Constitutional filter: privacy-first access control
                 eligible_docs = []
-                eligible_embeddings = []
+                eligible_rows = []
                 
                 for doc_id, document in self.documents.items():
                     # Privacy filter
@@ -198,20 +225,14 @@ class ConstitutionalVectorStore:
                         continue
                     
                     eligible_docs.append(document)
-                    eligible_embeddings.append(document.embedding)
+                    eligible_rows.append(self.doc_id_to_index[doc_id])
                 
-                if not eligible_embeddings:
+                if not eligible_rows:
                     return []
                 
-                # Calculate similarities using cosine similarity
-                eligible_matrix = np.vstack(eligible_embeddings)
-                
-                # Normalize vectors for cosine similarity
+                # Cosine similarity: stored rows are already unit length, so only the query is normalized
                 query_norm = query_embedding / np.linalg.norm(query_embedding)
-                doc_norms = eligible_matrix / np.linalg.norm(eligible_matrix, axis=1, keepdims=True)
-                
-                # Calculate cosine similarities
-                similarities = np.dot(doc_norms, query_norm)
+                similarities = np.dot(self.unit_matrix[eligible_rows], query_norm)
                 
                 # Get top-k results
                 top_indices = np.argsort(similarities)[::-1][:k]
@@ -429,8 +450,11 @@ class ConstitutionalVectorStore:
     def _validate_document_compliance(self, content: str, privacy_level: str, user_consent: bool) -> bool:
         """Validate document storage compliance with constitutional principles"""
         
-        # Check content size
-        if len(content.encode()) > self.max_document_size:
+        # Check content size; UTF-8 takes 1-4 bytes per char, so only long non-ASCII content is encoded
+        length = len(content)
+        if length > self.max_document_size:
+            return False
+        if length * 4 > self.max_document_size and not content.isascii() and len(content.encode()) > self.max_document_size:
             return False
         
         # Privacy First: personal content requires consent
@@ -454,6 +478,7 @@ class ConstitutionalVectorStore:
         """Rebuild the embeddings matrix for efficient similarity search"""
         if not self.documents:
             self.embeddings_matrix = None
+            self.unit_matrix = None
             self.doc_id_to_index.clear()
             self.index_to_doc_id.clear()
             return
@@ -463,6 +488,10 @@ class ConstitutionalVectorStore:
         embeddings = [self.documents[doc_id].embedding for doc_id in doc_ids]
         
         self.embeddings_matrix = np.vstack(embeddings)
+        norms = np.linalg.norm(self.embeddings_matrix, axis=1, keepdims=True)
+        self.unit_matrix = np.divide(
+            self.embeddings_matrix, norms, out=np.zeros_like(self.embeddings_matrix, dtype=np.float64), where=norms > 0
+        )
         self.doc_id_to_index = {doc_id: idx for idx, doc_id in enumerate(doc_ids)}
         self.index_to_doc_id = {idx: doc_id for idx, doc_id in enumerate(doc_ids)}
     
@@ -631,6 +660,23 @@ class VectorStore:
             user_consent=True
         )
     
+    def store_agent_memory_batch(self, memories: Sequence[Tuple[str, str, np.ndarray, Optional[Dict[str, Any]]]]) -> int:
+        """
+        Store several agent memories in one write
+        
+        Args:
+            memories: (agent_id, content, embedding, metadata) tuples
+            
+        Returns:
+            Number of memories stored
+        """
+        timestamp = int(time.time())
+        documents = [
+            (f"agent_{agent_id}_{timestamp}_{secrets.token_hex(4)}", content, embedding, metadata or {"agent_id": agent_id})
+            for agent_id, content, embedding, metadata in memories
+        ]
+        return self.stores["memory"].add_documents(documents, privacy_level="private", user_consent=True)
+    
     def search_knowledge(self, query_embedding: np.ndarray, k: int = 10) -> List[VectorSearchResult]:
         """Search knowledge base"""
         return self.stores["knowledge"].search_similar(
@@ -599,6 +599,10 @@ class WebServer:
                 await self.llm_discovery.stop_discovery()
                 self.logger.info("✅ AI discovery stopped", category="web", function="_graceful_shutdown")
             
+            # Flush queued memory writes
+            if self.memory_manager:
+                await self.memory_manager.close()
+            
             self.logger.info("✅ Graceful shutdown completed", category="web", function="_graceful_shutdown")
             
         except Exception as e:
@@ -317,6 +317,9 @@ create_constitutional_environment() {
     
     log_success "Python dependencies installation complete"
     
+    # Precompile prompts so agents skip JSON parsing at startup
+    python3 compile_prompts.py || log_warning "Prompt precompilation failed - prompts will be read from config/prompts.json"
+    
     # Verify constitutional compliance imports
     python3 -c "
 from core.config.settings import HAINetSettings, validate_constitutional_compliance
@@ -140,4 +140,125 @@ async def test_full_agent_workflow(full_agent_system):
     print("\n✅ Full agent workflow test passed!")
     print(f"Admin History: {[m.content for m in admin_agent.message_history]}")
     print(f"PM History: {[m.content for m in pm_agent.message_history]}")
-    print(f"Worker History: {[m.content for m in worker_agent.message_history]}")
\ No newline at end of file
+    print(f"Worker History: {[m.content for m in worker_agent.message_history]}")
+
+@pytest.mark.asyncio
+async def test_tool_calls_in_one_turn_schedule_each_target_once(full_agent_system, monkeypatch):
+    agent_manager, _ = full_agent_system
+    admin_id = await agent_manager.create_agent(AgentRole.ADMIN, user_did="test_user")
+    pm_id = await agent_manager.create_agent(AgentRole.PM)
+    admin_agent = agent_manager.get_agent(admin_id)
+    pm_agent = agent_manager.get_agent(pm_id)
+
+    scheduled = []
+
+    async def fake_run_cycle(agent):
+        scheduled.append((agent.agent_id, len(agent.message_history)))
+
+    monkeypatch.setattr(agent_manager.cycle_handler, "run_cycle", fake_run_cycle)
+    history_before = len(pm_agent.message_history)
+
+    calls = [{"name": "send_message", "args": {"target_agent_id": pm_id, "message": f"part {i}"}} for i in range(3)]
+    results = await agent_manager.cycle_handler.interaction_handler.execute_tool_calls(admin_agent, calls)
+    await asyncio.sleep(0)
+
+    assert [r["result"]["status"] for r in results] == ["success"] * 3
+    # One cycle, started only after every message had been delivered
+    assert scheduled == [(pm_id, history_before + 3)]
+
+@pytest.mark.asyncio
+async def test_cycles_requested_after_a_batch_ends_are_not_dropped(full_agent_system, monkeypatch):
+    agent_manager, _ = full_agent_system
+    pm_id = await agent_manager.create_agent(AgentRole.PM)
+
+    scheduled = []
+
+    async def fake_run_cycle(agent):
+        scheduled.append(agent.agent_id)
+
+    monkeypatch.setattr(agent_manager.cycle_handler, "run_cycle", fake_run_cycle)
+    release = asyncio.Event()
+
+    async def late_request():
+        await release.wait()
+        await agent_manager.schedule_cycle(pm_id)
+
+    # A task started inside the batch inherits its context but outlives it
+    async with agent_manager.batch_cycles():
+        late = asyncio.create_task(late_request())
+    release.set()
+    await late
+    await asyncio.sleep(0)
+
+    assert scheduled == [pm_id]
+
+@pytest.mark.asyncio
+async def test_worker_requests_in_one_reply_are_created_as_a_batch(full_agent_system, monkeypatch):
+    agent_manager, _ = full_agent_system
+    pm_id = await agent_manager.create_agent(AgentRole.PM)
+    pm_agent = agent_manager.get_agent(pm_id)
+    workflow_manager = agent_manager.workflow_manager
+
+    scheduled = []
+
+    async def fake_run_cycle(agent):
+        scheduled.append(agent.agent_id)
+
+    monkeypatch.setattr(agent_manager.cycle_handler, "run_cycle", fake_run_cycle)
+    await workflow_manager.process_task_list_creation(pm_agent, [{"task_id": str(i)} for i in range(3)])
+    await asyncio.sleep(0.1)
+    scheduled.clear()
+
+    requests = [{"task_id": "0", "specialty": "devops"}, {"task_id": "1"}, {"task_id": "1"}, {"specialty": "qa"}]
+    await workflow_manager.process_worker_creation_batch(pm_agent, requests)
+    await asyncio.sleep(0.1)
+
+    short_term = pm_agent.memory.short_term
+    assert list(short_term["worker_map"]) == ["0", "1"]
+    assert short_term["workers_created_count"] == 2
+    assert all(agent_manager.get_agent(w).role == AgentRole.WORKER for w in short_term["worker_map"].values())
+    assert "1 more worker(s)" in pm_agent.message_history[-1].content
+    # One notification lists every worker of the batch
+    created = [m.content for m in pm_agent.message_history if "created" in m.content and m.role == "system"]
+    assert len(created) == 1 and "Workers created: 2/3" in created[0]
+    assert all(w in created[0] for w in short_term["worker_map"].values())
+    assert scheduled == [pm_id]
+
+@pytest.mark.asyncio
+async def test_create_agents_respects_the_agent_limit(full_agent_system):
+    agent_manager, _ = full_agent_system
+    agent_manager.max_agents = 2
+
+    agent_ids = await agent_manager.create_agents([AgentRole.WORKER] * 3)
+
+    assert agent_ids[2] is None
+    assert all(agent_manager.get_agent(agent_id).role == AgentRole.WORKER for agent_id in agent_ids[:2])
+    assert len(agent_manager.agents) == 2
+
+@pytest.mark.asyncio
+async def test_worker_creation_counts_a_task_list_stored_without_totals(full_agent_system):
+    agent_manager, _ = full_agent_system
+    pm_id = await agent_manager.create_agent(AgentRole.PM)
+    pm_agent = agent_manager.get_agent(pm_id)
+    short_term = pm_agent.memory.short_term
+    short_term["tasks"] = [{"task_id": "0"}, {"task_id": "1"}]
+
+    await agent_manager.workflow_manager.process_worker_creation(pm_agent, {"task_id": "0"})
+
+    assert short_term["total_tasks"] == 2
+    assert short_term["workers_created_count"] == 1
+    assert list(short_term["worker_map"]) == ["0"]
+    assert "1 more worker(s)" in pm_agent.message_history[-1].content
+
+@pytest.mark.asyncio
+async def test_worker_creation_initialises_missing_worker_map(full_agent_system):
+    agent_manager, _ = full_agent_system
+    pm_id = await agent_manager.create_agent(AgentRole.PM)
+    pm_agent = agent_manager.get_agent(pm_id)
+    short_term = pm_agent.memory.short_term
+    short_term.update(tasks=[{"task_id": "0"}, {"task_id": "1"}], total_tasks=2)
+
+    await agent_manager.workflow_manager.process_worker_creation(pm_agent, {"task_id": "1"})
+
+    assert list(short_term["worker_map"]) == ["1"]
+    assert short_term["workers_created_count"] == 1
@@ -0,0 +1,144 @@
+# START OF FILE tests/test_llm_filter.py
+"""
+Constitutional LLM Filter Tests for HAI-Net
+Checks that the single-pass keyword scanner reports exactly what
+per-pattern substring checks would.
+"""
+
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.config.settings import HAINetSettings
+from core.ai import keyword_matcher
+from core.ai.keyword_matcher import KeywordMatcher
+from core.ai.llm import ConstitutionalLLMFilter, LLMManager, LLMProvider
+
+
+KEYWORDS = ["api", "api key", "key", "track", "tracking", "king", "password", "pass"]
+
+
+def _random_text(rng: random.Random) -> str:
+    words = KEYWORDS + ["the", "model", "said", "a", "trackin", "ap", "passw"]
+    return " ".join(rng.choice(words) for _ in range(rng.randint(0, 30)))
+
+
+BACKENDS = ["hyperscan", "re2", "ahocorasick", "re"]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    """Force each available backend in turn"""
+    name = request.param
+    if name != "re" and getattr(keyword_matcher, name) is None:
+        pytest.skip(f"{name} not installed")
+    # Disable every backend preferred over the one under test
+    for preferred in BACKENDS[:BACKENDS.index(name)]:
+        monkeypatch.setattr(keyword_matcher, preferred, None)
+    return name
+
+
+def test_matcher_agrees_with_substring_checks(backend):
+    rng = random.Random(1234)
+    matcher = KeywordMatcher(KEYWORDS)
+    assert matcher.backend == backend
+
+    for _ in range(500):
+        text = _random_text(rng)
+        expected = {k for k in KEYWORDS if k in text}
+        assert matcher.find_all(text) == expected
+        assert matcher.contains_any(text) == bool(expected)
+
+
+def test_matcher_reports_end_offsets(backend):
+    matcher = KeywordMatcher(["api", "api key"])
+    assert sorted(matcher.iter_matches("my api key")) == [(6, "api"), (10, "api key")]
+    # Offsets are in characters, not encoded bytes
+    assert sorted(matcher.iter_matches("ünïcode api")) == [(11, "api")]
+
+
+def test_stream_finds_keywords_across_chunk_boundaries(backend):
+    rng = random.Random(99)
+    matcher = KeywordMatcher(KEYWORDS)
+
+    for _ in range(200):
+        text = _random_text(rng)
+        scan = matcher.stream()
+        pos = 0
+        while pos < len(text):
+            step = rng.randint(1, 5)
+            scan.feed(text[pos:pos + step])
+            pos += step
+        assert scan.found == matcher.find_all(text)
+
+
+def test_matcher_is_safe_across_threads(backend):
+    rng = random.Random(7)
+    matcher = KeywordMatcher(KEYWORDS)
+    texts = [_random_text(rng) for _ in range(400)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        found = list(pool.map(matcher.find_all, texts))
+
+    assert found == [{k for k in KEYWORDS if k in text} for text in texts]
+
+
+def test_filter_splits_matches_by_category():
+    constitutional_filter = ConstitutionalLLMFilter(HAINetSettings())
+
+    result = constitutional_filter.check_prompt_compliance(
+        "Share the PASSWORD and enable tracking to fight discrimination"
+    )
+
+    issues = {v["type"]: v["issues"] for v in result["violations"]}
+    assert issues == {
+        "privacy_violation": ["password"],
+        "harmful_content": ["discrimination"],
+        "human_rights_violation": ["tracking", "discrimination"]
+    }
+    assert not result["compliant"]
+
+    clean = constitutional_filter.check_response_compliance("Here is your summary.", "test-model")
+    assert clean["compliant"]
+    assert clean["filtered_response"] == "Here is your summary."
+
+
+@pytest.mark.asyncio
+async def test_async_checks_match_inline_checks():
+    constitutional_filter = ConstitutionalLLMFilter(HAINetSettings())
+    short_prompt = "what is my password"
+    long_prompt = "lorem ipsum " * 1000 + short_prompt
+
+    for prompt in (short_prompt, long_prompt):
+        expected = constitutional_filter.check_prompt_compliance(prompt)
+        assert await constitutional_filter.check_prompt_compliance_async(prompt) == expected
+
+        expected = constitutional_filter.check_response_compliance(prompt, "test-model")
+        assert await constitutional_filter.check_response_compliance_async(prompt, "test-model") == expected
+
+
+@pytest.mark.asyncio
+async def test_batched_generations_never_exceed_parallel_slots():
+    manager = LLMManager(HAINetSettings(ollama_num_parallel=2))
+    in_flight = []
+    peak = []
+
+    class SlowProvider:
+        async def generate_response(self, **call_kwargs):
+            in_flight.append(call_kwargs["model"])
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(call_kwargs["model"])
+            return call_kwargs["model"]
+
+    manager.providers[LLMProvider.OLLAMA] = SlowProvider()
+    try:
+        models = [f"m{i}" for i in range(7)]
+        results = await asyncio.gather(*(manager._submit_to_batch(LLMProvider.OLLAMA, {"model": m}) for m in models))
+    finally:
+        await manager.close()
+
+    assert results == models
+    assert max(peak) == 2
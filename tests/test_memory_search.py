@@ -0,0 +1,310 @@
+# START OF FILE tests/test_memory_search.py
+"""
+Memory Search Tests for HAI-Net
+Validates vectorized similarity search and the keyword fallback in MemoryManager.
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from core.config.settings import HAINetSettings
+from core.ai.memory import MemoryManager, MemoryType, MemoryImportance
+from core.storage.vector_store import ConstitutionalVectorStore
+
+
+@pytest.fixture
+def memory_manager():
+    return MemoryManager(HAINetSettings())
+
+
+async def _store_vectors(manager: MemoryManager, agent_id: str, vectors: np.ndarray):
+    memory_ids = []
+    for i, vector in enumerate(vectors):
+        memory_type = MemoryType.EPISODIC if i % 2 == 0 else MemoryType.SEMANTIC
+        memory_ids.append(await manager.store_memory(
+            agent_id, f"memory {i}", memory_type, MemoryImportance.HIGH, embedding=vector
+        ))
+    return memory_ids
+
+
+@pytest.mark.asyncio
+async def test_embedding_search_ranks_by_cosine_similarity(memory_manager):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(64, 16))
+    await _store_vectors(memory_manager, "agent", vectors)
+
+    query = vectors[7] + 0.01
+    results = await memory_manager.search_memories("agent", "unused", limit=5, query_embedding=query)
+
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(unit @ (query / np.linalg.norm(query))))[:5]
+    assert [memory.content for memory, _ in results] == [f"memory {i}" for i in expected]
+    assert results[0][1] == pytest.approx(1.0, abs=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_embedding_search_applies_type_filter_and_deletions(memory_manager):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(32, 8))
+    memory_ids = await _store_vectors(memory_manager, "agent", vectors)
+
+    await memory_manager.delete_memory("agent", memory_ids[4])
+    results = await memory_manager.search_memories(
+        "agent", "unused", memory_type=MemoryType.EPISODIC, limit=3, query_embedding=vectors[4]
+    )
+
+    assert len(results) == 3
+    assert all(memory.memory_type == MemoryType.EPISODIC for memory, _ in results)
+    assert "memory 4" not in [memory.content for memory, _ in results]
+
+
+@pytest.mark.asyncio
+async def test_keyword_fallback_without_embeddings(memory_manager):
+    await memory_manager.store_memory("agent", "Constitutional AI principles", MemoryType.SEMANTIC, MemoryImportance.HIGH)
+    await memory_manager.store_memory("agent", "Unrelated note", MemoryType.SEMANTIC, MemoryImportance.HIGH)
+
+    results = await memory_manager.search_memories("agent", "constitutional", query_embedding=np.ones(4))
+
+    assert [memory.content for memory, _ in results] == ["Constitutional AI principles"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("quantization, bytes_per_row", [("none", 256), ("int8", 64), ("binary", 8)])
+async def test_quantized_index_keeps_nearest_neighbour(quantization, bytes_per_row):
+    manager = MemoryManager(HAINetSettings(), quantization_type=quantization)
+    rng = np.random.default_rng(2)
+    vectors = rng.normal(size=(128, 64))
+    await _store_vectors(manager, "agent", vectors)
+
+    index = manager._embedding_index["agent"]
+    assert index.matrix.nbytes == 128 * bytes_per_row
+
+    for i in (3, 50, 127):
+        results = await manager.search_memories("agent", "unused", limit=1, query_embedding=vectors[i])
+        assert results[0][0].content == f"memory {i}"
+
+
+def test_unknown_quantization_rejected():
+    with pytest.raises(ValueError):
+        MemoryManager(HAINetSettings(), quantization_type="int4")
+
+
+@pytest.mark.asyncio
+async def test_hnsw_index_used_above_threshold():
+    pytest.importorskip("hnswlib")
+    manager = MemoryManager(HAINetSettings(memory_hnsw_threshold=50))
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(200, 32))
+    memory_ids = await _store_vectors(manager, "agent", vectors)
+
+    index = manager._embedding_index["agent"]
+    assert index.graph is not None and len(index.graph) == 200
+
+    await manager.delete_memory("agent", memory_ids[10])
+    assert len(index.graph) == 199
+
+    results = await manager.search_memories("agent", "unused", limit=3, query_embedding=vectors[42])
+    assert results[0][0].content == "memory 42"
+    assert results[0][1] == pytest.approx(1.0, abs=1e-3)
+
+    results = await manager.search_memories("agent", "unused", limit=3, query_embedding=vectors[10])
+    assert "memory 10" not in [memory.content for memory, _ in results]
+
+
+@pytest.mark.asyncio
+async def test_embedding_cache_is_shared_across_managers():
+    calls = []
+
+    async def embedding_fn(text: str) -> np.ndarray:
+        calls.append(text)
+        vector = np.zeros(8)
+        vector[len(text) % 8] = 1.0
+        return vector
+
+    first = MemoryManager(HAINetSettings(), embedding_fn=embedding_fn)
+    second = MemoryManager(HAINetSettings(), embedding_fn=embedding_fn)
+
+    await first.store_memory("a", "shared text", MemoryType.SEMANTIC, MemoryImportance.HIGH)
+    await second.store_memory("b", "shared text", MemoryType.SEMANTIC, MemoryImportance.HIGH)
+    # Sensitive content is rejected before it ever reaches the embedding backend
+    await first.store_memory("a", "my password is hunter2", MemoryType.SEMANTIC, MemoryImportance.HIGH)
+
+    assert calls == ["shared text"]
+
+    results = await second.search_memories("b", "shared text")
+    assert [memory.content for memory, _ in results] == ["shared text"]
+    assert calls == ["shared text"]
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_queries_hit_cache_until_memories_change(memory_manager):
+    rng = np.random.default_rng(4)
+    vectors = rng.normal(size=(16, 8))
+    await _store_vectors(memory_manager, "agent", vectors)
+
+    searches = []
+    original = memory_manager._search_embeddings
+
+    async def counting_search(*args, **kwargs):
+        searches.append(args)
+        return await original(*args, **kwargs)
+
+    memory_manager._search_embeddings = counting_search
+
+    first = await memory_manager.search_memories("agent", "q", limit=3, query_embedding=vectors[0])
+    again = await memory_manager.search_memories("agent", "q", limit=3, query_embedding=vectors[0] * 1.001 + 1e-4)
+    assert len(searches) == 1
+    assert [m.memory_id for m, _ in again] == [m.memory_id for m, _ in first]
+
+    # Different filters are cached separately
+    await memory_manager.search_memories("agent", "q", limit=2, query_embedding=vectors[0])
+    assert len(searches) == 2
+
+    await memory_manager.store_memory("agent", "new", MemoryType.SEMANTIC, MemoryImportance.HIGH, embedding=vectors[0])
+    results = await memory_manager.search_memories("agent", "q", limit=3, query_embedding=vectors[0])
+    assert len(searches) == 3
+    assert "new" in [m.content for m, _ in results]
+
+
+@pytest.mark.asyncio
+async def test_expired_memories_are_removed_under_the_agent_lock(memory_manager, monkeypatch):
+    memory_id = await memory_manager.store_memory("agent", "short lived", MemoryType.WORKING, MemoryImportance.TEMPORARY)
+    await memory_manager.store_memory("other", "short lived", MemoryType.WORKING, MemoryImportance.TEMPORARY)
+    await memory_manager.store_memory("other", "kept", MemoryType.SEMANTIC, MemoryImportance.CRITICAL)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 2 * 24 * 3600)
+
+    # Expiry deletes while the agent's lock is already held; this must not deadlock
+    assert await asyncio.wait_for(memory_manager.retrieve_memory("agent", memory_id), 5) is None
+    assert await asyncio.wait_for(memory_manager.cleanup_expired_memories(), 5) == {"other": 1}
+
+
+@pytest.mark.asyncio
+async def test_lookups_for_unknown_agents_create_no_locks(memory_manager):
+    assert await memory_manager.search_memories("ghost", "anything") == []
+    assert await memory_manager.delete_memory("ghost", "mem_ghost_00000001") is False
+    assert await memory_manager.get_agent_memory_summary("ghost") == {"total_memories": 0}
+    assert await memory_manager.retrieve_memory("ghost", "mem_ghost_00000001") is None
+    assert memory_manager._locks == {}
+
+    await memory_manager.store_memory("agent", "kept", MemoryType.SEMANTIC, MemoryImportance.HIGH)
+    assert list(memory_manager._locks) == ["agent"]
+
+
+@pytest.mark.asyncio
+async def test_memory_table_matches_memory_objects(memory_manager, monkeypatch):
+    importances = list(MemoryImportance)
+    memory_ids = []
+    for i in range(40):
+        memory_ids.append(await memory_manager.store_memory(
+            "agent", f"note {i}", list(MemoryType)[i % 5], importances[i % len(importances)]
+        ))
+    # Deleting most rows forces the table to compact
+    for memory_id in memory_ids[:30:2] + memory_ids[1:25:2]:
+        await memory_manager.delete_memory("agent", memory_id)
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 45 * 24 * 3600)
+
+    live = [m for m in memory_manager.agent_memories["agent"].values() if not memory_manager._is_memory_expired(m)]
+    summary = await memory_manager.get_agent_memory_summary("agent")
+    assert summary["total_memories"] == len(memory_manager.agent_memories["agent"])
+    assert summary["by_type"] == {t.value: n for t in MemoryType if (n := sum(m.memory_type == t for m in live))}
+    assert summary["by_importance"] == {i.value: n for i in MemoryImportance if (n := sum(m.importance == i for m in live))}
+
+    results = await memory_manager.search_memories("agent", "note", memory_type=MemoryType.SEMANTIC, limit=100)
+    assert {m.memory_id for m, _ in results} == {m.memory_id for m in live if m.memory_type == MemoryType.SEMANTIC}
+
+
+class _RecordingVectorStore:
+    def __init__(self):
+        self.batches = []
+
+    def store_agent_memory_batch(self, memories):
+        self.batches.append(list(memories))
+        return len(self.batches[-1])
+
+
+@pytest.mark.asyncio
+async def test_vector_store_writes_are_batched():
+    vector_store = _RecordingVectorStore()
+    manager = MemoryManager(HAINetSettings(memory_vector_flush_size=8), vector_store=vector_store)
+    rng = np.random.default_rng(5)
+
+    await _store_vectors(manager, "agent", rng.normal(size=(20, 4)))
+    assert vector_store.batches == []
+
+    await manager.close()
+    assert [len(batch) for batch in vector_store.batches] == [8, 8, 4]
+    assert vector_store.batches[0][0][0] == "agent"
+    assert vector_store.batches[0][0][3]["memory_type"] == MemoryType.EPISODIC.value
+
+
+def test_batched_documents_are_each_audited(tmp_path, monkeypatch):
+    store = ConstitutionalVectorStore(tmp_path, dimension=4)
+    events = []
+    monkeypatch.setattr(store.logger, "log_privacy_event", lambda event, *args, **kwargs: events.append(event))
+
+    documents = [(f"doc{i}", f"content {i}", np.ones(4, dtype=np.float32), None) for i in range(3)]
+    assert store.add_documents(documents, user_consent=True) == 3
+    assert events == ["document_added"] * 3
+
+
+@pytest.mark.asyncio
+async def test_embeddings_are_pooled_and_rows_reused(memory_manager):
+    rng = np.random.default_rng(6)
+    vectors = rng.normal(size=(6, 8))
+    memory_ids = await _store_vectors(memory_manager, "a", vectors[:3])
+    await _store_vectors(memory_manager, "b", vectors[3:])
+
+    arena = memory_manager._embedding_arenas[8]
+    assert len(arena) == 6
+    memory = await memory_manager.retrieve_memory("a", memory_ids[1])
+    assert np.allclose(memory.embedding, vectors[1]) and not memory.embedding.flags.writeable
+    assert memory.embedding.base is arena.slabs[0]
+
+    await memory_manager.delete_memory("a", memory_ids[1])
+    assert len(arena) == 5
+    await _store_vectors(memory_manager, "a", vectors[:1])
+    assert len(arena) == 6 and arena._next_row == 6
+
+
+@pytest.mark.asyncio
+async def test_deleted_memory_keeps_its_embedding_after_row_reuse(memory_manager):
+    rng = np.random.default_rng(8)
+    vectors = rng.normal(size=(2, 8))
+    memory_id = (await _store_vectors(memory_manager, "agent", vectors[:1]))[0]
+
+    held = await memory_manager.retrieve_memory("agent", memory_id)
+    cached = await memory_manager.search_memories("agent", "unused", limit=1, query_embedding=vectors[0])
+    await memory_manager.delete_memory("agent", memory_id)
+    # The freed row is reused for the next memory
+    await _store_vectors(memory_manager, "agent", vectors[1:])
+    assert memory_manager._embedding_arenas[8]._next_row == 1
+
+    assert np.allclose(held.embedding, vectors[0])
+    assert np.allclose(cached[0][0].embedding, vectors[0])
+
+
+@pytest.mark.asyncio
+async def test_keyword_fallback_matches_substring_scan(memory_manager):
+    rng = np.random.default_rng(7)
+    words = ["alpha", "beta", "gamma", "alphabet", "delta"]
+    memory_ids = []
+    for i in range(60):
+        content = " ".join(rng.choice(words, size=rng.integers(1, 6)))
+        memory_ids.append(await memory_manager.store_memory(
+            "agent", content, list(MemoryType)[i % 3], MemoryImportance.HIGH
+        ))
+    for memory_id in memory_ids[::4]:
+        await memory_manager.delete_memory("agent", memory_id)
+
+    live = list(memory_manager.agent_memories["agent"].values())
+    for query in ("alpha", "Beta Gamma", "bet", "", "zeta"):
+        expected = [(m, len(query) / len(m.content_lower)) for m in live if query.lower() in m.content_lower]
+        expected.sort(key=lambda x: x[1], reverse=True)
+        results = await memory_manager.search_memories("agent", query, limit=7)
+        assert [(m.memory_id, pytest.approx(s)) for m, s in results] == [(m.memory_id, s) for m, s in expected[:7]]
@@ -0,0 +1,167 @@
+# START OF FILE tests/test_tool_executor.py
+"""
+Tool Executor Tests for HAI-Net
+Checks result caching and dispatch in ToolExecutor.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from core.config.settings import HAINetSettings
+from core.ai.agents import AgentManager
+from core.ai.tools.executor import ToolExecutor
+
+
+@pytest.fixture
+def executor():
+    settings = HAINetSettings(tool_result_cache_size=2)
+    return ToolExecutor(settings, agent_manager=AgentManager(settings))
+
+
+def _counting_tool(calls, cacheable):
+    async def lookup(sender_agent, key):
+        calls.append(key)
+        return key.upper()
+    lookup.cacheable = cacheable
+    return lookup
+
+
+@pytest.mark.asyncio
+async def test_cacheable_tool_results_are_reused(executor):
+    calls = []
+    executor.register_tool("lookup", _counting_tool(calls, cacheable=True))
+
+    assert await executor.execute_tool("lookup", {"sender_agent": "a", "key": "x"}) == {"result": "X"}
+    # A different caller with the same arguments is served from the cache
+    assert await executor.execute_tool("lookup", {"sender_agent": "b", "key": "x"}) == {"result": "X"}
+    assert calls == ["x"]
+
+    # The cache is an LRU bounded by tool_result_cache_size
+    await executor.execute_tool("lookup", {"sender_agent": "a", "key": "y"})
+    await executor.execute_tool("lookup", {"sender_agent": "a", "key": "x"})
+    await executor.execute_tool("lookup", {"sender_agent": "a", "key": "z"})
+    await executor.execute_tool("lookup", {"sender_agent": "a", "key": "y"})
+    assert calls == ["x", "y", "z", "y"]
+
+
+@pytest.mark.asyncio
+async def test_cached_results_are_not_shared_between_callers(executor):
+    calls = []
+
+    async def listing(sender_agent, key):
+        calls.append(key)
+        return {"items": [key]}
+
+    listing.cacheable = True
+    executor.register_tool("listing", listing)
+
+    first = await executor.execute_tool("listing", {"sender_agent": "a", "key": "x"})
+    first["result"]["items"].append("mutated")
+    second = await executor.execute_tool("listing", {"sender_agent": "b", "key": "x"})
+    second["result"]["items"].clear()
+    assert await executor.execute_tool("listing", {"sender_agent": "c", "key": "x"}) == {"result": {"items": ["x"]}}
+    assert calls == ["x"]
+
+    batch = await executor.execute_tools_batch([("listing", {"sender_agent": "a", "key": "y"}),
+                                                ("listing", {"sender_agent": "b", "key": "y"})])
+    batch[0]["result"]["items"].append("mutated")
+    assert batch[1] == {"result": {"items": ["y"]}}
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_and_replaced_tools_always_run(executor):
+    calls = []
+    executor.register_tool("lookup", _counting_tool(calls, cacheable=False))
+    await executor.execute_tool("lookup", {"sender_agent": "a", "key": "x"})
+    await executor.execute_tool("lookup", {"sender_agent": "a", "key": "x"})
+    assert calls == ["x", "x"]
+
+    executor.register_tool("lookup", _counting_tool(calls, cacheable=True))
+    await executor.execute_tool("lookup", {"sender_agent": "a", "key": "x"})
+    executor.register_tool("lookup", _counting_tool(calls, cacheable=True))
+    await executor.execute_tool("lookup", {"sender_agent": "a", "key": "x"})
+    assert calls == ["x"] * 4
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_concurrently_and_coalesces_cacheable_calls():
+    settings = HAINetSettings(tool_batch_concurrency=2)
+    executor = ToolExecutor(settings, agent_manager=AgentManager(settings))
+    calls = []
+    in_flight = []
+    peak = []
+
+    async def fetch(sender_agent, key):
+        calls.append(key)
+        in_flight.append(key)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(key)
+        return key * 2
+
+    executor.register_tool("fetch", fetch)
+    executor.register_tool("lookup", _counting_tool(calls, cacheable=True))
+
+    batch = [("fetch", {"sender_agent": "a", "key": k}) for k in "abc"]
+    batch += [("lookup", {"sender_agent": "a", "key": "x"}), ("lookup", {"sender_agent": "b", "key": "x"}), ("missing", {})]
+    results = await executor.execute_tools_batch(batch)
+
+    assert results[:5] == [{"result": "aa"}, {"result": "bb"}, {"result": "cc"}, {"result": "X"}, {"result": "X"}]
+    assert "error" in results[5]
+    # Uncacheable calls all run, identical cacheable ones once, never more than two at a time
+    assert sorted(calls) == ["a", "b", "c", "x"]
+    assert max(peak) == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_tools_run_inline_unless_offloaded(executor):
+    def where(sender_agent):
+        return threading.current_thread() is threading.main_thread()
+
+    def offloaded(sender_agent):
+        return threading.current_thread() is threading.main_thread()
+    offloaded.thread_offload = True
+
+    executor.register_tool("where", where)
+    executor.register_tool("offloaded", offloaded)
+    assert await executor.execute_tool("where", {"sender_agent": "a"}) == {"result": True}
+    assert await executor.execute_tool("offloaded", {"sender_agent": "a"}) == {"result": False}
+
+
+def test_cache_key_is_canonical_for_nested_arguments():
+    first = ToolExecutor._cache_key("t", {"sender_agent": "a", "q": {"x": 1, "y": [1, 2]}, "n": 3})
+    second = ToolExecutor._cache_key("t", {"n": 3, "q": {"y": [1, 2], "x": 1}, "sender_agent": "b"})
+    assert first == second
+    assert first != ToolExecutor._cache_key("t", {"n": 3, "q": {"y": [2, 1], "x": 1}})
+
+
+@pytest.mark.asyncio
+async def test_calls_with_non_json_arguments_are_not_cached(executor):
+    class Same:
+        def __init__(self, value):
+            self.value = value
+
+        def __str__(self):
+            return "same"
+
+    def unwrap(sender_agent, obj):
+        return obj.value
+
+    unwrap.cacheable = True
+    executor.register_tool("unwrap", unwrap)
+    assert ToolExecutor._cache_key("unwrap", {"obj": Same(1)}) is None
+    assert await executor.execute_tool("unwrap", {"sender_agent": "a", "obj": Same(1)}) == {"result": 1}
+    assert await executor.execute_tool("unwrap", {"sender_agent": "a", "obj": Same(2)}) == {"result": 2}
+
+
+@pytest.mark.asyncio
+async def test_dispatch_keeps_keyword_semantics(executor):
+    def fmt(sender_agent, text, *, upper=False):
+        return text.upper() if upper else text
+
+    executor.register_tool("fmt", fmt)
+    assert await executor.execute_tool("fmt", {"upper": True, "text": "a", "sender_agent": "s"}) == {"result": "A"}
+    assert await executor.execute_tool("fmt", {"text": "a", "sender_agent": "s"}) == {"result": "a"}
+    assert "unexpected keyword" in (await executor.execute_tool("fmt", {"txt": "a", "sender_agent": "s", "upper": 1}))["error"]